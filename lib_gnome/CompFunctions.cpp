@@ -178,6 +178,68 @@ void GetRandomVectorInUnitCircle(float *u,float *v)
 	} while ( (*u)*(*u) +  (*v)*(*v) > 1.0);
 }
 
+RandomStream::RandomStream(unsigned long long seed, unsigned long id, unsigned long step, unsigned long stream)
+{
+	fKey[0] = (unsigned int)(seed & 0xFFFFFFFF);
+	fKey[1] = (unsigned int)((seed >> 32) & 0xFFFFFFFF);
+	
+	// the last word counts the blocks of four numbers
+	fCounter[0] = (unsigned int)id;
+	fCounter[1] = (unsigned int)step;
+	fCounter[2] = (unsigned int)stream;
+	fCounter[3] = 0;
+	
+	fUsed = 4;
+}
+
+unsigned int RandomStream::Next()
+{
+	if (fUsed == 4)
+	{	// Philox4x32-10 of the counter
+		unsigned int c[4] = {fCounter[0], fCounter[1], fCounter[2], fCounter[3]};
+		unsigned int k0 = fKey[0], k1 = fKey[1];
+		
+		for (int r = 0; r < 10; r++)
+		{
+			unsigned long long p0 = 0xD2511F53ULL * c[0];
+			unsigned long long p1 = 0xCD9E8D57ULL * c[2];
+			
+			c[0] = (unsigned int)(p1 >> 32) ^ c[1] ^ k0;
+			c[1] = (unsigned int)p1;
+			c[2] = (unsigned int)(p0 >> 32) ^ c[3] ^ k1;
+			c[3] = (unsigned int)p0;
+			
+			k0 += 0x9E3779B9;
+			k1 += 0xBB67AE85;
+		}
+		
+		for (int i = 0; i < 4; i++)
+			fBlock[i] = c[i];
+		
+		fCounter[3]++;
+		fUsed = 0;
+	}
+	
+	return fBlock[fUsed++];
+}
+
+float RandomStream::GetRandomFloat(float low, float high)
+{
+	// 24 bits, the precision of a float, in [0, 1)
+	float n = (float)(Next() >> 8) / 16777216.0f;
+	
+	return low + n * (high - low);
+}
+
+void RandomStream::GetRandomVectorInUnitCircle(float *u,float *v)
+{
+	do
+	{
+		*u = GetRandomFloat(-1.0,1.0);
+		*v = GetRandomFloat(-1.0,1.0);
+	} while ( (*u)*(*u) +  (*v)*(*v) > 1.0);
+}
+
 
 char *SwapN(char *s, short n)
 {
@@ -41,6 +41,25 @@ short ScaleToShort(long n);
 long GetRandom(long low, long high);
 float GetRandomFloat(float low, float high);
 void GetRandomVectorInUnitCircle(float *u,float *v);
+
+// A counter-based random number generator (Philox4x32-10), for loops
+// split across threads -- rand() is shared by the whole process. The
+// numbers depend only on the seed, the element id, the step and the stream,
+// and are the same as gnome.utilities.rand.uniforms() draws in python.
+class RandomStream
+{
+	public:
+		RandomStream(unsigned long long seed, unsigned long id, unsigned long step, unsigned long stream);
+		float	GetRandomFloat(float low, float high);
+		void	GetRandomVectorInUnitCircle(float *u,float *v);
+	private:
+		unsigned int	fCounter[4];
+		unsigned int	fKey[2];
+		unsigned int	fBlock[4];
+		int				fUsed;
+		unsigned int	Next();
+};
+
 char *SwapN(char *s, short n);
 long Assoc(long key, LONGPTR table, short n);
 void SwitchShorts(SHORTPTR a, SHORTPTR b);
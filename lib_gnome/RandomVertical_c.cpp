@@ -54,7 +54,7 @@ void RandomVertical_c::ModelStepIsDone()
 }
 
 
-OSErr RandomVertical_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID) {
+OSErr RandomVertical_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID, const unsigned int* le_id, unsigned long long seed, unsigned long step, unsigned long stream) {
 	
 	// JS Ques: Is this required? Could cy/python invoke this method without well defined numpy arrays?
 	if(!delta || !ref) {
@@ -89,7 +89,13 @@ OSErr RandomVertical_c::get_move(int n, Seconds model_time, Seconds step_len, Wo
 		rec.p.pLat *= 1000000;	
 		rec.p.pLong*= 1000000;
 		
-		delta[i] = this->GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+		if (le_id)
+		{	// a random stream for the LE, keyed by its id and the step
+			RandomStream random(seed, le_id[i], step, stream);
+			delta[i] = this->GetRandomMove(step_len, prec, &random);
+		}
+		else
+			delta[i] = this->GetMove(model_time, step_len, spill_ID, i, prec, spillType);
 		
 		delta[i].p.pLat /= 1000000;
 		delta[i].p.pLong /= 1000000;
@@ -106,6 +112,17 @@ double GetDepthAtPoint(WorldPoint p)
 }
 
 WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeStep,long setIndex,long leIndex,LERec *theLE,LETYPE leType)
+{
+	return GetRandomMove(timeStep, theLE, 0);
+}
+
+// from the LE's random stream, or from rand() if there isn't one
+static float RandomFloat(RandomStream *random, float low, float high)
+{
+	return random ? random->GetRandomFloat(low, high) : GetRandomFloat(low, high);
+}
+
+WorldPoint3D RandomVertical_c::GetRandomMove (Seconds timeStep, LERec *theLE, RandomStream *random) const
 {
 	double	dLong, dLat, z = 0;
 	WorldPoint3D	deltaPoint = {{0,0},0.};
@@ -128,8 +145,8 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 		// diffusion coefficient is O(1) vs O(100000) for horizontal / vertical diffusion
 		// vertical is 3-5 cm^2/s, divide by sqrt of 10^4
 		
-		rand1 = GetRandomFloat(-1.0, 1.0);
-		rand2 = GetRandomFloat(-1.0, 1.0);
+		rand1 = RandomFloat(random, -1.0, 1.0);
+		rand2 = RandomFloat(random, -1.0, 1.0);
 		if ((*theLE).z>mixedLayerDepth)
 			horizontalDiffusionCoefficient = sqrt(6.*(fHorizontalDiffusionCoefficientBelowML/10000.)*timeStep)/METERSPERDEGREELAT;
 		else
@@ -152,7 +169,7 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 		{
 			if (fVerticalDiffusionCoefficient==0) return deltaPoint;	
 			verticalDiffusionCoefficient = sqrt(6.*(fVerticalDiffusionCoefficient/10000.)*timeStep);
-			rand = GetRandomFloat(-1.0, 1.0);
+			rand = RandomFloat(random, -1.0, 1.0);
 			deltaPoint.z = rand*verticalDiffusionCoefficient;
 			//z = deltaPoint.z;	// will add this on to the next move
 			
@@ -168,7 +185,7 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 			{
 				deltaPoint.z = mixedLayerDepth - (totalLEDepth - mixedLayerDepth) - (*theLE).z; // reflect about mixed layer depth
 				// check if went above surface and put randomly into mixed layer
-				if ((*theLE).z+deltaPoint.z <= 0) deltaPoint.z = GetRandomFloat(eps,mixedLayerDepth) - (*theLE).z;	
+				if ((*theLE).z+deltaPoint.z <= 0) deltaPoint.z = RandomFloat(random, eps,mixedLayerDepth) - (*theLE).z;	
 					// or just let it go and deal with it later? then it will go into full water column...
 			}
 		}
@@ -177,7 +194,7 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 		// now apply below mixed layer depth diffusion to all particles above and below
 		if (fVerticalBottomDiffusionCoefficient==0/* && z==0*/) /*return deltaPoint*/goto dochecks;	// don't return until do checks
 		verticalDiffusionCoefficient = sqrt(6.*(fVerticalBottomDiffusionCoefficient/10000.)*timeStep);
-		rand = GetRandomFloat(-1.0, 1.0);
+		rand = RandomFloat(random, -1.0, 1.0);
 		deltaPoint.z = rand*verticalDiffusionCoefficient;
 		
 		z = z + deltaPoint.z;	// add move to previous move if any
@@ -194,7 +211,7 @@ dochecks:
 			deltaPoint.z = - totalLEDepth - (*theLE).z;	// reflect below surface
 			totalLEDepth = (*theLE).z + deltaPoint.z;
 			if (totalLEDepth > depthAtPoint) 
-				deltaPoint.z = GetRandomFloat(eps,depthAtPoint-eps) - (*theLE).z;
+				deltaPoint.z = RandomFloat(random, eps,depthAtPoint-eps) - (*theLE).z;
 			return deltaPoint;
 		}
 		if (totalLEDepth==depthAtPoint) 
@@ -209,7 +226,7 @@ dochecks:
 			totalLEDepth = (*theLE).z + deltaPoint.z;
 			if (totalLEDepth <= 0) 
 				// put randomly into water column
-				deltaPoint.z = GetRandomFloat(eps,depthAtPoint-eps) - (*theLE).z;
+				deltaPoint.z = RandomFloat(random, eps,depthAtPoint-eps) - (*theLE).z;
 			return deltaPoint;
 		}
 		else
@@ -15,6 +15,8 @@
 #include "Mover_c.h"
 #include "ExportSymbols.h"
 
+class RandomStream;
+
 class DLL_API RandomVertical_c : virtual public Mover_c {
 	
 public:
@@ -35,10 +37,11 @@ public:
 	virtual WorldPoint3D       GetMove(const Seconds& model_time, Seconds timeStep,long setIndex,long leIndex,LERec *theLE,LETYPE leType);
 	
 	
-	OSErr				get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID);
+	OSErr				get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID, const unsigned int* le_id = 0, unsigned long long seed = 0, unsigned long step = 0, unsigned long stream = 0);
 
 protected:
 	void				Init();
+	WorldPoint3D		GetRandomMove(Seconds timeStep, LERec *theLE, RandomStream *random) const;
 };
 
 #endif
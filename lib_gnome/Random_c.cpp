@@ -14,6 +14,16 @@
 
 #ifndef pyGNOME
 #include "TVectMap.h"
+#else
+#include <algorithm>
+#include <vector>
+
+// std::thread is C++11 -- older compilers (e.g. the VC9 used for the python
+// 2.7 Windows builds) don't have it, and get_move runs in one thread.
+#if __cplusplus >= 201103L || (defined(_MSC_VER) && _MSC_VER >= 1700)
+#define GNOME_THREADS
+#include <thread>
+#endif
 #endif
 
 using std::cout;
@@ -36,6 +46,9 @@ void Random_c::Init()
 	memset(&fOptimize,0,sizeof(fOptimize));
 	fUncertaintyFactor = 2;		// default uncertainty mult-factor
 	bUseDepthDependent = false;
+#ifdef pyGNOME
+	fNumThreads = 1;
+#endif
 }
 
 OSErr Random_c::PrepareForModelRun()
@@ -59,7 +72,7 @@ void Random_c::ModelStepIsDone()
 }
 
 
-OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID) {
+OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID, const unsigned int* le_id, unsigned long long seed, unsigned long step, unsigned long stream) {
 	
 	// JS Ques: Is this required? Could cy/python invoke this method without well defined numpy arrays?
 	if(!delta || !ref) {
@@ -74,6 +87,50 @@ OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint
 		return 2;
 	}
 	
+#ifdef pyGNOME
+	// with the element ids, each LE draws from a random stream of its own,
+	// keyed by its id and the step (the caller's count of the moves drawn):
+	// the moves don't depend on the order of the LEs, or on how they are
+	// split across threads. Unless
+	// the moves are depth dependent, as GetMove() sets fOptimize for each
+	// LE then.
+	if (le_id && !bUseDepthDependent)
+	{
+		double diffusionCoefficient;
+		double uncertaintyFactor = (spillType == UNCERTAINTY_LE) ? fUncertaintyFactor : 1.;
+		
+		if (fOptimize.isOptimizedForStep)
+			diffusionCoefficient = (spillType == UNCERTAINTY_LE) ? fOptimize.uncertaintyValue : fOptimize.value;
+		else
+			diffusionCoefficient = sqrt(uncertaintyFactor*6.*(fDiffusionCoefficient/10000.)*step_len)/METERSPERDEGREELAT; // in deg lat
+		
+#ifdef GNOME_THREADS
+		int numThreads = std::max(1, std::min(fNumThreads, n));
+		int chunk = (n + numThreads - 1) / numThreads;
+		std::vector<std::thread> threads;
+		
+		for (int t = 1; t < numThreads && t * chunk < n; t++) {
+			threads.push_back(std::thread(&Random_c::GetMoveChunk, this,
+										  t * chunk, std::min(n, (t + 1) * chunk),
+										  diffusionCoefficient,
+										  ref, delta, LE_status, le_id, seed, step, stream));
+		}
+		// this thread does the first chunk
+		GetMoveChunk(0, std::min(n, chunk), diffusionCoefficient,
+					 ref, delta, LE_status, le_id, seed, step, stream);
+		
+		for (size_t t = 0; t < threads.size(); t++)
+			threads[t].join();
+#else
+		// no threads: all the LEs in this one -- the moves are the same
+		GetMoveChunk(0, n, diffusionCoefficient,
+					 ref, delta, LE_status, le_id, seed, step, stream);
+#endif
+		
+		return noErr;
+	}
+#endif
+	
 	LERec* prec;
 	LERec rec;
 	prec = &rec;
@@ -103,6 +160,40 @@ OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint
 	return noErr;
 }
 
+#ifdef pyGNOME
+// GetMove() for LEs start to stop, each with a random stream of its own --
+// it only reads the mover, so chunks can be run at the same time.
+void Random_c::GetMoveChunk(int start, int stop, double diffusionCoefficient, const WorldPoint3D* ref, WorldPoint3D* delta, const short* LE_status, const unsigned int* le_id, unsigned long long seed, unsigned long step, unsigned long stream) const
+{
+	WorldPoint3D zero_delta ={{0,0},0.};
+	float rand1,rand2;
+	
+	for (int i = start; i < stop; i++) {
+		delta[i] = zero_delta;
+		
+		// subsurface diffusion is handled by vertical diffusion
+		if (LE_status[i] != OILSTAT_INWATER || ref[i].z > 0)
+			continue;
+		
+		RandomStream random(seed, le_id[i], step, stream);
+		
+		if (fOptimize.isFirstStep)
+		{
+			random.GetRandomVectorInUnitCircle(&rand1,&rand2);
+		}
+		else
+		{
+			rand1 = random.GetRandomFloat(-1.0, 1.0);
+			rand2 = random.GetRandomFloat(-1.0, 1.0);
+		}
+		
+		// LongToLatRatio3 takes the latitude * 1000000, as GetMove() does
+		delta[i].p.pLong = (rand1 * diffusionCoefficient) / LongToLatRatio3(ref[i].p.pLat * 1000000);
+		delta[i].p.pLat = rand2 * diffusionCoefficient;
+	}
+}
+#endif
+
 WorldPoint3D Random_c::GetMove (const Seconds& model_time, Seconds timeStep,long setIndex,long leIndex,LERec *theLE,LETYPE leType)
 {
 	double		dLong, dLat;
@@ -33,10 +33,17 @@ public:
 	virtual WorldPoint3D       GetMove(const Seconds& model_time, Seconds timeStep,long setIndex,long leIndex,LERec *theLE,LETYPE leType);
 	
 	
-	OSErr				get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID);
+	OSErr				get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID, const unsigned int* le_id = 0, unsigned long long seed = 0, unsigned long step = 0, unsigned long stream = 0);
+
+#ifdef pyGNOME
+	int					fNumThreads;	// number of threads get_move splits the elements across
+#endif
 
 protected:
 	void				Init();
+#ifdef pyGNOME
+	void				GetMoveChunk(int start, int stop, double diffusionCoefficient, const WorldPoint3D* ref, WorldPoint3D* delta, const short* LE_status, const unsigned int* le_id, unsigned long long seed, unsigned long step, unsigned long stream) const;
+#endif
 };
 
 #endif
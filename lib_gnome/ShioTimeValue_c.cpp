@@ -13,6 +13,8 @@
 #include "StringFunctions.h"
 #include "MemUtils.h"
 #include <iostream>
+#include <map>
+#include <string>
 
 #ifndef pyGNOME
 #include "CROSS.H"
@@ -1595,7 +1597,10 @@ readError:
 
 }
 /////////////////////////////////////////////////
-YEARDATA2* gYearDataHdl1990Plus2[kMAXNUMSAVEDYEARS];
+// year data already read, by path and year -- each file is read once
+// per process, and shared by all the Shio objects (and models)
+typedef std::map<std::pair<std::string, short>, YEARDATA2*> YearDataCache;
+static YearDataCache gYearDataCache;
 
 YEARDATA2* ReadYearData(short year, const char *path, char *errStr)
 
@@ -1623,12 +1628,11 @@ YEARDATA2* ReadYearData(short year, const char *path, char *errStr)
 	char		filePathName[256];
 	short		cnt, numPoints = 0, err = 0;
 
-	short yearMinus1990 = year-1990;
+	std::pair<std::string, short> cacheKey(path, year);
+	YearDataCache::iterator cached = gYearDataCache.find(cacheKey);
 
-	if(0<= yearMinus1990 && yearMinus1990 <kMAXNUMSAVEDYEARS)
-	{
-		if(gYearDataHdl1990Plus2[yearMinus1990]) return gYearDataHdl1990Plus2[yearMinus1990];
-	}
+	if (cached != gYearDataCache.end())
+		return cached->second;
 	//if (errStr[0] != 0) return 0;
 	//errStr[0] = 0;
 
@@ -1689,10 +1693,7 @@ YEARDATA2* ReadYearData(short year, const char *path, char *errStr)
 	result->XODE = xode;
 	result->VPU = vpu;
 
-	if(result && 0<= yearMinus1990 && yearMinus1990 <kMAXNUMSAVEDYEARS)
-	{
-		gYearDataHdl1990Plus2[yearMinus1990] = result;
-	}
+	gYearDataCache[cacheKey] = result;
 
 	return result;
 
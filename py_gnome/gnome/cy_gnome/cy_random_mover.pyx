@@ -26,10 +26,12 @@ cdef class CyRandomMover(cy_mover.CyMover):
         del self.mover
         self.rand = NULL
 
-    def __init__(self, diffusion_coef=100000, uncertain_factor=2):
+    def __init__(self, diffusion_coef=100000, uncertain_factor=2,
+                 num_threads=1):
         """
         Default diffusion_coef = 100,000 [cm**2/sec]
         Default uncertain_factor = 2
+        Default num_threads = 1
         """
         if diffusion_coef < 0:
             raise ValueError('CyRandomMover must have a value '
@@ -40,6 +42,7 @@ cdef class CyRandomMover(cy_mover.CyMover):
 
         self.rand.fDiffusionCoefficient = diffusion_coef
         self.rand.fUncertaintyFactor = uncertain_factor
+        self.num_threads = num_threads
 
     property diffusion_coef:
         def __get__(self):
@@ -63,6 +66,23 @@ cdef class CyRandomMover(cy_mover.CyMover):
                                  'for uncertain_factor')
             self.rand.fUncertaintyFactor = value
 
+    property num_threads:
+        """
+        number of threads the elements are split across in get_move().
+        With the element ids, the moves don't depend on num_threads.
+        If lib_gnome was built without std::thread (C++11), there is only
+        one.
+        """
+        def __get__(self):
+            return self.rand.fNumThreads
+
+        def __set__(self, value):
+            if value < 1:
+                raise ValueError('CyRandomMover must have a value '
+                                 'greater than or equal to 1 '
+                                 'for num_threads')
+            self.rand.fNumThreads = value
+
     def __repr__(self):
         """
         unambiguous repr of object, reuse for str() method
@@ -76,7 +96,11 @@ cdef class CyRandomMover(cy_mover.CyMover):
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points,
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[short] LE_status,
-                 LEType spill_type):
+                 LEType spill_type,
+                 cnp.ndarray[cnp.uint32_t] le_ids=None,
+                 seed=0,
+                 step=0,
+                 stream=0):
         """
         .. function:: get_move(self,
                  model_time,
@@ -84,7 +108,11 @@ cdef class CyRandomMover(cy_mover.CyMover):
                  np.ndarray[WorldPoint3D, ndim=1] ref_points,
                  np.ndarray[WorldPoint3D, ndim=1] delta,
                  np.ndarray[np.npy_int16] LE_status,
-                 LE_type)
+                 LE_type,
+                 le_ids=None,
+                 seed=0,
+                 step=0,
+                 stream=0)
 
         Invokes the underlying C++ Random_c.get_move(...)
 
@@ -96,12 +124,40 @@ cdef class CyRandomMover(cy_mover.CyMover):
         :type delta: numpy array of WorldPoint3D
         :param le_status: status of each particle - movement is only on particles in water
         :param spill_type: LEType defining whether spill is forecast or uncertain 
+        :param le_ids: the element ids. If given, each element draws from a
+                       random stream of its own, keyed by seed, its id,
+                       step and stream. Otherwise the moves come from the
+                       C rand().
+        :param seed: seed of the element random streams
+        :param step: step of the element random streams -- a new one for
+                     each move drawn
+        :param stream: stream number of the element random streams
         :returns: none
         """
         cdef OSErr err
         N = len(ref_points)  # set a data type?
 
-        err = self.rand.get_move(N, model_time, step_len, &ref_points[0], &delta[0], &LE_status[0], spill_type, 0)
+        # C values, so the GIL can be released for the call
+        cdef int n = N
+        cdef unsigned long c_time = model_time
+        cdef unsigned long c_step_len = step_len
+        cdef WorldPoint3D *ref = &ref_points[0]
+        cdef WorldPoint3D *dlt = &delta[0]
+        cdef short *status = &LE_status[0]
+        cdef unsigned int *ids = NULL
+        cdef unsigned long long c_seed = seed
+        cdef unsigned long c_step = step
+        cdef unsigned long c_stream = stream
+
+        if le_ids is not None:
+            ids = <unsigned int *>&le_ids[0]
+
+        # the C++ may use several threads -- let other python threads run
+        with nogil:
+            err = self.rand.get_move(n, c_time, c_step_len, ref, dlt,
+                                     status, spill_type, 0,
+                                     ids, c_seed, c_step, c_stream)
+
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points and delta '
                              'are defined')
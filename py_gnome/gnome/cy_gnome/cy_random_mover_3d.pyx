@@ -161,7 +161,11 @@ cdef class CyRandomMover3D(cy_mover.CyMover):
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points,
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[short] LE_status,
-                 LEType spill_type):
+                 LEType spill_type,
+                 cnp.ndarray[cnp.uint32_t] le_ids=None,
+                 seed=0,
+                 step=0,
+                 stream=0):
         """
         .. function:: get_move(self,
                  model_time,
@@ -170,7 +174,10 @@ cdef class CyRandomMover3D(cy_mover.CyMover):
                  np.ndarray[WorldPoint3D, ndim=1] delta,
                  np.ndarray[np.npy_int16] LE_status,
                  LE_type,
-                 spill_ID)
+                 le_ids=None,
+                 seed=0,
+                 step=0,
+                 stream=0)
 
         Invokes the underlying C++ Random_c.get_move(...)
 
@@ -182,14 +189,27 @@ cdef class CyRandomMover3D(cy_mover.CyMover):
         :type delta: numpy array of WorldPoint3D
         :param le_status: status of each particle - movement is only on particles in water
         :param spill_type: LEType defining whether spill is forecast or uncertain 
+        :param le_ids: the element ids. If given, each element draws from a
+                       random stream of its own, keyed by seed, its id,
+                       step and stream. Otherwise the moves come from the
+                       C rand().
+        :param seed: seed of the element random streams
+        :param step: step of the element random streams -- a new one for
+                     each move drawn
+        :param stream: stream number of the element random streams
         :returns: none
         """
         cdef OSErr err
+        cdef unsigned int *ids = NULL
         N = len(ref_points)  # set a data type?
 
+        if le_ids is not None:
+            ids = <unsigned int *>&le_ids[0]
+
         err = self.rand.get_move(N, model_time, step_len,
                                  &ref_points[0], &delta[0], &LE_status[0],
-                                 spill_type, 0)
+                                 spill_type, 0,
+                                 ids, seed, step, stream)
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points, delta '
                              'are defined')
@@ -31,9 +31,12 @@ cdef extern from "Random_c.h":
         Random_c() except +
         double fDiffusionCoefficient
         double fUncertaintyFactor
+        int fNumThreads
         OSErr get_move(int n, unsigned long model_time, unsigned long step_len,
                        WorldPoint3D* ref, WorldPoint3D* delta,
-                       short* LE_status, LEType spillType, long spillID)        
+                       short* LE_status, LEType spillType, long spillID,
+                       unsigned int* le_id, unsigned long long seed,
+                       unsigned long step, unsigned long stream) nogil
 
 cdef extern from "RandomVertical_c.h":
     cdef cppclass RandomVertical_c(Mover_c):
@@ -46,7 +49,9 @@ cdef extern from "RandomVertical_c.h":
         bool bSurfaceIsAllowed
         OSErr get_move(int n, unsigned long model_time, unsigned long step_len,
                        WorldPoint3D* ref, WorldPoint3D* delta,
-                       short* LE_status, LEType spillType, long spillID)        
+                       short* LE_status, LEType spillType, long spillID,
+                       unsigned int* le_id, unsigned long long seed,
+                       unsigned long step, unsigned long stream)
 
 cdef extern from "RiseVelocity_c.h":
     OSErr get_rise_velocity(int n, double *rise_vel, double *le_density,
@@ -0,0 +1,294 @@
+"""
+A process-wide pool of open netCDF datasets
+
+Environment objects made from the same file (the currents, winds, ice,
+temperature... of one model output, or the same objects loaded again from
+a save file) share one open dataset, and one parsed grid, rather than
+each opening and parsing the file again.
+
+The objects using a dataset are counted. Datasets no object uses any more
+are kept open, so they can be reused, until there are more than max_open
+datasets open -- then the least recently used of them are closed.
+
+A file that has changed (its size or modification time) since it was
+opened is opened again, and its grid is parsed again.
+"""
+
+import os
+import weakref
+import threading
+from collections import OrderedDict
+
+import six
+
+import gridded
+
+from gnome.environment.multi_file import (MultiFileDataset,
+                                          expand_filenames,
+                                          is_multi_file)
+from gnome.environment.forcing_cache import forcing_cache
+
+
+class DatasetPool(object):
+    """
+    Open netCDF datasets, keyed by (absolute) path, with the size and
+    modification time of the file(s) they were opened from
+    """
+    def __init__(self, max_open=32, cache=None):
+        """
+        :param max_open=32: maximum number of datasets kept open. Datasets
+                            in use are never closed, so more than this may
+                            be open. None for no limit.
+
+        :param cache=None: the ForcingCache prepared files are read from --
+                           the default one if None.
+        """
+        self.max_open = max_open
+        self.cache = forcing_cache if cache is None else cache
+
+        self._datasets = OrderedDict()
+        self._users = {}
+        self._grids = weakref.WeakValueDictionary()
+
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(ncfile):
+        """
+        the key for a file name, or list of file names -- None for anything
+        else (e.g. a dataset).
+        """
+        ncfile = expand_filenames(ncfile)
+
+        if isinstance(ncfile, six.string_types):
+            return os.path.abspath(ncfile)
+
+        if (isinstance(ncfile, (list, tuple)) and
+                all(isinstance(f, six.string_types) for f in ncfile)):
+            if len(ncfile) == 1:
+                return os.path.abspath(ncfile[0])
+
+            return tuple(os.path.abspath(f) for f in ncfile)
+
+        return None
+
+    def __len__(self):
+        return len(self._datasets)
+
+    def __contains__(self, ncfile):
+        return self.key(ncfile) in self._datasets
+
+    def get_dataset(self, ncfile, dataset=None):
+        """
+        Works like gridded.utilities.get_dataset(), but returns the open
+        dataset for ncfile, if there is one.
+
+        :param ncfile: file name, list of file names, or a glob pattern.
+                       A set of files is opened as a MultiFileDataset.
+        :param dataset=None: if not None, it is returned as it is.
+        """
+        if dataset is not None:
+            return dataset
+
+        ncfile = expand_filenames(ncfile)
+
+        key = self.key(ncfile)
+        if key is None:
+            return gridded.utilities.get_dataset(ncfile)
+
+        sig = _signature(key)
+
+        with self._lock:
+            old_sig, ds = self._datasets.pop(key, (None, None))
+
+            if ds is not None and old_sig != sig:
+                # the file has changed since it was opened. The objects
+                # using the old dataset keep it, else it is closed.
+                if key not in self._users:
+                    _close_dataset(ds)
+
+                ds = None
+
+            if ds is None or not _is_open(ds):
+                ds = self._open_dataset(ncfile)
+
+            # the most recently used go at the end
+            self._datasets[key] = (sig, ds)
+            self._close_extra(keep=key)
+
+        return ds
+
+    def _open_dataset(self, ncfile):
+        if is_multi_file(ncfile):
+            # only the files needed are opened
+            return MultiFileDataset(ncfile)
+
+        # the converted copy, if the file has been prepared
+        cached = self.cache.open(ncfile)
+        if cached is not None:
+            return cached
+
+        return gridded.utilities.get_dataset(ncfile)
+
+    def get_grid(self, ncfile, dataset=None, **kwargs):
+        """
+        The grid in ncfile, as made by PyGrid.from_netCDF(ncfile, **kwargs)
+        -- the same grid object for every caller with the same arguments,
+        as long as one of them holds on to it, and the file doesn't change.
+        """
+        from gnome.environment.gridded_objects_base import PyGrid
+
+        dataset = self.get_dataset(ncfile, dataset)
+
+        path = self.key(ncfile)
+        key = (path, _signature(path), _frozen(kwargs))
+
+        try:
+            hash(key)
+        except TypeError:
+            # something unhashable (an array) in the arguments
+            key = (None,)
+
+        if key[0] is None:
+            return PyGrid.from_netCDF(ncfile, dataset=dataset, **kwargs)
+
+        with self._lock:
+            grid = self._grids.get(key)
+
+            if grid is None:
+                grid = PyGrid.from_netCDF(ncfile, dataset=dataset, **kwargs)
+                self._grids[key] = grid
+
+        return grid
+
+    def attach(self, obj, ncfile):
+        """
+        Count obj as a user of the dataset for ncfile, until it is garbage
+        collected (or detached).
+        """
+        key = self.key(ncfile)
+        if key is None:
+            return
+
+        obj_id = id(obj)
+
+        def _detach(_ref, pool=weakref.ref(self)):
+            pool = pool()
+            if pool is not None:
+                pool._remove_user(key, obj_id)
+
+        with self._lock:
+            # keyed on id: equal objects are still different users
+            self._users.setdefault(key, {})[obj_id] = weakref.ref(obj,
+                                                                  _detach)
+
+    def detach(self, obj, ncfile):
+        """
+        obj no longer uses the dataset for ncfile
+        """
+        self._remove_user(self.key(ncfile), id(obj))
+
+    def _remove_user(self, key, obj_id):
+        with self._lock:
+            users = self._users.get(key)
+
+            if users is not None:
+                users.pop(obj_id, None)
+                if not users:
+                    del self._users[key]
+                    self._close_extra()
+
+    def refcount(self, ncfile):
+        """
+        the number of (live) objects using the dataset for ncfile
+        """
+        users = self._users.get(self.key(ncfile), {})
+
+        return len([r for r in users.values() if r() is not None])
+
+    def _close_extra(self, keep=None):
+        if self.max_open is None:
+            return
+
+        with self._lock:
+            unused = [k for k in self._datasets
+                      if k not in self._users and k != keep]
+
+            # least recently used first
+            while len(self._datasets) > self.max_open and unused:
+                self._close(unused.pop(0))
+
+    def _close(self, key):
+        _sig, ds = self._datasets.pop(key)
+
+        _close_dataset(ds)
+
+    def close_unused(self):
+        """
+        close all the datasets no object is using
+        """
+        with self._lock:
+            for key in [k for k in self._datasets if k not in self._users]:
+                self._close(key)
+
+    def clear(self):
+        """
+        close all the datasets, used or not
+        """
+        with self._lock:
+            for key in list(self._datasets):
+                self._close(key)
+
+            self._users.clear()
+            self._grids.clear()
+
+
+def _frozen(obj):
+    """
+    a hashable version of (nested) dicts and lists of arguments
+    """
+    if isinstance(obj, dict):
+        return tuple(sorted((k, _frozen(v)) for k, v in obj.items()))
+
+    if isinstance(obj, (list, tuple)):
+        return tuple(_frozen(v) for v in obj)
+
+    return obj
+
+
+def _signature(key):
+    """
+    the size and modification time of the file(s) of a pool key -- None if
+    they can't be found (e.g. a URL).
+    """
+    if key is None:
+        return None
+
+    paths = key if isinstance(key, tuple) else (key,)
+
+    try:
+        stats = [os.stat(p) for p in paths]
+    except OSError:
+        return None
+
+    return tuple((st.st_size, st.st_mtime) for st in stats)
+
+
+def _close_dataset(ds):
+    try:
+        ds.close()
+    except Exception:
+        # closed already, or never really opened
+        pass
+
+
+def _is_open(ds):
+    isopen = getattr(ds, 'isopen', None)
+
+    return isopen() if isopen is not None else True
+
+
+# the pool used by the environment objects
+dataset_pool = DatasetPool()
+
+get_dataset = dataset_pool.get_dataset
@@ -3,6 +3,8 @@ module contains objects that contain weather related data. For example,
 the Wind object defines the Wind conditions for the spill
 """
 import copy
+import logging
+from collections import OrderedDict
 
 
 try:
@@ -96,9 +98,135 @@ class Environment(GnomeId):
         """
         pass
 
+def _gridded_names(dataset):
+    '''
+    The names of the gridded (at least 2-d) variables in a dataset, and a
+    dict of them by standard_name.
+    '''
+    names = set()
+    std_names = {}
+
+    for name, var in dataset.variables.items():
+        if len(var.dimensions) < 2:
+            continue
+
+        names.add(name)
+
+        std_name = getattr(var, 'standard_name', None)
+        if std_name is not None:
+            std_names.setdefault(std_name, name)
+
+    return names, std_names
+
+
+def _find_varname(names, std_names, default_names, cf_names):
+    for name in default_names:
+        if name in names:
+            return name
+
+    for std_name in cf_names:
+        if std_name in std_names:
+            return std_names[std_name]
+
+    return None
+
+
+def match_env_classes(dataset, classes):
+    '''
+    Finds the gridded environment classes that can be made from a dataset,
+    by looking for their variables (default_names), or standard names
+    (cf_names), in one pass over the variables of the dataset.
+
+    :param dataset: netCDF4 Dataset (or MFDataset)
+    :param classes: the classes to look for
+
+    :returns: (matches, report). matches is a list of (class, varnames)
+              for the classes that have all they need in the dataset.
+              varnames is the variable name for a scalar variable, or a
+              dict of the variable names of the components of a vector.
+              report is an OrderedDict of class name: what was found, or
+              what was missing.
+
+    A vector needs its u and v components, and a class with _req_refs
+    needs a match for each of the classes it refers to.
+    '''
+    from gnome.environment.gridded_objects_base import (Variable,
+                                                        VectorVariable)
+    names, std_names = _gridded_names(dataset)
+
+    found = OrderedDict()
+    report = OrderedDict()
+
+    for cls in classes:
+        if not issubclass(cls, (Variable, VectorVariable)):
+            continue
+
+        default_names = cls.default_names or []
+        cf_names = cls.cf_names or []
+
+        if not (default_names or cf_names):
+            report[cls.__name__] = 'no variable names to look for'
+            continue
+
+        if isinstance(default_names, dict) or isinstance(cf_names, dict):
+            default_names = default_names or {}
+            cf_names = cf_names or {}
+            varnames = {}
+
+            for comp in set(default_names) | set(cf_names):
+                name = _find_varname(names, std_names,
+                                     default_names.get(comp, []),
+                                     cf_names.get(comp, []))
+                if name is not None:
+                    varnames[comp] = name
+
+            missing = [comp for comp in ('u', 'v') if comp not in varnames]
+
+            if missing:
+                report[cls.__name__] = ('no variable for {0}'
+                                        .format(', '.join(missing)))
+                continue
+
+            report[cls.__name__] = ('found ' +
+                                    ', '.join('{0}: {1}'.format(k, v) for k, v
+                                              in sorted(varnames.items())))
+        else:
+            varnames = _find_varname(names, std_names,
+                                     default_names, cf_names)
+
+            if varnames is None:
+                report[cls.__name__] = ('no variable named {0} or with '
+                                        'standard_name {1}'
+                                        .format(default_names, cf_names))
+                continue
+
+            report[cls.__name__] = 'found {0}'.format(varnames)
+
+        found[cls] = varnames
+
+    # drop the classes that refer to something that isn't there --
+    # until there are no more to drop, as refs can have refs
+    dropped = True
+    while dropped:
+        dropped = False
+
+        for cls in list(found):
+            refs = getattr(cls, '_req_refs', None) or {}
+            missing = [ref for ref, klass in refs.items()
+                       if not any(issubclass(c, klass) for c in found)]
+
+            if missing:
+                del found[cls]
+                report[cls.__name__] = ('needs {0} -- not in the file'
+                                        .format(', '.join(sorted(missing))))
+                dropped = True
+
+    return list(found.items()), report
+
+
 def env_from_netCDF(filename=None, dataset=None,
                     grid_file=None, data_file=None, _cls_list=None,
-                    **kwargs):
+                    bbox=None, **kwargs):
     '''
         Returns a list of instances of environment objects that can be produced
         from a file or dataset.  These instances will be created with a common
@@ -111,20 +239,25 @@ def env_from_netCDF(filename=None, dataset=None,
 
         If you wish to limit the types of environment objects that will
         be used, pass a list of the types using "_cls_list" kwarg
+
+        The dataset is analyzed first (see match_env_classes), and only the
+        classes whose variables are in it are built.
+
+        If a bounding box ((min_lon, min_lat), (max_lon, max_lat)) is passed
+        using the "bbox" kwarg, the objects are cropped to the part of the
+        grid that covers it, and still share one (cropped) grid.
     '''
     def attempt_from_netCDF(cls, **klskwargs):
         obj = None
         try:
-            obj = c.from_netCDF(**klskwargs)
+            obj = cls.from_netCDF(**klskwargs)
         except Exception as e:
-            import logging
             logging.warn('''Class {0} could not be constituted from netCDF file
-                                    Exception: {1}'''.format(c.__name__, e))
+                                    Exception: {1}'''.format(cls.__name__, e))
         return obj
 
-    from gnome.environment.gridded_objects_base import Variable, VectorVariable
-    from gridded.utilities import get_dataset
-    from gnome.environment import PyGrid, Environment
+    from gnome.environment.dataset_pool import dataset_pool, get_dataset
+    from gnome.environment import Environment
 
     new_env = []
 
@@ -150,7 +283,7 @@ def env_from_netCDF(filename=None, dataset=None,
 
     grid = kwargs.pop('grid', None)
     if grid is None:
-        grid = PyGrid.from_netCDF(filename=filename, dataset=dg, **kwargs)
+        grid = dataset_pool.get_grid(filename, dataset=dg, **kwargs)
         kwargs['grid'] = grid
 
     if _cls_list is None:
@@ -158,9 +291,12 @@ def env_from_netCDF(filename=None, dataset=None,
     else:
         scs = _cls_list
 
-    for c in scs:
-        if (issubclass(c, (Variable, VectorVariable)) and
-                not any([isinstance(o, c) for o in new_env])):
+    matches, report = match_env_classes(dataset, scs)
+    for name, result in report.items():
+        logging.info('env_from_netCDF: {0}: {1}'.format(name, result))
+
+    for c, _varnames in matches:
+        if not any([isinstance(o, c) for o in new_env]):
             clskwargs = copy.copy(kwargs)
             obj = None
 
@@ -178,7 +314,7 @@ def env_from_netCDF(filename=None, dataset=None,
                     if ref in clskwargs.keys():
                         continue
                     else:
-                        obj = attempt_from_netCDF(c,
+                        obj = attempt_from_netCDF(klass,
                                                   filename=filename,
                                                   dataset=dataset,
                                                   grid_file=grid_file,
@@ -199,6 +335,11 @@ def env_from_netCDF(filename=None, dataset=None,
             if obj is not None:
                 new_env.append(obj)
 
+    if bbox is not None:
+        done = {}
+        for obj in new_env:
+            obj.subset(bbox, _done=done)
+
     return new_env
 
 
@@ -217,13 +358,19 @@ def ice_env_from_netCDF(filename=None, **kwargs):
 
 
 def get_file_analysis(filename):
-    env = env_from_netCDF(filename=filename)
-    # classes = copy.copy(Environment._subclasses)
+    from gnome.environment import Environment
+    from gnome.environment.dataset_pool import get_dataset
+
+    matches, found = match_env_classes(get_dataset(filename),
+                                       copy.copy(Environment._subclasses))
+
+    report = ['Can create {0} types of environment objects'
+              .format(len(matches))]
+    report.append('Types are: {0}'.format(str([c for c, _v in matches])))
 
-    if len(env) > 0:
-        report = ['Can create {0} types of environment objects'
-                  .format(len([env.__class__ for e in env]))]
-        report.append('Types are: {0}'.format(str([e.__class__ for e in env])))
+    report.append('Variable report:')
+    for name, result in found.items():
+        report.append('    {0}: {1}'.format(name, result))
 
     report = report + grid_detection_report(filename)
 
@@ -1,5 +1,6 @@
 import copy
 from datetime import datetime
+from collections import OrderedDict
 
 import netCDF4 as nc4
 import numpy as np
@@ -11,6 +12,7 @@ import unit_conversion as uc
 
 from gnome.environment import Environment
 from gnome.environment.timeseries_objects_base import TimeseriesData, TimeseriesVector
+from gnome.environment.dataset_pool import dataset_pool
 
 from gnome.environment.gridded_objects_base import (Time,
                                                     Variable,
@@ -24,6 +26,9 @@ class S_Depth_T1(object):
 
     default_terms = [['Cs_w', 's_w', 'hc', 'Cs_r', 's_rho']]
 
+    # max number of (level, particle) depths computed at once
+    max_level_array_size = 2 ** 22
+
     def __init__(self,
                  bathymetry,
                  data_file=None,
@@ -39,10 +44,11 @@ class S_Depth_T1(object):
                     raise ValueError('Need data_file or dataset '
                                      'containing sigma equation terms')
 
-            ds = gridded.utilities.get_dataset(data_file)
+            ds = dataset_pool.get_dataset(data_file)
 
         self.bathymetry = bathymetry
         self.terms = terms
+        self._level_terms = {}
 
         if len(terms) == 0:
             for s in S_Depth_T1.default_terms:
@@ -94,6 +100,33 @@ class S_Depth_T1(object):
 
         return -(hc * (s_rho - Cs_r) + Cs_r * depths)
 
+    def _level_depth_terms(self, num_levels):
+        '''
+        The depth of a level is linear in the bathymetry:
+
+            level_depth = a + b * bathymetry
+
+        Returns the (a, b) arrays for the w or r levels, whichever have
+        num_levels levels. They are only computed once.
+        '''
+        if num_levels not in self._level_terms:
+            if num_levels == self.num_w_levels:
+                s, Cs = self.terms['s_w'], self.terms['Cs_w']
+            elif num_levels == self.num_r_levels:
+                s, Cs = self.terms['s_rho'], self.terms['Cs_r']
+            else:
+                raise ValueError('Cannot get depth interpolation alphas '
+                                 'for data shape specified; '
+                                 'does not fit r or w depth axis')
+
+            s = np.asarray(s, dtype=np.float64)
+            Cs = np.asarray(Cs, dtype=np.float64)
+            hc = float(self.terms['hc'])
+
+            self._level_terms[num_levels] = (-hc * (s - Cs), -Cs)
+
+        return self._level_terms[num_levels]
+
     def interpolation_alphas(self, points, data_shape, _hash=None):
         '''
             Returns a pair of values.
@@ -109,48 +142,46 @@ class S_Depth_T1(object):
         if len(np.where(underwater)[0]) == 0:
             return None, None
 
+        a, b = self._level_depth_terms(data_shape[0])
+
         indices = -np.ones((len(points)), dtype=np.int64)
         alphas = -np.ones((len(points)), dtype=np.float64)
         depths = self.bathymetry.at(points,
                                     datetime.now(),
                                     _hash=_hash)[underwater]
-        pts = points[underwater]
+        depths = np.asarray(depths, dtype=np.float64).reshape(-1)
+        z = points[underwater, 2]
 
-        und_ind = -np.ones((len(np.where(underwater)[0])))
-        und_alph = und_ind.copy()
+        und_ind = -np.ones((len(z),), dtype=np.int64)
+        und_alph = -np.ones((len(z),), dtype=np.float64)
 
-        if data_shape[0] == self.num_w_levels:
-            num_levels = self.num_w_levels
-            ldgb = self._w_level_depth_given_bathymetry
-        elif data_shape[0] == self.num_r_levels:
-            num_levels = self.num_r_levels
-            ldgb = self._r_level_depth_given_bathymetry
-        else:
-            raise ValueError('Cannot get depth interpolation alphas '
-                             'for data shape specified; '
-                             'does not fit r or w depth axis')
+        # the particles are done in chunks, to keep the size of the
+        # (levels x particles) arrays down
+        chunk = max(1, self.max_level_array_size // len(a))
 
-        blev_depths = ulev_depths = None
+        for start in range(0, len(z), chunk):
+            sl = slice(start, start + chunk)
+            pz = z[sl]
 
-        for ulev in range(0, num_levels):
-            ulev_depths = ldgb(depths, ulev)
-            # print ulev_depths[0]
+            # depth of each level (rows) at each particle (columns)
+            lev_depths = a[:, None] + b[:, None] * depths[None, sl]
 
-            within_layer = np.where(np.logical_and(ulev_depths < pts[:, 2],
-                                                   und_ind == -1))[0]
-            # print within_layer
+            # the particle's index is the first level above it
+            above = lev_depths < pz
+            found = above.any(axis=0)
+            lev = np.argmax(above, axis=0)
 
-            und_ind[within_layer] = ulev
+            ind = np.where(found, lev, -1)
+            alph = np.where(found, -2.0, -1.0)
 
-            if ulev == 0:
-                und_alph[within_layer] = -2
-            else:
-                a = ((pts[:, 2].take(within_layer) -
-                      blev_depths.take(within_layer)) /
-                     (ulev_depths.take(within_layer) -
-                      blev_depths.take(within_layer)))
-                und_alph[within_layer] = a
-            blev_depths = ulev_depths
+            # in between two levels
+            between = np.nonzero(lev > 0)[0]
+            upper = lev_depths[lev[between], between]
+            lower = lev_depths[lev[between] - 1, between]
+            alph[between] = (pz[between] - lower) / (upper - lower)
+
+            und_ind[sl] = ind
+            und_alph[sl] = alph
 
         indices[underwater] = und_ind
         alphas[underwater] = und_alph
@@ -224,10 +255,17 @@ class VelocityGrid(VectorVariable):
             if kwargs.get('dataset', None) is not None:
                 df = kwargs['dataset']
             elif kwargs.get('grid_file', None) is not None:
-                df = gridded.utilities.get_dataset(kwargs['grid_file'])
+                df = dataset_pool.get_dataset(kwargs['grid_file'])
+
+            variables = kwargs.get('variables') or []
+            rotated = any(getattr(getattr(v, 'data', None), 'gnome_rotated',
+                                  False)
+                          for v in variables)
 
-            if df is not None and 'angle' in df.variables.keys():
+            if (df is not None and 'angle' in df.variables.keys() and
+                    not rotated):
                 # Unrotated ROMS Grid!
+                # (the forcing cache may have rotated the data already)
                 self.angle = Variable(name='angle',
                                       units='radians',
                                       time=Time.constant_time(),
@@ -414,15 +452,106 @@ class GridSediment(Variable, Environment):
     default_names = ['sand_06']
 
 
+class IceState(object):
+    '''
+    The ice at a set of points, at one time: the concentration, and the
+    ice factor derived from it -- 0 in open water (concentration < 0.2),
+    1 in the ice (concentration >= 0.8), and linear in between. It is the
+    weight of the ice velocity against the water (or wind) velocity.
+
+    The ice velocity is found when first asked for.
+    '''
+    def __init__(self, points, time, concentration, extrapolate):
+        self.points = points
+        self.time = time
+        self.extrapolate = extrapolate
+
+        self.concentration = concentration
+        self.ice_factor = np.clip((concentration - 0.2) * 10 / 6, 0, 1)
+        self.any_ice = bool(np.any(concentration >= 0.2))
+
+        self._velocities = {}
+
+    def velocity(self, ice_velocity, extrapolate=False, **kwargs):
+        '''
+        ice_velocity.at() the points -- found once for each ice velocity
+        '''
+        key = (id(ice_velocity), extrapolate)
+
+        if key not in self._velocities:
+            # ice_velocity is kept, so its id is not reused
+            value = ice_velocity.at(self.points, self.time,
+                                    extrapolate=extrapolate, **kwargs)
+            self._velocities[key] = (ice_velocity, value)
+
+        return self._velocities[key][1]
+
+
+def _positions_key(_hash, time):
+    '''
+    the positions key in a _hash passed by a PyMover, which is
+    (positions key, time) -- None for any other _hash.
+    '''
+    if isinstance(_hash, tuple) and len(_hash) == 2 and _hash[1] == time:
+        return _hash[0]
+
+    return None
+
+
 class IceConcentration(Variable, Environment):
     _ref_as = ['ice_concentration', 'ice_aware']
     default_names = ['ice_fraction', ]
     cf_names = ['sea_ice_area_fraction']
     _gnome_unit = 'fraction'
 
+    # number of ice states kept
+    _ice_state_memo_size = 4
+
     def __init__(self, *args, **kwargs):
         super(IceConcentration, self).__init__(*args, **kwargs)
 
+        self._ice_states = OrderedDict()
+
+    def ice_state(self, points, time, extrapolate=False, key=None):
+        '''
+        The IceState at points and time. The ice aware objects sharing this
+        concentration (IceAwareCurrent, IceAwareWind, IceAwareRandomMover)
+        share the state, so the concentration (and ice velocity) is found
+        once per time step.
+
+        :param key=None: identifies the points, e.g. the spill container's
+                         positions_key() -- a new key (the positions
+                         changed) gets a new state. The points are hashed
+                         if None.
+        '''
+        if key is None:
+            key = self._get_hash(points, time)
+
+        key = (key, time)
+
+        states = self.__dict__.setdefault('_ice_states', OrderedDict())
+        state = states.pop(key, None)
+
+        if (state is not None and state.extrapolate and not extrapolate and
+                not self._in_time_range(time)):
+            # found again below, so the error is raised
+            state = None
+
+        if state is None:
+            cctn = self.at(points, time, extrapolate=extrapolate).copy()
+            state = IceState(np.array(points), time, cctn, extrapolate)
+
+        states[key] = state
+        while len(states) > self._ice_state_memo_size:
+            states.popitem(last=False)
+
+        return state
+
+    def _in_time_range(self, time):
+        t = self.time
+
+        return len(t.data) == 1 or t.min_time <= time <= t.max_time
+
 
 class Bathymetry(Variable):
     _gnome_unit = 'm'
@@ -500,38 +629,53 @@ class GridCurrent(VelocityGrid, Environment):
 
         return value
 
-    def get_data_vectors(self):
+    def _data_vectors(self, time_index):
         '''
-        return array of shape (2, time_slices, len_linearized_data)
-        first is magnitude, second is direction
+        the u and v, as in the base class, rotated by the grid angle
         '''
+        r = super(GridCurrent, self)._data_vectors(time_index)
 
         if(hasattr(self, 'angle') and self.angle):
+            lin_u = r[0, :, :]
+            lin_v = r[1, :, :]
 
-            raw_uv = super(GridCurrent, self).get_data_vectors()
-            lin_u = raw_uv[0,:,:]
-            lin_v = raw_uv[1,:,:]
-
-            raw_ang = self.angle.data[:]
-            angle_padding_slice = self.grid.get_padding_slices(self.grid.center_padding)
-            raw_ang = raw_ang[angle_padding_slice]
-
-            if 'degree' in self.angle.units:
-                raw_ang = raw_ang * np.pi/180.
-            
-            ctr_mask = gridded.utilities.gen_celltree_mask_from_center_mask(self.grid.center_mask, angle_padding_slice)
-            ang = raw_ang.reshape(-1)
-            ang = np.ma.MaskedArray(ang, mask = ctr_mask.reshape(-1))
-            ang = ang.compressed()
+            ang = self._linear_angles()
 
             x = lin_u[:] * np.cos(ang) - lin_v[:] * np.sin(ang)
             y = lin_u[:] * np.sin(ang) + lin_v[:] * np.cos(ang)
             r = np.concatenate((x[None,:], y[None,:]))
-            return np.ascontiguousarray(r.astype(np.float32)) # r.compressed().astype(np.float32)
-            # return np.ascontiguousarray(r.filled(0), np.float32)
 
-        else:
-            return super(GridCurrent, self).get_data_vectors()
+            return np.ascontiguousarray(r, np.float32)
+
+        return r
+
+    def _linear_angles(self):
+        '''
+        the grid angles (radians) of the cells in the data vectors -- the
+        same for every time slice, so found once.
+        '''
+        key = (id(self.grid), id(self.angle.data))
+
+        cached = getattr(self, '_linear_angles_cache', None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        raw_ang = self.angle.data[:]
+        angle_padding_slice = self.grid.get_padding_slices(self.grid.center_padding)
+        raw_ang = raw_ang[angle_padding_slice]
+
+        if 'degree' in self.angle.units:
+            raw_ang = raw_ang * np.pi/180.
+
+        ctr_mask = gridded.utilities.gen_celltree_mask_from_center_mask(self.grid.center_mask, angle_padding_slice)
+        ang = raw_ang.reshape(-1)
+        ang = np.ma.MaskedArray(ang, mask = ctr_mask.reshape(-1))
+        ang = ang.compressed()
+
+        # the grid and angle are kept, so their ids are not reused
+        self._linear_angles_cache = (key, ang, self.grid, self.angle.data)
+
+        return ang
 
 class GridWind(VelocityGrid, Environment):
     _ref_as = 'wind'
@@ -786,32 +930,21 @@ class IceAwareCurrent(GridCurrent):
 
     def at(self, points, time, *args, **kwargs):
         extrapolate = self.extrapolation_is_allowed
-        cctn = (self.ice_concentration.at(points, time,
-                                            extrapolate=extrapolate, **kwargs)
-                  .copy())
+
+        ice = (self.ice_concentration
+               .ice_state(points, time, extrapolate=extrapolate,
+                          key=_positions_key(kwargs.get('_hash'), time)))
 
         water_v = super(IceAwareCurrent, self).at(points,
                                                   time,
                                                   *args,
                                                   **kwargs)
 
-        if np.any(cctn >= 0.2):
-            ice_mask = cctn >= 0.8
-            water_mask = cctn < 0.2
-            interp_mask = np.logical_and(cctn >= 0.2, cctn < 0.8)
+        if ice.any_ice:
+            ice_v = ice.velocity(self.ice_velocity, extrapolate)
 
-            ice_vel_factor = cctn.copy()
-            ice_vel_factor[ice_mask] = 1
-            ice_vel_factor[water_mask] = 0
-            ice_vel_factor[interp_mask] = ((ice_vel_factor[interp_mask] - 0.2) * 10) / 6
-
-            vels = water_v.copy()
-            ice_v = self.ice_velocity.at(points, time, extrapolate=extrapolate, *args, **kwargs).copy()
-
-            #deals with the >0.8 concentration case
-            vels[:] = vels[:] + (ice_v - water_v) * ice_vel_factor
-
-            return vels
+            # deals with the >0.8 concentration case too
+            return water_v + (ice_v - water_v) * ice.ice_factor
         else:
             return water_v
 
@@ -851,26 +984,15 @@ class IceAwareWind(GridWind):
     def at(self, points, time, *args, **kwargs):
         extrapolate = self.extrapolation_is_allowed
 
-        cctn = self.ice_concentration.at(points, time, extrapolate=extrapolate, *args, **kwargs)
-        wind_v = super(IceAwareWind, self).at(points, time, *args, **kwargs)
-
-        if np.any(cctn >= 0.2):
-            ice_mask = cctn >= 0.8
-            water_mask = cctn < 0.2
-            interp_mask = np.logical_and(cctn >= 0.2, cctn < 0.8)
-
-            ice_vel_factor = cctn.copy()
-            ice_vel_factor[ice_mask] = 1
-            ice_vel_factor[water_mask] = 0
-            ice_vel_factor[interp_mask] = ((ice_vel_factor[interp_mask] - 0.2) * 10) / 6
+        ice = (self.ice_concentration
+               .ice_state(points, time, extrapolate=extrapolate,
+                          key=_positions_key(kwargs.get('_hash'), time)))
 
-            vels = wind_v.copy()
-            vels[ice_mask] = 0
+        wind_v = super(IceAwareWind, self).at(points, time, *args, **kwargs)
 
+        if ice.any_ice:
             # scale winds from 100-0% depending on ice coverage
             # 100% wind up to 0.2 coverage, 0% wind at >0.8 coverage
-            vels[:] = vels[:] * (1 - ice_vel_factor)
-
-            return vels
+            return wind_v * (1 - ice.ice_factor)
         else:
             return wind_v
@@ -0,0 +1,494 @@
+"""
+A local, uncompressed copy of gridded forcing files
+
+Operational model output is often compressed, and chunked in a way that is
+poor for reading one time slice at a time -- the same chunks are read and
+decompressed again for each slice. prepare_forcing() converts the gridded
+variables of such a file, once, into .npy files in a cache directory, with
+one contiguous float32 slice per time step:
+
+  - masked values are filled in,
+  - the vector components on the grid of the file's angle variable are
+    rotated to east / north.
+
+Once a file is prepared, the dataset pool gives the environment objects a
+CachedDataset for it, that reads those variables with np.memmap (the other
+variables, e.g. the grid, still come from the file). The cache is keyed on
+a hash of the file's contents, so it is used by every run, and every copy
+of the file. The hash is kept with the file's path, size and modification
+time, and a file is only read to hash it if it is the size of a prepared
+one.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import six
+
+import gridded
+
+from gnome.environment.multi_file import _find_time_dim
+
+# the (u, v) pairs rotated by the angle, if they are on its grid
+vector_pairs = (('u', 'v'),
+                ('Uwind', 'Vwind'),
+                ('u_eastward', 'v_northward'),
+                ('water_u', 'water_v'),
+                ('air_u', 'air_v'))
+
+# attributes that don't apply to the converted data
+_dropped_attrs = ('_FillValue', 'missing_value', 'scale_factor',
+                  'add_offset', 'valid_range', 'valid_min', 'valid_max')
+
+# how much of a variable is read at once while converting it
+_block_bytes = 64 * 2 ** 20
+
+
+def file_hash(filename, blocksize=2 ** 20):
+    """
+    sha1 of the contents of a file
+    """
+    sha = hashlib.sha1()
+
+    with open(filename, 'rb') as fh:
+        for block in iter(lambda: fh.read(blocksize), b''):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+class ForcingCache(object):
+    """
+    A directory of converted forcing files, one sub-directory per file,
+    named by the hash of its contents.
+    """
+    index_name = 'index.json'
+    meta_name = 'meta.json'
+
+    def __init__(self, cache_dir=None):
+        """
+        :param cache_dir=None: where the converted files are kept. The
+                               default is $GNOME_FORCING_CACHE, or
+                               gnome_forcing_cache in the temp directory.
+        """
+        if cache_dir is None:
+            cache_dir = os.environ.get('GNOME_FORCING_CACHE',
+                                       os.path.join(tempfile.gettempdir(),
+                                                    'gnome_forcing_cache'))
+
+        self.cache_dir = cache_dir
+
+        self._lock = threading.RLock()
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, self.index_name)) as fh:
+                return json.load(fh)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        _write_json(os.path.join(self.cache_dir, self.index_name), index)
+
+    def source_hash(self, filename):
+        """
+        The hash of filename's contents. It is kept in the index, with the
+        file's size and modification time, so the file is only read again
+        when it has changed.
+        """
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        sig = [stat.st_size, stat.st_mtime]
+
+        with self._lock:
+            index = self._read_index()
+            entry = index.get(path)
+
+            if entry is not None and entry['sig'] == sig:
+                return entry['hash']
+
+            sha = file_hash(path)
+
+            if os.path.isdir(self.cache_dir):
+                index[path] = {'sig': sig, 'hash': sha}
+                self._write_index(index)
+
+        return sha
+
+    def _known_hash(self, filename):
+        '''
+        The hash of filename's contents, if it can be found without reading
+        the file: None if the file isn't in the index, and is not the size
+        of a prepared file (so it can't be a copy of one).
+        '''
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        sig = [stat.st_size, stat.st_mtime]
+
+        index = self._read_index()
+
+        entry = index.get(path)
+        if entry is not None and entry['sig'] == sig:
+            return entry['hash']
+
+        for entry in index.values():
+            if (entry['sig'][0] == stat.st_size and
+                    os.path.isfile(os.path.join(self.cache_dir,
+                                                entry['hash'],
+                                                self.meta_name))):
+                return self.source_hash(filename)
+
+        return None
+
+    def _find(self, filename):
+        '''
+        the directory and metadata of the converted file -- (None, None) if
+        there isn't one.
+        '''
+        if (not isinstance(filename, six.string_types) or
+                not os.path.isdir(self.cache_dir) or
+                not os.path.isfile(filename)):
+            return None, None
+
+        sha = self._known_hash(filename)
+        if sha is None:
+            return None, None
+
+        directory = os.path.join(self.cache_dir, sha)
+
+        try:
+            with open(os.path.join(directory, self.meta_name)) as fh:
+                return directory, json.load(fh)
+        except (IOError, OSError, ValueError):
+            return None, None
+
+    def is_prepared(self, filename, varnames=None):
+        """
+        True if filename has been converted -- with all of varnames, if
+        given.
+        """
+        _directory, meta = self._find(filename)
+
+        if meta is None:
+            return False
+
+        return varnames is None or all(n in meta['variables']
+                                       for n in varnames)
+
+    def prepare(self, filename, varnames=None, fill_value=0.0,
+                angle='angle'):
+        """
+        Convert the variables of a netCDF file into the cache -- if they
+        haven't been already.
+
+        :param filename: the netCDF file
+        :param varnames=None: names of the variables to convert. The
+                              default is every variable with a time and
+                              two or more dimensions.
+        :param fill_value=0.0: value put in place of the masked values
+        :param angle='angle': name of the grid angle variable, if any
+
+        :returns: the directory of the converted files
+        """
+        directory, meta = self._find(filename)
+
+        ds = gridded.utilities.get_dataset(filename)
+
+        try:
+            if varnames is None:
+                varnames = _gridded_varnames(ds)
+
+            if meta is not None and all(n in meta['variables']
+                                        for n in varnames):
+                return directory
+
+            with self._lock:
+                if not os.path.isdir(self.cache_dir):
+                    os.makedirs(self.cache_dir)
+
+                directory = os.path.join(self.cache_dir,
+                                         self.source_hash(filename))
+
+                if not os.path.isdir(directory):
+                    os.makedirs(directory)
+
+                if meta is None:
+                    meta = {'source': os.path.abspath(filename),
+                            'fill_value': fill_value,
+                            'variables': {}}
+
+                _convert(ds, directory, varnames, meta, fill_value, angle)
+
+                # written last: the conversion is complete
+                _write_json(os.path.join(directory, self.meta_name), meta)
+        finally:
+            ds.close()
+
+        return directory
+
+    def open(self, filename):
+        """
+        A CachedDataset for filename, or None if it hasn't been converted
+        """
+        directory, meta = self._find(filename)
+
+        if meta is None:
+            return None
+
+        return CachedDataset(gridded.utilities.get_dataset(filename),
+                             directory, meta)
+
+    def remove(self, filename):
+        """
+        remove the converted variables of filename
+        """
+        directory, _meta = self._find(filename)
+
+        if directory is not None:
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+
+            os.rmdir(directory)
+
+
+def _write_json(path, obj):
+    # to a temporary file first, so it's never seen half written
+    tmp = path + '.tmp'
+
+    with open(tmp, 'w') as fh:
+        json.dump(obj, fh, indent=1)
+
+    _replace(tmp, path)
+
+
+def _replace(src, dst):
+    '''
+    rename src to dst, replacing dst if it exists -- os.rename() won't on
+    Windows, and python 2 has no os.replace()
+    '''
+    try:
+        os.rename(src, dst)
+    except OSError:
+        if not os.path.exists(dst):
+            raise
+
+        os.remove(dst)
+        os.rename(src, dst)
+
+
+def _gridded_varnames(ds):
+    try:
+        time_dim = _find_time_dim(ds)
+    except ValueError:
+        return []
+
+    return [name for name, var in ds.variables.items()
+            if (len(var.dimensions) >= 3 and
+                var.dimensions[0] == time_dim)]
+
+
+def _filled(data, fill_value):
+    if np.ma.isMaskedArray(data):
+        data = data.filled(fill_value)
+
+    data = np.asarray(data, dtype=np.float32)
+    data[np.isnan(data)] = fill_value
+
+    return data
+
+
+def _convert(ds, directory, varnames, meta, fill_value, angle):
+    '''
+    write the variables, a block of time slices at a time, rotating the
+    vector pairs on the angle's grid.
+    '''
+    angles = None
+    if angle is not None and angle in ds.variables:
+        angles = np.ma.filled(ds.variables[angle][:], 0.0).astype(np.float64)
+
+        if 'degree' in getattr(ds.variables[angle], 'units', ''):
+            angles = np.deg2rad(angles)
+
+    rotate = {}
+    if angles is not None:
+        for u, v in vector_pairs:
+            if (u in varnames and v in varnames and
+                    ds.variables[u].shape == ds.variables[v].shape and
+                    ds.variables[u].shape[-angles.ndim:] == angles.shape):
+                rotate[u] = v
+
+    done = set()
+    for name in varnames:
+        if name in done:
+            continue
+
+        if name in rotate:
+            names = (name, rotate[name])
+        else:
+            names = (name,)
+
+        sources = [ds.variables[n] for n in names]
+        shape = sources[0].shape
+
+        outputs = [np.lib.format.open_memmap(os.path.join(directory,
+                                                          n + '.npy'),
+                                             mode='w+',
+                                             dtype=np.float32,
+                                             shape=shape)
+                   for n in names]
+
+        slice_bytes = 4 * int(np.prod(shape[1:]))
+        step = max(1, _block_bytes // max(slice_bytes, 1))
+
+        for start in range(0, shape[0], step):
+            block = slice(start, min(start + step, shape[0]))
+            data = [_filled(src[block], fill_value) for src in sources]
+
+            if len(names) == 2:
+                cos, sin = np.cos(angles), np.sin(angles)
+                u, v = data
+
+                data = [u * cos - v * sin, u * sin + v * cos]
+
+            for out, d in zip(outputs, data):
+                out[block] = d
+
+        for out in outputs:
+            out.flush()
+
+        for n, src in zip(names, sources):
+            meta['variables'][n] = {'shape': list(shape),
+                                    'rotated': len(names) == 2}
+            done.add(n)
+
+        del outputs
+
+
+class CachedVariable(object):
+    """
+    Stands in for a netCDF4 Variable -- its data read from the converted
+    .npy file, with np.memmap.
+    """
+    def __init__(self, name, filename, var, rotated=False):
+        """
+        :param name: name of the variable
+        :param filename: the .npy file
+        :param var: the variable in the netCDF file
+        :param rotated=False: True if the vector was rotated by the angle
+        """
+        self.name = name
+        self.dimensions = var.dimensions
+
+        self._data = np.load(filename, mmap_mode='r')
+
+        self._attrs = OrderedDict((n, var.getncattr(n))
+                                  for n in var.ncattrs()
+                                  if n not in _dropped_attrs)
+        if rotated:
+            self._attrs['gnome_rotated'] = 1
+
+    def __getattr__(self, name):
+        # only called for attributes not found on this object
+        if name.startswith('__') or name == '_attrs':
+            raise AttributeError(name)
+
+        try:
+            return self._attrs[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def ncattrs(self):
+        return list(self._attrs.keys())
+
+    def getncattr(self, name):
+        return self._attrs[name]
+
+    @property
+    def shape(self):
+        return self._data.shape
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    @property
+    def ndim(self):
+        return self._data.ndim
+
+    @property
+    def size(self):
+        return self._data.size
+
+    def __len__(self):
+        return len(self._data)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self._data, dtype=dtype)
+
+    def __getitem__(self, key):
+        # a copy, so the file can be closed while the data are in use
+        return np.array(self._data[key])
+
+
+class CachedDataset(object):
+    """
+    A netCDF dataset, with the converted variables read from the cache.
+    Everything else comes from the dataset itself.
+    """
+    def __init__(self, dataset, directory, meta):
+        self._dataset = dataset
+        self.directory = directory
+
+        self.variables = OrderedDict()
+        for name, var in dataset.variables.items():
+            info = meta['variables'].get(name)
+
+            if info is None:
+                self.variables[name] = var
+            else:
+                self.variables[name] = CachedVariable(name,
+                                                      os.path.join(directory,
+                                                                   name +
+                                                                   '.npy'),
+                                                      var,
+                                                      info['rotated'])
+
+    def __getattr__(self, name):
+        # dimensions, global attributes, etc. of the dataset
+        if name.startswith('__') or name == '_dataset':
+            raise AttributeError(name)
+
+        return getattr(self._dataset, name)
+
+    def __getitem__(self, name):
+        return self.variables[name]
+
+    def isopen(self):
+        return self._dataset.isopen()
+
+    def close(self):
+        self._dataset.close()
+
+
+forcing_cache = ForcingCache()
+
+
+def prepare_forcing(filename, varnames=None, cache_dir=None, **kwargs):
+    """
+    Convert the gridded variables of a netCDF file into the forcing cache,
+    so the environment objects made from it read them from there.
+
+    See ForcingCache.prepare() for the arguments.
+
+    :param cache_dir=None: the cache directory -- the default one if None
+    :returns: the directory of the converted files
+    """
+    cache = forcing_cache if cache_dir is None else ForcingCache(cache_dir)
+
+    return cache.prepare(filename, varnames, **kwargs)
@@ -0,0 +1,284 @@
+"""
+Spatial subsetting of gridded data
+
+Tools to crop a grid to the part of it that covers a region of interest,
+and to read only the matching window of the data variables on that grid,
+so that memory use and the amount of data read scale with the region,
+rather than with the whole model domain.
+
+A subset is described by a "data index": a tuple with one selector for
+each of the trailing (spatial) dimensions of a variable. A selector is
+either a slice, for a contiguous window, or a sorted array of indexes
+(used for the nodes or faces of an unstructured grid).
+"""
+
+import numpy as np
+
+
+def buffered_bbox(bbox, buffer=0.0):
+    """
+    a bounding box expanded on all sides
+
+    :param bbox: ((min_lon, min_lat), (max_lon, max_lat))
+    :param buffer=0.0: amount to add on each side, in degrees
+    """
+    bbox = np.array(bbox, dtype=np.float64).reshape((2, 2))
+
+    bbox[0] -= buffer
+    bbox[1] += buffer
+
+    return bbox
+
+
+def _in_bbox(lon, lat, bbox):
+    lon = np.ma.filled(np.ma.asarray(lon, dtype=np.float64), np.nan)
+    lat = np.ma.filled(np.ma.asarray(lat, dtype=np.float64), np.nan)
+
+    return ((lon >= bbox[0, 0]) & (lon <= bbox[1, 0]) &
+            (lat >= bbox[0, 1]) & (lat <= bbox[1, 1]))
+
+
+def _covering_range(inside, size):
+    """
+    the index range of the True values along an axis, padded by one on
+    each side, so the cells around the region are complete.
+    At least two nodes are kept.
+    """
+    idx = np.nonzero(inside)[0]
+
+    start = max(idx[0] - 1, 0)
+    stop = min(idx[-1] + 2, size)
+
+    if stop - start < 2:
+        start = max(min(start, size - 2), 0)
+        stop = min(start + 2, size)
+
+    return start, stop
+
+
+def structured_window(lon, lat, bbox):
+    """
+    The window of a curvilinear grid that covers a bounding box
+
+    :param lon: 2-d array of node longitudes
+    :param lat: 2-d array of node latitudes
+    :param bbox: ((min_lon, min_lat), (max_lon, max_lat))
+
+    :returns: ((row_start, row_stop), (col_start, col_stop)), or None if
+              the grid doesn't overlap the bounding box.
+    """
+    bbox = np.asarray(bbox, dtype=np.float64).reshape((2, 2))
+    inside = _in_bbox(lon, lat, bbox)
+
+    if not inside.any():
+        return None
+
+    rows = _covering_range(inside.any(axis=1), inside.shape[0])
+    cols = _covering_range(inside.any(axis=0), inside.shape[1])
+
+    return rows, cols
+
+
+def structured_index(window, node_shape, shape):
+    """
+    The data index of an array on a structured grid (at the nodes, centers
+    or edges) for a window of the nodes.
+
+    Arrays bigger or smaller than the node arrays (e.g. ROMS padding) are
+    cropped so they keep the same difference in size.
+
+    :param window: ((row_start, row_stop), (col_start, col_stop)) of the
+                   nodes, as returned by structured_window()
+    :param node_shape: the full shape of the node arrays
+    :param shape: the full shape of the array
+    """
+    return tuple(slice(start, stop + size - node_size)
+                 for (start, stop), size, node_size
+                 in zip(window, shape[-2:], node_shape[-2:]))
+
+
+def regular_window(lon, lat, bbox):
+    """
+    The window of a regular (rectangular) grid that covers a bounding box
+
+    :param lon: 1-d array of longitudes
+    :param lat: 1-d array of latitudes
+    :param bbox: ((min_lon, min_lat), (max_lon, max_lat))
+
+    :returns: ((lon_start, lon_stop), (lat_start, lat_stop)), or None if
+              the grid doesn't overlap the bounding box.
+    """
+    bbox = np.asarray(bbox, dtype=np.float64).reshape((2, 2))
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+
+    in_lon = (lon >= bbox[0, 0]) & (lon <= bbox[1, 0])
+    in_lat = (lat >= bbox[0, 1]) & (lat <= bbox[1, 1])
+
+    if not (in_lon.any() and in_lat.any()):
+        return None
+
+    return (_covering_range(in_lon, len(lon)),
+            _covering_range(in_lat, len(lat)))
+
+
+def ugrid_subset(nodes, faces, bbox):
+    """
+    The faces of an unstructured grid that cover a bounding box, and the
+    nodes they use.
+
+    :param nodes: (num_nodes, 2) array of node coordinates
+    :param faces: (num_faces, num_vertices) array of node indexes -- may
+                  be a masked array, or use negative values, for faces with
+                  fewer vertices.
+    :param bbox: ((min_lon, min_lat), (max_lon, max_lat))
+
+    :returns: (node_idx, face_idx, new_faces): sorted arrays of the nodes
+              and faces kept, and the kept faces, renumbered to the new
+              node indexes. Returns None if no faces are in the bounding
+              box.
+    """
+    bbox = np.asarray(bbox, dtype=np.float64).reshape((2, 2))
+    nodes = np.asarray(nodes, dtype=np.float64)
+
+    mask = np.ma.getmaskarray(faces)
+    faces = np.ma.filled(faces, -1).astype(np.int64)
+    mask |= faces < 0
+
+    inside = _in_bbox(nodes[:, 0], nodes[:, 1], bbox)
+
+    # keep any face with a node in the box
+    face_inside = (inside[np.where(mask, 0, faces)] & ~mask).any(axis=1)
+    face_idx = np.nonzero(face_inside)[0]
+
+    if len(face_idx) == 0:
+        return None
+
+    kept = faces[face_idx]
+    kept_mask = mask[face_idx]
+    node_idx = np.unique(kept[~kept_mask])
+
+    renumber = renumbering(node_idx, len(nodes))
+    new_faces = np.ma.array(renumber[np.where(kept_mask, 0, kept)],
+                            mask=kept_mask)
+    if not kept_mask.any():
+        new_faces = new_faces.data
+
+    return node_idx, face_idx, new_faces
+
+
+def renumbering(kept, size):
+    """
+    An array mapping old indexes to new ones, for the kept indexes out of
+    size. Indexes that are not kept map to -1.
+    """
+    renumber = np.empty((size,), dtype=np.int64)
+    renumber.fill(-1)
+    renumber[kept] = np.arange(len(kept))
+
+    return renumber
+
+
+def renumber_connectivity(connectivity, kept_rows, renumber):
+    """
+    Subset a connectivity array (e.g. face_face_connectivity, edges), and
+    renumber the indexes it holds.
+
+    :param connectivity: (N, M) array of indexes, negative or masked for
+                         none.
+    :param kept_rows: the rows to keep (or a boolean mask)
+    :param renumber: old to new index mapping, as made by renumbering()
+
+    Indexes that were not kept become -1.
+    """
+    conn = np.ma.filled(connectivity, -1).astype(np.int64)[kept_rows]
+    missing = conn < 0
+
+    return np.where(missing, -1, renumber[np.where(missing, 0, conn)])
+
+
+def _selector_slice(sel):
+    """
+    contiguous slice to read for a selector, and what to take from it
+    """
+    if isinstance(sel, slice):
+        return sel, None
+
+    sel = np.asarray(sel)
+
+    return slice(sel[0], sel[-1] + 1), sel - sel[0]
+
+
+class WindowedData(object):
+    """
+    A view of a variable (e.g. a netCDF4 Variable) through a data index:
+    only the selected window of the trailing (spatial) dimensions is read.
+
+    Attributes are looked up on the wrapped variable, so this can stand in
+    for it.
+    """
+    def __init__(self, data, index):
+        """
+        :param data: the variable to wrap
+
+        :param index: one selector (slice or sorted index array) for each
+                      of the trailing dimensions of data.
+        """
+        self._data = data
+        self._index = tuple(index)
+        self._num_lead = len(data.shape) - len(self._index)
+
+        shape = list(data.shape[:self._num_lead])
+        for sel, size in zip(self._index, data.shape[self._num_lead:]):
+            if isinstance(sel, slice):
+                shape.append(len(range(*sel.indices(size))))
+            else:
+                shape.append(len(sel))
+
+        self.shape = tuple(shape)
+
+    def __getattr__(self, name):
+        # only called for attributes not found on this object
+        if name.startswith('__') or name == '_data':
+            raise AttributeError(name)
+
+        return getattr(self._data, name)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None):
+        return np.asarray(self[:], dtype=dtype)
+
+    def _full_key(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if any(k is Ellipsis for k in key):
+            i = [k is Ellipsis for k in key].index(True)
+            key = (key[:i] +
+                   (slice(None),) * (self.ndim - len(key) + 1) +
+                   key[i + 1:])
+
+        return key + (slice(None),) * (self.ndim - len(key))
+
+    def __getitem__(self, key):
+        key = self._full_key(key)
+        lead = key[:self._num_lead]
+        spatial = key[self._num_lead:]
+
+        reads, takes = zip(*[_selector_slice(sel) for sel in self._index])
+
+        arr = self._data[tuple(lead) + tuple(reads)]
+
+        # the spatial dimensions are always the last ones of what was read
+        num_spatial = len(self._index)
+        for i, take in enumerate(takes):
+            if take is not None:
+                arr = arr.take(take, axis=arr.ndim - num_spatial + i)
+
+        return arr[(Ellipsis,) + tuple(spatial)]
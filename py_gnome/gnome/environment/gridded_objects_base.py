@@ -2,6 +2,7 @@ import datetime
 import StringIO
 import copy
 import numpy as np
+from collections import OrderedDict
 import logging
 import warnings
 from functools import wraps
@@ -20,6 +21,18 @@ from gnome.persist.base_schema import GeneralGnomeObjectSchema
 from gnome.persist.validators import convertible_to_seconds
 from gnome.persist.extend_colander import LocalDateTime
 from gnome.utilities.inf_datetime import InfDateTime
+from gnome.environment.slice_cache import TimeSliceCache
+from gnome.environment.dataset_pool import dataset_pool
+from gnome.environment.multi_file import (MultiFileDataset,
+                                          expand_filenames,
+                                          is_multi_file)
+from gnome.environment.grid_subset import (WindowedData,
+                                           structured_window,
+                                           structured_index,
+                                           regular_window,
+                                           ugrid_subset,
+                                           renumbering,
+                                           renumber_connectivity)
 
 
 class TimeSchema(base_schema.ObjTypeSchema):
@@ -115,10 +128,178 @@ class Time(gridded.time.Time, GnomeId):
         return Time(t)
 
 
-class Grid_U(gridded.grids.Grid_U, GnomeId):
+class LocationCacheMixin(object):
+    '''
+    Remembers the cells and interpolation weights found for the last few
+    sets of points.
+
+    The environment objects built from one file usually share a grid, and
+    are all evaluated at the same element positions in a time step, so
+    this way the positions are only located once per grid, rather than
+    once per variable.
+    '''
+    # number of point sets remembered -- a step only needs a few
+    location_cache_size = 4
+
+    # arguments that change how a result is computed or returned, but not
+    # what it is
+    _location_ignored_args = ('_memo', '_copy', '_hash', 'indices')
+
+    def _location_lookup(self, kind, points, args, kwargs):
+        '''
+        returns (key, points, result): result is None if it's not cached.
+        key is None if the arguments can't be used as a key.
+
+        If a _hash argument is given (a PyMover passes the spill
+        container's positions_key()), it identifies the points, and they
+        aren't looked at. Otherwise the points are hashed, and compared
+        with the cached ones.
+        '''
+        cache = self.__dict__.setdefault('_location_cache', OrderedDict())
+
+        extra = (tuple(args) +
+                 tuple(sorted((k, v) for k, v in kwargs.items()
+                              if k not in self._location_ignored_args)))
+
+        _hash = kwargs.get('_hash')
+        if _hash is not None:
+            try:
+                key = (kind, '_hash', _hash, extra)
+                entry = cache.pop(key, None)
+            except TypeError:
+                # something unhashable (an array) -- don't cache
+                return None, None, None
+
+            if entry is None:
+                return key, None, None
+
+            cache[key] = entry
+
+            return key, None, entry[1]
+
+        pts = np.asarray(points, dtype=np.float64)
+        pts = np.ascontiguousarray(pts.reshape(-1, pts.shape[-1])[:, :2])
+
+        try:
+            key = (kind, pts.shape, hash(pts.tobytes()), extra)
+            entry = cache.pop(key, None)
+        except TypeError:
+            return None, pts, None
+
+        if entry is None or not np.array_equal(entry[0], pts):
+            return key, pts, None
+
+        cache[key] = entry
+
+        return key, pts, entry[1]
+
+    def _location_store(self, key, pts, result):
+        # pts is None when the key is a _hash
+        cache = self._location_cache
+
+        cache[key] = (pts, result)
+        while len(cache) > self.location_cache_size:
+            cache.popitem(last=False)
+
+    def _cached_location(self, kind, method, points, args, kwargs):
+        key, pts, result = self._location_lookup(kind, points, args, kwargs)
+
+        if result is None:
+            result = method(points, *args, **kwargs)
+
+            if key is not None:
+                self._location_store(key, pts, result)
+
+        if kwargs.get('_copy', False):
+            result = copy.deepcopy(result)
+
+        return result
+
+    def locate_faces(self, points, *args, **kwargs):
+        return self._cached_location('faces',
+                                     super(LocationCacheMixin,
+                                           self).locate_faces,
+                                     points, args, kwargs)
+
+    def interpolation_alphas(self, points, *args, **kwargs):
+        return self._cached_location('alphas',
+                                     super(LocationCacheMixin,
+                                           self).interpolation_alphas,
+                                     points, args, kwargs)
+
+    def clear_location_cache(self):
+        self.__dict__.pop('_location_cache', None)
+
+
+def _subset_copy(grid):
+    '''
+    A shallow copy of a grid, to be cropped -- without the cell trees and
+    memos, which belong to the full grid.
+    '''
+    new = copy.copy(grid)
+
+    for name, val in new.__dict__.items():
+        if name in ('_cell_tree', '_cell_tree_mask', '_tree', '_kdtree'):
+            new.__dict__[name] = None
+        elif name.endswith('_memo_dict') and val is not None:
+            new.__dict__[name] = type(val)()
+
+    new.clear_location_cache()
+
+    return new
+
+
+def _set_subset_attr(grid, name, value):
+    try:
+        setattr(grid, name, value)
+    except AttributeError:
+        # a read-only property -- computed from what has been cropped
+        pass
+
+
+def _subset_once(obj, done, func):
+    '''
+    func() the first time obj is seen, the same result after that.
+
+    done maps id(obj) to (obj, result) -- holding on to obj, so the id
+    can't be reused while done is in use.
+    '''
+    key = id(obj)
+
+    if key not in done:
+        done[key] = (obj, func())
+
+    return done[key][1]
+
+
+def _subset_depth(depth, bbox, done):
+    '''
+    crop the gridded variables of a depth object (e.g. bathymetry and zeta
+    of sigma coordinates) to match its variable.
+    '''
+    if depth is None or id(depth) in done:
+        return
+
+    done[id(depth)] = (depth, depth)
+
+    for name in ('bathymetry', 'zeta'):
+        var = getattr(depth, name, None)
+        if isinstance(var, Variable):
+            var.subset(bbox, _done=done)
+
+    grid = getattr(depth, 'grid', None)
+    if grid is not None and id(grid) in done:
+        depth.grid = done[id(grid)][1]
+
+
+class Grid_U(LocationCacheMixin, gridded.grids.Grid_U, GnomeId):
 
     _schema = GridSchema
 
+    # the data locations subset() keeps track of, by the names variables
+    # use for them
+    _subset_location_names = {'center': 'face'}
+
     def __init__(self, **kwargs):
         super(Grid_U, self).__init__(**kwargs)
 
@@ -183,8 +364,115 @@ class Grid_U(gridded.grids.Grid_U, GnomeId):
         json_['num_cells'] = self.faces.shape[0]
         return json_
 
+    def subset(self, bbox):
+        '''
+        A copy of the grid with only the faces that have a node in bbox
+        ((min_lon, min_lat), (max_lon, max_lat)), and the nodes they use.
+
+        Nodes, faces and edges are renumbered. Connections to faces that
+        were dropped become -1, so the edge of the subset is a boundary.
+        '''
+        nodes = np.asarray(self.nodes[:])
+        faces = self.faces[:]
+
+        result = ugrid_subset(nodes, faces, bbox)
+        if result is None:
+            raise ValueError('grid {0} does not overlap {1}'
+                             .format(self.name, bbox))
+
+        node_idx, face_idx, new_faces = result
+        node_renumber = renumbering(node_idx, len(nodes))
+
+        new = _subset_copy(self)
+        locations = {'node': (len(nodes), node_idx),
+                     'face': (len(faces), face_idx)}
+
+        _set_subset_attr(new, 'nodes', nodes[node_idx])
+        _set_subset_attr(new, 'faces', new_faces)
+
+        if self.face_face_connectivity is not None:
+            _set_subset_attr(new, 'face_face_connectivity',
+                             renumber_connectivity(self.face_face_connectivity,
+                                                   face_idx,
+                                                   renumbering(face_idx,
+                                                               len(faces))))
+
+        if self.face_coordinates is not None:
+            _set_subset_attr(new, 'face_coordinates',
+                             self.face_coordinates[face_idx])
+
+        if self.edges is not None:
+            edges = np.asarray(self.edges)
+            edge_idx = np.nonzero((node_renumber[edges] >= 0)
+                                  .all(axis=1))[0]
+            locations['edge'] = (len(edges), edge_idx)
+
+            _set_subset_attr(new, 'edges',
+                             renumber_connectivity(edges, edge_idx,
+                                                   node_renumber))
+            if self.edge_coordinates is not None:
+                _set_subset_attr(new, 'edge_coordinates',
+                                 self.edge_coordinates[edge_idx])
+
+        if self.boundaries is not None:
+            boundaries = np.asarray(self.boundaries)
+            kept = (node_renumber[boundaries] >= 0).all(axis=1)
+
+            _set_subset_attr(new, 'boundaries',
+                             renumber_connectivity(boundaries, kept,
+                                                   node_renumber))
+            if getattr(self, 'boundary_types', None) is not None:
+                _set_subset_attr(new, 'boundary_types',
+                                 np.asarray(self.boundary_types)[kept])
+
+        # these are rebuilt when needed
+        for name in ('face_edge_connectivity',
+                     'edge_face_connectivity',
+                     'boundary_coordinates'):
+            _set_subset_attr(new, name, None)
+
+        new._subset_locations = locations
+
+        return new
+
+    def subset_data_index(self, shape, location=None):
+        '''
+        the selector for the last dimension of data of the given (full)
+        shape, on the grid this one was cropped from.
+
+        :param location=None: where the data are: 'node', 'face' (or
+                              'center') or 'edge'. If None, it is found
+                              from the shape -- which is ambiguous if
+                              there are as many nodes as faces, say.
+        '''
+        locations = getattr(self, '_subset_locations', {})
+        location = self._subset_location_names.get(location, location)
+
+        if location in locations:
+            size, idx = locations[location]
+            if shape[-1] != size:
+                raise ValueError('data of shape {0} is not on the {1}s of '
+                                 'the grid this was cropped from'
+                                 .format(shape, location))
+
+            return (idx,)
+
+        found = [idx for size, idx in locations.values()
+                 if shape[-1] == size]
+
+        if len(found) > 1:
+            raise ValueError('data of shape {0} could be on more than one '
+                             'location of the grid this was cropped from'
+                             .format(shape))
+        elif not found:
+            raise ValueError('data of shape {0} is not on the nodes, faces '
+                             'or edges of the grid this was cropped from'
+                             .format(shape))
 
-class Grid_S(GnomeId, gridded.grids.Grid_S):
+        return (found[0],)
+
+
+class Grid_S(LocationCacheMixin, GnomeId, gridded.grids.Grid_S):
 
     _schema = GridSchema
 
@@ -199,6 +487,13 @@ class Grid_S(GnomeId, gridded.grids.Grid_S):
                 lon -= 360
         '''
 
+    # the arrays cropped by subset()
+    _subset_vars = ('node_lon', 'node_lat', 'node_mask',
+                    'center_lon', 'center_lat', 'center_mask',
+                    'edge1_lon', 'edge1_lat', 'edge1_mask',
+                    'edge2_lon', 'edge2_lat', 'edge2_mask',
+                    'angles')
+
     '''hack to avoid problems when registering object in webgnome'''
     @property
     def non_grid_variables(self):
@@ -309,8 +604,44 @@ class Grid_S(GnomeId, gridded.grids.Grid_S):
         lens = np.concatenate((hor_lens, ver_lens))
         return (lens, [hor_lines, ver_lines])
 
+    def subset(self, bbox):
+        '''
+        A copy of the grid, cropped to the window of nodes that covers bbox
+        ((min_lon, min_lat), (max_lon, max_lat)), plus one node all around.
+
+        The masks, and the center and edge arrays, are cropped to the same
+        window, keeping their padding relative to the nodes.
+        '''
+        window = structured_window(self.node_lon[:], self.node_lat[:], bbox)
+        if window is None:
+            raise ValueError('grid {0} does not overlap {1}'
+                             .format(self.name, bbox))
+
+        new = _subset_copy(self)
+        new._subset_window = (window, self.node_lon.shape)
+
+        for name in self._subset_vars:
+            arr = getattr(self, name, None)
+
+            if arr is not None and len(arr.shape) >= 2:
+                index = (Ellipsis,) + new.subset_data_index(arr.shape)
+                _set_subset_attr(new, name, arr[index])
+
+        return new
+
+    def subset_data_index(self, shape, location=None):
+        '''
+        the selectors for the last two dimensions of data of the given
+        (full) shape, on the grid this one was cropped from.
+
+        The location is found from the shape.
+        '''
+        window, node_shape = self._subset_window
 
-class Grid_R(gridded.grids.Grid_R, GnomeId):
+        return structured_index(window, node_shape, shape)
+
+
+class Grid_R(LocationCacheMixin, gridded.grids.Grid_R, GnomeId):
 
     _schema = GridSchema
 
@@ -352,6 +683,45 @@ class Grid_R(gridded.grids.Grid_R, GnomeId):
 
         return (lens, [lon_lines, lat_lines])
 
+    def subset(self, bbox):
+        '''
+        A copy of the grid, cropped to the longitudes and latitudes that
+        cover bbox ((min_lon, min_lat), (max_lon, max_lat)), plus one
+        more on each side.
+        '''
+        window = regular_window(self.node_lon[:], self.node_lat[:], bbox)
+        if window is None:
+            raise ValueError('grid {0} does not overlap {1}'
+                             .format(self.name, bbox))
+
+        (lon0, lon1), (lat0, lat1) = window
+
+        new = _subset_copy(self)
+        new._subset_window = (slice(lon0, lon1), slice(lat0, lat1),
+                              len(self.node_lon), len(self.node_lat))
+
+        _set_subset_attr(new, 'node_lon', self.node_lon[lon0:lon1])
+        _set_subset_attr(new, 'node_lat', self.node_lat[lat0:lat1])
+
+        return new
+
+    def subset_data_index(self, shape, location=None):
+        '''
+        the selectors for the last two dimensions of data of the given
+        (full) shape, on the grid this one was cropped from.
+
+        The location is found from the shape.
+        '''
+        lons, lats, num_lon, num_lat = self._subset_window
+
+        if tuple(shape[-2:]) == (num_lat, num_lon):
+            return (lats, lons)
+        elif tuple(shape[-2:]) == (num_lon, num_lat):
+            return (lons, lats)
+
+        raise ValueError('data of shape {0} is not on the grid this was '
+                         'cropped from'.format(shape))
+
 
 class PyGrid(gridded.grids.Grid):
 
@@ -361,6 +731,12 @@ class PyGrid(gridded.grids.Grid):
                                     ('sgrid', Grid_S),
                                     ('rgrid', Grid_R))
 
+        if kwargs.get('dataset', None) is None and len(args) < 2:
+            filename = args[0] if args else kwargs.get('filename', None)
+
+            if filename is not None:
+                kwargs['dataset'] = dataset_pool.get_dataset(filename)
+
         return gridded.grids.Grid.from_netCDF(*args, **kwargs)
 
     @staticmethod
@@ -394,6 +770,49 @@ class Depth(gridded.depth.Depth):
         return gridded.depth.Depth._get_depth_type(*args, **kwargs)
 
 
+def _pooled_from_netCDF(from_netCDF, args, kwargs):
+    '''
+    Call from_netCDF with the pooled dataset for the file, if no dataset
+    was passed in, and count the new object as a user of it.
+
+    A list of files, or a glob pattern, is read as one MultiFileDataset.
+    '''
+    filename = args[0] if args else kwargs.get('filename', None)
+    data_file = kwargs.get('data_file', None) or filename
+    grid_file = kwargs.get('grid_file', None) or filename
+
+    if kwargs.get('dataset', None) is None and data_file is not None:
+        kwargs['dataset'] = dataset_pool.get_dataset(data_file)
+
+    multi_file = (data_file is not None and
+                  is_multi_file(data_file) and
+                  isinstance(kwargs['dataset'], MultiFileDataset))
+
+    if multi_file:
+        # gridded would open all the files itself (as an MFDataset) --
+        # give it only the dataset, and put the file names back after.
+        data_file = expand_filenames(data_file)
+        grid_file = expand_filenames(grid_file)
+
+        args = args[1:]
+        kwargs['filename'] = None
+        kwargs['data_file'] = None
+        kwargs['grid_file'] = None if grid_file == data_file else grid_file
+
+    obj = from_netCDF(*args, **kwargs)
+
+    if multi_file:
+        for o in [obj] + list(getattr(obj, 'variables', [])):
+            if hasattr(o, 'data_file'):
+                o.data_file = data_file
+                o.grid_file = grid_file
+
+    for ncfile in (data_file, grid_file):
+        dataset_pool.attach(obj, ncfile)
+
+    return obj
+
+
 class Variable(gridded.Variable, GnomeId):
     _schema = VariableSchema
 
@@ -408,10 +827,64 @@ class Variable(gridded.Variable, GnomeId):
 
     _gnome_unit = None #Default assumption for unit type
 
-    def __init__(self, extrapolation_is_allowed=False, *args, **kwargs):
+    # memory budget (bytes) for the time slices of file-backed data kept
+    # in memory -- None shares the one of the whole process
+    # (slice_cache.shared_cache), 0 turns it off. And whether to read the
+    # next slice ahead, in a thread: only safe if nothing else reads the
+    # file while the model runs.
+    slice_cache_size = None
+    prefetch_slices = False
+
+    def __init__(self, extrapolation_is_allowed=False,
+                 slice_cache_size=None, prefetch_slices=None,
+                 *args, **kwargs):
         super(Variable, self).__init__(*args, **kwargs)
         self.extrapolation_is_allowed = extrapolation_is_allowed
 
+        if slice_cache_size is not None:
+            self.slice_cache_size = slice_cache_size
+        if prefetch_slices is not None:
+            self.prefetch_slices = prefetch_slices
+
+        self._slice_cache = None
+        self._setup_slice_cache()
+
+    def _setup_slice_cache(self):
+        '''
+        Wrap file-backed data with a time dimension in a TimeSliceCache,
+        so each time slice is read from the file once, rather than every
+        time it is interpolated.
+        '''
+        data = getattr(self, 'data', None)
+
+        if isinstance(data, TimeSliceCache):
+            data = data._data
+
+        if (self.slice_cache_size == 0 or
+                data is None or
+                isinstance(data, np.ndarray) or
+                self.time is None or
+                len(self.time.data) < 2 or
+                data.shape[0] != len(self.time.data)):
+            # in memory already, or not time-varying
+            self._slice_cache = None
+            return
+
+        self._slice_cache = TimeSliceCache(data, self.slice_cache_size,
+                                           prefetch=self.prefetch_slices)
+        self.data = self._slice_cache
+
+    @property
+    def slice_cache_stats(self):
+        '''
+        hit and miss counts and bytes read by the time slice cache --
+        None if the data is not cached.
+        '''
+        if self._slice_cache is None:
+            return None
+
+        return self._slice_cache.stats
+
     def at(self, points, time, units=None, *args, **kwargs):
         if ('extrapolate' not in kwargs):
             kwargs['extrapolate'] = False
@@ -420,6 +893,10 @@ class Variable(gridded.Variable, GnomeId):
 
         value = super(Variable, self).at(points, time, *args, **kwargs)
 
+        if self._slice_cache is not None:
+            self._slice_cache.read_ahead(np.searchsorted(self.time.data,
+                                                         time))
+
         data_units = self.units if self.units else self._gnome_unit
         req_units = units if units else data_units
         if data_units is not None and data_units != req_units:
@@ -441,6 +918,68 @@ class Variable(gridded.Variable, GnomeId):
 
         return super(Variable, cls).new_from_dict(dict_)
 
+    @classmethod
+    def from_netCDF(cls, *args, **kwargs):
+        '''
+        As gridded.Variable.from_netCDF, with one more (optional) argument.
+        The dataset is shared with the other objects from the same file
+        (see dataset_pool).
+
+        :param bbox: ((min_lon, min_lat), (max_lon, max_lat)) -- if given,
+                     the variable is cropped to the part of the grid that
+                     covers it. See subset()
+        '''
+        bbox = kwargs.pop('bbox', None)
+
+        var = _pooled_from_netCDF(super(Variable, cls).from_netCDF,
+                                  args, kwargs)
+
+        if bbox is not None:
+            var.subset(bbox)
+
+        return var
+
+    def subset(self, bbox, _done=None):
+        '''
+        Crop the variable to the part of its grid that covers bbox
+        ((min_lon, min_lat), (max_lon, max_lat)). Only that window of the
+        data is read from then on.
+
+        Variables that shared a grid share the cropped one if they are
+        cropped with the same _done dict.
+
+        Note: the subset is not saved -- a saved variable is loaded in full.
+        '''
+        done = {} if _done is None else _done
+        if id(self) in done:
+            return self
+
+        done[id(self)] = (self, self)
+
+        grid = _subset_once(self.grid, done,
+                            lambda: self.grid.subset(bbox))
+
+        data = self.data
+        if isinstance(data, TimeSliceCache):
+            data = data._data
+
+        window = WindowedData(data,
+                              grid.subset_data_index(data.shape,
+                                                     getattr(self, 'location',
+                                                             None)))
+
+        self.data = window[:] if isinstance(data, np.ndarray) else window
+        self.grid = grid
+
+        _subset_depth(getattr(self, 'depth', None), bbox, done)
+
+        if getattr(self, '_result_memo', None) is not None:
+            self._result_memo = OrderedDict()
+
+        self._setup_slice_cache()
+
+        return self
+
     @property
     def extrapolation_is_allowed(self):
         if self.time is not None:
@@ -512,6 +1051,17 @@ class S_Depth(gridded.depth.S_Depth, GnomeId):
         rv = cls.from_netCDF(**dict_)
         return rv
 
+def _quantize(vectors):
+    '''
+    vectors as int16, and the scale to get them back:
+    vectors ~= int16 values * scale
+    '''
+    top = float(np.abs(vectors).max()) if vectors.size else 0.0
+    scale = top / np.iinfo(np.int16).max if top > 0 else 1.0
+
+    return np.round(vectors / scale).astype(np.int16), scale
+
+
 class VectorVariable(gridded.VectorVariable, GnomeId):
 
     _schema = VectorVariableSchema
@@ -545,14 +1095,68 @@ class VectorVariable(gridded.VectorVariable, GnomeId):
 
         return value
 
-    def get_data_vectors(self):
+    # number of data vector exports kept
+    _data_vectors_memo_size = 8
+
+    def get_data_vectors(self, time_index=None, quantize=False):
+        '''
+        return array of shape (2, time_slices, len_linearized_data)
+        first is u, second is v
+
+        :param time_index=None: index, or slice, of the time slices to
+                                return -- only those are read. All of them
+                                if None.
+        :param quantize=False: if True, return (int16 array, scale) in
+                               place of the float32 array, where
+                               value = int16 value * scale.
+
+        The results are kept (for the last few calls), until the data or
+        the grid change.
+        '''
+        if time_index is None:
+            time_index = slice(None)
+        elif isinstance(time_index, (int, long, np.integer)):
+            # keep the time dimension
+            time_index = slice(time_index, time_index + 1 or None)
+
+        key = (time_index.start, time_index.stop, time_index.step,
+               self._data_vectors_version)
+
+        memo = self.__dict__.setdefault('_data_vectors_memo', OrderedDict())
+
+        vectors = memo.pop(key, None)
+        if vectors is None:
+            vectors = self._data_vectors(time_index)
+            vectors.flags.writeable = False
+
+        memo[key] = vectors
+        while len(memo) > self._data_vectors_memo_size:
+            memo.popitem(last=False)
+
+        if quantize:
+            return _quantize(vectors)
+
+        return vectors
+
+    @property
+    def _data_vectors_version(self):
         '''
-        return array of shape (time_slices, len_linearized_data,2)
-        first is magnitude, second is direction
+        the data and grid the vectors come from -- they are new objects if
+        they change (e.g. with subset())
         '''
+        angle = getattr(self, 'angle', None)
 
-        raw_u = self.variables[0].data[:]
-        raw_v = self.variables[1].data[:]
+        return (id(self.grid),
+                tuple(id(getattr(v, 'data', None)) for v in self.variables),
+                id(getattr(angle, 'data', None)))
+
+    def _data_vectors(self, time_index):
+        '''
+        the u and v for the time slices in time_index, on the cell centers,
+        linearized
+        '''
+        raw_u = self.variables[0].data[time_index]
+        raw_v = self.variables[1].data[time_index]
 
         if self.depth is not None:
             raw_u = raw_u[:, self.depth.surface_index]
@@ -562,43 +1166,117 @@ class VectorVariable(gridded.VectorVariable, GnomeId):
             # must be roms-style staggered
             u_padding_slice = (np.s_[:],) + self.grid.get_padding_slices(self.grid.edge1_padding)
             v_padding_slice = (np.s_[:],) + self.grid.get_padding_slices(self.grid.edge2_padding)
-            raw_u = raw_u[u_padding_slice].filled(0)
-            raw_v = raw_v[v_padding_slice].filled(0)
+            raw_u = np.ma.filled(raw_u[u_padding_slice], 0)
+            raw_v = np.ma.filled(raw_v[v_padding_slice], 0)
             raw_u = (raw_u[:, :, 0:-1, ] + raw_u[:, :, 1:]) / 2
             raw_v = (raw_v[:, 0:-1, :] + raw_v[:, 1:, :]) / 2
         #u/v should be interpolated to centers at this point. Now apply appropriate mask
 
         if isinstance(self.grid, Grid_S) and self.grid.center_mask is not None:
-            ctr_padding_slice = self.grid.get_padding_slices(self.grid.center_padding)
-            if self.grid._cell_tree_mask is None:
-                self.grid.build_celltree()
-
-            x = raw_u[:]
-            xt = x.shape[0]
-            y = raw_v[:]
-            yt = y.shape[0]
-            x = x.reshape(xt, -1)
-            y = y.reshape(yt, -1)
-            ctr_mask = gridded.utilities.gen_celltree_mask_from_center_mask(self.grid.center_mask, ctr_padding_slice)
-            x = np.ma.MaskedArray(x, mask = np.tile(ctr_mask.reshape(-1), xt))
-            y = np.ma.MaskedArray(y, mask = np.tile(ctr_mask.reshape(-1), yt))
-            x = x.compressed().reshape(xt, -1)
-            y = y.compressed().reshape(yt,-1)
+            xt = raw_u.shape[0]
+            yt = raw_v.shape[0]
+            x = raw_u.reshape(xt, -1)
+            y = raw_v.reshape(yt, -1)
+
+            # the same cells in every time slice
+            keep = ~self._center_mask().reshape(-1)
+            x = np.ma.filled(x, 0)[:, keep]
+            y = np.ma.filled(y, 0)[:, keep]
         else:
-            raw_u = raw_u.filled(0).reshape(raw_u.shape[0], -1)
-            raw_v = raw_v.filled(0).reshape(raw_v.shape[0], -1)
-            r = np.stack((raw_u, raw_v))
-            return np.ascontiguousarray(r, np.float32)
+            x = np.ma.filled(raw_u, 0).reshape(raw_u.shape[0], -1)
+            y = np.ma.filled(raw_v, 0).reshape(raw_v.shape[0], -1)
 
-        #r = np.ma.stack((x, y)) change to this when numpy 1.15 becomes norm.
-        r = np.ma.concatenate((x[None,:], y[None,:]))
-        return np.ascontiguousarray(r.astype(np.float32)) # r.compressed().astype(np.float32)
+        return np.ascontiguousarray(np.stack((x, y)), np.float32)
+
+    def _center_mask(self):
+        '''
+        the celltree mask of the grid cell centers
+        '''
+        if self.grid._cell_tree_mask is None:
+            self.grid.build_celltree()
+
+        ctr_padding_slice = self.grid.get_padding_slices(self.grid.center_padding)
+
+        return gridded.utilities.gen_celltree_mask_from_center_mask(self.grid.center_mask,
+                                                                    ctr_padding_slice)
 
     def get_metadata(self):
         json_ = {}
         json_['data_location'] = self.grid.infer_location(self.variables[0].data)
         return json_
 
+    @classmethod
+    def from_netCDF(cls, *args, **kwargs):
+        '''
+        As gridded.VectorVariable.from_netCDF, with one more (optional)
+        argument. The dataset is shared with the other objects from the
+        same file (see dataset_pool).
+
+        :param bbox: ((min_lon, min_lat), (max_lon, max_lat)) -- if given,
+                     the variable is cropped to the part of the grid that
+                     covers it. See subset()
+        '''
+        bbox = kwargs.pop('bbox', None)
+
+        var = _pooled_from_netCDF(super(VectorVariable, cls).from_netCDF,
+                                  args, kwargs)
+
+        if bbox is not None:
+            var.subset(bbox)
+
+        return var
+
+    def subset(self, bbox, _done=None):
+        '''
+        Crop the component variables (and the angle, if there is one) to
+        the part of the grid that covers bbox
+        ((min_lon, min_lat), (max_lon, max_lat)). They all share the
+        cropped grid.
+
+        Note: the subset is not saved -- a saved variable is loaded in full.
+        '''
+        done = {} if _done is None else _done
+        if id(self) in done:
+            return self
+
+        done[id(self)] = (self, self)
+
+        for var in self.variables:
+            # constant components (e.g. vertical velocity) have no grid
+            if isinstance(var, Variable):
+                var.subset(bbox, _done=done)
+
+        angle = getattr(self, 'angle', None)
+        if isinstance(angle, Variable):
+            angle.subset(bbox, _done=done)
+
+        self.grid = _subset_once(self.grid, done,
+                                 lambda: self.grid.subset(bbox))
+
+        _subset_depth(getattr(self, 'depth', None), bbox, done)
+
+        if getattr(self, '_result_memo', None) is not None:
+            self._result_memo = OrderedDict()
+
+        self._data_vectors_memo = OrderedDict()
+
+        return self
+
+    @property
+    def slice_cache_stats(self):
+        '''
+        the time slice cache counters, summed over the component variables
+        -- None if none of them are cached.
+        '''
+        stats = [getattr(v, 'slice_cache_stats', None)
+                 for v in self.variables]
+        stats = [s for s in stats if s is not None]
+
+        if not stats:
+            return None
+
+        return dict((k, sum(s[k] for s in stats)) for k in stats[0])
+
     @property
     def extrapolation_is_allowed(self):
         if self.time is not None:
@@ -649,20 +1327,20 @@ class VectorVariable(gridded.VectorVariable, GnomeId):
                 if _mod('dataset'):
                     if 'grid_file' in kws and 'data_file' in kws:
                         if kws['grid_file'] == kws['data_file']:
-                            ds = dg = gridded.utilities.get_dataset(kws['grid_file'])
+                            ds = dg = dataset_pool.get_dataset(kws['grid_file'])
                         else:
-                            ds = gridded.utilities.get_dataset(kws['data_file'])
-                            dg = gridded.utilities.get_dataset(kws['grid_file'])
+                            ds = dataset_pool.get_dataset(kws['data_file'])
+                            dg = dataset_pool.get_dataset(kws['grid_file'])
                     kws['dataset'] = ds
                 else:
                     if 'grid_file' in kws and kws['grid_file'] is not None:
-                        dg = gridded.utilities.get_dataset(kws['grid_file'])
+                        dg = dataset_pool.get_dataset(kws['grid_file'])
                     else:
                         dg = kws['dataset']
                     ds = kws['dataset']
                 if _mod('grid'):
                     gt = kws.get('grid_topology', None)
-                    kws['grid'] = PyGrid.from_netCDF(kws['filename'], dataset=dg, grid_topology=gt)
+                    kws['grid'] = dataset_pool.get_grid(kws['filename'], dataset=dg, grid_topology=gt)
                 if kws.get('varnames', None) is None:
                     varnames = cls._gen_varnames(kws['data_file'],
                                                  dataset=ds)
@@ -0,0 +1,377 @@
+"""
+Lazy aggregation of a time series of netCDF files
+
+Operational forcing often comes as one file per forecast hour or day.
+MultiFileDataset presents a set of such files as one dataset, that can be
+passed to the gridded objects in place of a netCDF4 Dataset: the variables
+with the time dimension are joined along it, the others are read from the
+first file.
+
+Only the time variables are read up front. The data are read from the file
+that holds the requested time, and only a few files are kept open at a
+time -- the least recently used are closed as the model moves on.
+"""
+
+import glob
+import threading
+from numbers import Integral
+from collections import OrderedDict
+
+import numpy as np
+import netCDF4 as nc4
+
+import six
+
+# names used for the time dimension when it isn't the unlimited one
+time_dim_names = ('time', 'ocean_time', 'Time', 'MT', 't')
+
+
+def expand_filenames(filename):
+    """
+    The list of files for a glob pattern, or list of names (or patterns).
+    Anything else is returned as it is.
+    """
+    if isinstance(filename, six.string_types):
+        if not glob.has_magic(filename):
+            return filename
+
+        filenames = sorted(glob.glob(filename))
+        if not filenames:
+            raise ValueError('No files match {0}'.format(filename))
+
+        return filenames
+
+    if (isinstance(filename, (list, tuple)) and
+            all(isinstance(f, six.string_types) for f in filename)):
+        filenames = []
+        for f in filename:
+            f = expand_filenames(f)
+            filenames.extend(f if isinstance(f, list) else [f])
+
+        return filenames
+
+    return filename
+
+
+def is_multi_file(filename):
+    """
+    True if filename is a list of more than one file, or a glob pattern
+    """
+    filename = expand_filenames(filename)
+
+    return isinstance(filename, list) and len(filename) > 1
+
+
+def _attributes(obj):
+    return OrderedDict((name, obj.getncattr(name)) for name in obj.ncattrs())
+
+
+def _find_time_dim(ds):
+    for name, dim in ds.dimensions.items():
+        if dim.isunlimited():
+            return name
+
+    for name in time_dim_names:
+        if name in ds.dimensions:
+            return name
+
+    raise ValueError('No time dimension found in {0}'.format(ds.filepath()))
+
+
+def _find_time_var(ds, dim):
+    if dim in ds.variables and ds.variables[dim].dimensions == (dim,):
+        return dim
+
+    for name, var in ds.variables.items():
+        if (var.dimensions == (dim,) and
+                'since' in getattr(var, 'units', '')):
+            return name
+
+    raise ValueError('No time variable found for dimension {0} in {1}'
+                     .format(dim, ds.filepath()))
+
+
+class MultiFileDimension(object):
+    """
+    Stands in for a netCDF4 Dimension
+    """
+    def __init__(self, name, size, unlimited=False):
+        self.name = name
+        self.size = size
+        self._unlimited = unlimited
+
+    def __len__(self):
+        return self.size
+
+    def isunlimited(self):
+        return self._unlimited
+
+
+class MultiFileVariable(object):
+    """
+    Stands in for a netCDF4 Variable -- a variable of a MultiFileDataset
+    """
+    def __init__(self, dataset, name, var):
+        """
+        :param dataset: the MultiFileDataset
+        :param name: name of the variable
+        :param var: the variable in the first file
+        """
+        self._dataset = dataset
+        self.name = name
+        self.dimensions = var.dimensions
+        self.dtype = var.dtype
+        self._attrs = _attributes(var)
+
+        self.aggregated = (len(var.dimensions) > 0 and
+                           var.dimensions[0] == dataset.time_dim)
+
+        if self.aggregated:
+            self.shape = (dataset.num_times,) + tuple(var.shape[1:])
+        else:
+            self.shape = tuple(var.shape)
+
+    def __getattr__(self, name):
+        # only called for attributes not found on this object
+        if name.startswith('__') or name == '_attrs':
+            raise AttributeError(name)
+
+        try:
+            return self._attrs[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def ncattrs(self):
+        return list(self._attrs.keys())
+
+    def getncattr(self, name):
+        return self._attrs[name]
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None):
+        return np.asarray(self[:], dtype=dtype)
+
+    def __getitem__(self, key):
+        ds = self._dataset
+
+        if not self.aggregated:
+            return ds._read(0, self.name, key)
+
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if len(key) == 0 or key[0] is Ellipsis:
+            first, rest = slice(None), key
+        else:
+            first, rest = key[0], key[1:]
+
+        if self.name == ds.time_var:
+            # already read, and on the same units
+            return ds.times[first][rest]
+
+        if isinstance(first, Integral) and not isinstance(first, bool):
+            index = int(first)
+            if index < 0:
+                index += ds.num_times
+
+            if not 0 <= index < ds.num_times:
+                raise IndexError('time index {0} out of range'
+                                 .format(first))
+
+            return ds._read(ds.file_index[index], self.name,
+                            (ds.local_index[index],) + rest)
+
+        indexes = np.arange(ds.num_times)[first]
+
+        if len(indexes) == 0:
+            return ds._read(0, self.name, (slice(0, 0),) + rest)
+
+        # one read per run of indexes in the same file
+        files = ds.file_index[indexes]
+        breaks = np.nonzero(np.diff(files))[0] + 1
+
+        pieces = []
+        for run in np.split(indexes, breaks):
+            local = ds.local_index[run]
+
+            if np.all(np.diff(local) == 1):
+                local = slice(local[0], local[-1] + 1)
+
+            pieces.append(ds._read(ds.file_index[run[0]], self.name,
+                                   (local,) + rest))
+
+        if any(np.ma.isMaskedArray(p) for p in pieces):
+            return np.ma.concatenate(pieces, axis=0)
+
+        return np.concatenate(pieces, axis=0)
+
+
+class MultiFileDataset(object):
+    """
+    A set of netCDF files, with the same variables, holding consecutive
+    times, presented as one (read only) dataset.
+
+    Where files overlap in time (e.g. daily forecasts that are several
+    days long), the times from the later file are used.
+    """
+    # maximum number of files kept open
+    max_open = 3
+
+    def __init__(self, filenames, max_open=None):
+        """
+        :param filenames: list of file names, or a glob pattern
+
+        :param max_open=None: maximum number of files kept open -- the
+                              class attribute is used if None.
+        """
+        filenames = expand_filenames(filenames)
+        if isinstance(filenames, six.string_types):
+            filenames = [filenames]
+
+        if max_open is not None:
+            self.max_open = max_open
+
+        self._open = OrderedDict()
+        self._lock = threading.RLock()
+
+        self._scan(filenames)
+
+    def _scan(self, filenames):
+        '''
+        read the time variable from each file, and the metadata from the
+        first one (in time).
+        '''
+        file_dates = []
+        file_units = []
+
+        for fn in filenames:
+            with nc4.Dataset(fn) as ds:
+                if not file_dates:
+                    self.time_dim = _find_time_dim(ds)
+                    self.time_var = _find_time_var(ds, self.time_dim)
+
+                tvar = ds.variables[self.time_var]
+                calendar = getattr(tvar, 'calendar', 'standard')
+
+                file_dates.append(np.atleast_1d(nc4.num2date(tvar[:],
+                                                             tvar.units,
+                                                             calendar)))
+                file_units.append((tvar.units, calendar))
+
+        order = sorted([i for i in range(len(filenames))
+                        if len(file_dates[i])],
+                       key=lambda i: file_dates[i][0])
+
+        self.filenames = [filenames[i] for i in order]
+
+        # all on the units of the first file
+        units, calendar = file_units[order[0]]
+        file_times = [np.atleast_1d(nc4.date2num(file_dates[i],
+                                                 units, calendar))
+                      for i in order]
+
+        file_index = []
+        local_index = []
+        times = []
+
+        for i, ftimes in enumerate(file_times):
+            # stop where the next file starts
+            if i + 1 < len(file_times) and len(file_times[i + 1]):
+                keep = np.nonzero(ftimes < file_times[i + 1][0])[0]
+            else:
+                keep = np.arange(len(ftimes))
+
+            file_index.append(np.full(len(keep), i, dtype=np.int64))
+            local_index.append(keep)
+            times.append(ftimes[keep])
+
+        self.file_index = np.concatenate(file_index)
+        self.local_index = np.concatenate(local_index)
+        self.times = np.concatenate(times)
+        self.num_times = len(self.times)
+
+        ds = self._get(0)
+
+        self._attrs = _attributes(ds)
+
+        self.dimensions = OrderedDict()
+        for name, dim in ds.dimensions.items():
+            if name == self.time_dim:
+                self.dimensions[name] = MultiFileDimension(name,
+                                                           self.num_times,
+                                                           True)
+            else:
+                self.dimensions[name] = MultiFileDimension(name, len(dim),
+                                                           dim.isunlimited())
+
+        self.variables = OrderedDict((name, MultiFileVariable(self, name, var))
+                                     for name, var in ds.variables.items())
+
+    def __getattr__(self, name):
+        # only called for attributes not found on this object
+        if name.startswith('__') or name == '_attrs':
+            raise AttributeError(name)
+
+        try:
+            return self._attrs[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, name):
+        return self.variables[name]
+
+    def ncattrs(self):
+        return list(self._attrs.keys())
+
+    def getncattr(self, name):
+        return self._attrs[name]
+
+    def filepath(self):
+        return self.filenames[0]
+
+    def isopen(self):
+        return True
+
+    @property
+    def open_files(self):
+        """
+        the names of the files open now
+        """
+        return [self.filenames[i] for i in self._open]
+
+    def _get(self, file_index):
+        with self._lock:
+            ds = self._open.pop(file_index, None)
+
+            if ds is None:
+                ds = nc4.Dataset(self.filenames[file_index])
+
+            # the most recently used go at the end
+            self._open[file_index] = ds
+
+            while len(self._open) > self.max_open:
+                _index, old = self._open.popitem(last=False)
+                old.close()
+
+            return ds
+
+    def _read(self, file_index, name, key):
+        with self._lock:
+            return self._get(file_index).variables[name][key]
+
+    def close(self):
+        with self._lock:
+            for ds in self._open.values():
+                ds.close()
+
+            self._open.clear()
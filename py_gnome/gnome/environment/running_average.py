@@ -26,6 +26,76 @@ from gnome.environment import Wind, WindSchema
 from gnome.exceptions import ReferencedObjectNotSet
 from gnome.gnomeobject import GnomeId
 
+# the averages are sampled hourly, and are given at least hourly
+_hour = 3600
+
+# longer timeseries are only averaged over this much time at once
+_max_span = 48 * 3600
+
+
+def _speeds(times, uv, sample_times):
+    '''
+    wind speed at sample_times: (u, v) interpolated linearly, and held at
+    the first (last) value before (after) the data
+    '''
+    u = np.interp(sample_times, times, uv[:, 0])
+    v = np.interp(sample_times, times, uv[:, 1])
+
+    return np.sqrt(u * u + v * v)
+
+
+def running_average(times, uv, past_hours, step, first_index, last_index):
+    '''
+    The running average of the wind speed at the times:
+    times[0] + i * step for i in first_index ... last_index
+
+    As in OSSMTimeValue_c::CalculateRunningAverage(), it is the integral
+    of the speed over the past hours, with the trapezoidal rule on hourly
+    samples, divided by past_hours. When the step divides an hour, all
+    the samples are on one grid, and the sums are differences of
+    cumulative sums, so the cost doesn't depend on past_hours.
+
+    :param times: times of the wind data, in seconds
+    :param uv: Nx2 array of the wind data, in m/s
+    :param past_hours: number of hours to average over
+    :param step: interval of the averaged series, in seconds
+
+    :returns: array of the averages
+    '''
+    out_times = times[0] + step * np.arange(first_index, last_index + 1)
+
+    if past_hours <= 0:
+        return _speeds(times, uv, out_times)
+
+    if _hour % step == 0:
+        k = _hour // step
+        lag = past_hours * k
+
+        # the samples for the first output time start lag steps before it
+        samples = _speeds(times, uv,
+                          times[0] + step * np.arange(first_index - lag,
+                                                      last_index + 1))
+
+        # sums of every k-th sample, with k zeros in front
+        padded = np.zeros((len(samples) + 2 * k - 1) // k * k)
+        padded[k:k + len(samples)] = samples
+        csum = np.cumsum(padded.reshape(-1, k), axis=0).reshape(-1)
+
+        # sum of the samples at i, i - k, ... i - lag
+        idx = np.arange(lag, len(samples))
+        total = csum[idx + k] - csum[idx - lag]
+
+        total -= 0.5 * (samples[idx] + samples[idx - lag])
+    else:
+        # the samples are off the grid -- one lookup per hour averaged
+        total = 0.5 * (_speeds(times, uv, out_times) +
+                       _speeds(times, uv, out_times - past_hours * _hour))
+
+        for j in range(1, past_hours):
+            total += _speeds(times, uv, out_times - j * _hour)
+
+    return total / past_hours
+
 
 class UVTuple(DefaultTupleSchema):
     'Tide object schema'
@@ -99,17 +169,18 @@ class RunningAverage(Environment):
         self._past_hours_to_average = past_hours_to_average
         self.wind = wind
 
+        # the averages computed last, kept to extend them
+        self._averages = None
+
         if (wind is None and timeseries is None):
             mvg_timeseries = np.array([(sec_to_date(zero_time()), [0.0, 0.0])],
                                       dtype=basic_types.datetime_value_2d)
             moving_ts = self._convert_to_time_value_pair(mvg_timeseries)
-        elif wind is not None:
-            moving_ts = (wind.ossm
-                         .create_running_average(self._past_hours_to_average))
         else:
-            self.wind = Wind(timeseries, units='mps', coord_sys='uv')
-            moving_ts = (self.wind.ossm
-                         .create_running_average(self._past_hours_to_average))
+            if wind is None:
+                self.wind = Wind(timeseries, units='mps', coord_sys='uv')
+
+            moving_ts = self._running_average(self._past_hours_to_average)
 
         self.ossm = CyTimeseries(timeseries=moving_ts)
 
@@ -221,18 +292,86 @@ class RunningAverage(Environment):
         Creates the timeseries of the RunningAverage object
 
         :param past_hours_to_average: amount of data to use in the averaging
+        :param model_time=0: time in seconds the series should start at --
+                             0 for the start of the wind data
         """
-        # first get the time series from the C++ function
-        # self.timeseries = wind.ossm.create_running_average(past_hours)
-        # do we need to dispose of old one here?
-        moving_timeseries = (self.wind.ossm
-                             .create_running_average(past_hours_to_average,
-                                                     model_time))
+        moving_timeseries = self._running_average(past_hours_to_average,
+                                                  model_time)
 
         # here should set the timeseries since the CyOSSMTime
         # should already exist
         self.ossm.timeseries = moving_timeseries
 
+    def _running_average(self, past_hours_to_average, model_time=0):
+        """
+        The running average of the wind speed, as a time_value_pair array.
+
+        Like the C++ OSSMTimeValue_c::CalculateRunningAverage(): the whole
+        wind timeseries is averaged if it is up to two days long, two days
+        from model_time otherwise. The series is on a fixed grid from the
+        start of the wind data, so when the model moves past its end, the
+        averages already computed for the new range are kept, and only the
+        new ones are computed.
+        """
+        data = self.wind.ossm.timeseries
+        past_hours = int(past_hours_to_average)
+
+        times = data['time'].astype(np.int64)
+        uv = np.column_stack((data['value']['u'], data['value']['v']))
+
+        first, last = times[0], times[-1]
+
+        step = _hour
+        if len(times) > 1:
+            step = int(min(_hour, np.diff(times).min()))
+
+        num_steps = int((last - first) // step)
+
+        if last - first <= _max_span:
+            first_index, last_index = 0, num_steps
+        else:
+            start = first if model_time == 0 else model_time
+
+            first_index = int(np.clip((start - first) // step, 0, num_steps))
+            last_index = int(np.clip((start + _max_span - first) // step,
+                                     first_index, num_steps))
+
+        averages = np.empty((last_index - first_index + 1,))
+        done = np.zeros(averages.shape, dtype=np.bool)
+
+        old = self._averages
+        if (old is not None and old[0] == past_hours and
+                np.array_equal(old[1], data)):
+            old_first, old_averages = old[2], old[3]
+
+            lo = max(first_index, old_first)
+            hi = min(last_index, old_first + len(old_averages) - 1)
+
+            if lo <= hi:
+                averages[lo - first_index:hi - first_index + 1] = \
+                    old_averages[lo - old_first:hi - old_first + 1]
+                done[lo - first_index:hi - first_index + 1] = True
+
+        if not done.all():
+            # what's missing is at the start or the end, or both
+            missing = np.nonzero(~done)[0]
+            runs = np.split(missing, np.nonzero(np.diff(missing) > 1)[0] + 1)
+
+            for run in runs:
+                averages[run] = running_average(times, uv, past_hours, step,
+                                                first_index + run[0],
+                                                first_index + run[-1])
+
+        self._averages = (past_hours, data.copy(), first_index, averages)
+
+        moving_ts = np.zeros((len(averages),),
+                             dtype=basic_types.time_value_pair)
+        moving_ts['time'] = first + step * np.arange(first_index,
+                                                     last_index + 1)
+        moving_ts['value']['u'] = averages
+
+        return moving_ts
+
     def get_value(self, time):
         '''
         Return the value at specified time and location. Timeseries are
@@ -0,0 +1,326 @@
+"""
+Caching of time slices of gridded data
+
+Reading a time slice of a large variable from a netCDF file is often the
+most expensive part of evaluating a gridded environment object. The
+classes here keep recently used slices in memory, within a byte budget
+shared by all of them, and can read the next slice ahead, in a background
+thread, once the model moves into a new data interval.
+"""
+
+import threading
+import itertools
+from numbers import Integral
+from collections import OrderedDict
+
+import numpy as np
+
+# netCDF4 (HDF5) can not be relied on to be thread safe -- every read
+# through a TimeSliceCache, including prefetching, is done with this lock.
+# Reads of the same file that don't go through a TimeSliceCache don't take
+# it, so prefetching is only safe if nothing else reads the file meanwhile.
+_read_lock = threading.RLock()
+
+# tells the TimeSliceCaches sharing a SliceCache apart
+_cache_ids = itertools.count()
+
+
+def _nbytes(arr):
+    """
+    memory used by an array, including the mask, if it's a masked array
+    """
+    mask = np.ma.getmask(arr)
+
+    return arr.nbytes + (mask.nbytes if mask is not np.ma.nomask else 0)
+
+
+class SliceCache(object):
+    """
+    A least-recently-used cache of arrays, limited in total size (bytes)
+    """
+    def __init__(self, max_bytes):
+        """
+        :param max_bytes: maximum total size of the arrays held.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+        self._arrays = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def __contains__(self, key):
+        return key in self._arrays
+
+    def keys(self):
+        with self._lock:
+            return list(self._arrays.keys())
+
+    def size_of(self, keys):
+        """
+        total size of the arrays stored under keys
+        """
+        with self._lock:
+            return sum(_nbytes(self._arrays[k]) for k in keys
+                       if k in self._arrays)
+
+    def get(self, key):
+        """
+        the array stored under key, or None if it's not in the cache
+        """
+        with self._lock:
+            arr = self._arrays.pop(key, None)
+            if arr is not None:
+                # move it to the most recently used end
+                self._arrays[key] = arr
+
+        return arr
+
+    def put(self, key, arr):
+        """
+        add an array to the cache, dropping the least recently used ones to
+        make room. Arrays bigger than the whole budget are not stored.
+
+        The array is made read-only: it is handed out to every later get().
+        """
+        size = _nbytes(arr)
+        if size > self.max_bytes:
+            return
+
+        arr.flags.writeable = False
+
+        mask = np.ma.getmask(arr)
+        if mask is not np.ma.nomask:
+            mask.flags.writeable = False
+
+        with self._lock:
+            old = self._arrays.pop(key, None)
+            if old is not None:
+                self.nbytes -= _nbytes(old)
+
+            while self._arrays and self.nbytes + size > self.max_bytes:
+                _key, dropped = self._arrays.popitem(last=False)
+                self.nbytes -= _nbytes(dropped)
+
+            self._arrays[key] = arr
+            self.nbytes += size
+
+    def discard(self, keys):
+        """
+        remove the arrays stored under keys
+        """
+        with self._lock:
+            for k in keys:
+                arr = self._arrays.pop(k, None)
+                if arr is not None:
+                    self.nbytes -= _nbytes(arr)
+
+    def clear(self):
+        with self._lock:
+            self._arrays.clear()
+            self.nbytes = 0
+
+
+# the memory budget (bytes) of all the TimeSliceCaches that don't have one
+# of their own
+shared_cache = SliceCache(256 * 1024 * 1024)
+
+
+class _Read(object):
+    """
+    a slice being read -- so a second thread that wants it waits for it
+    """
+    def __init__(self):
+        self.done = threading.Event()
+        self.arr = None
+
+
+class TimeSliceCache(object):
+    """
+    Wraps a netCDF variable (or anything indexed the same way) that has time
+    as its first dimension.
+
+    Indexing with an integer time index, e.g. ``data[t]`` or
+    ``data[t, depth_idx]``, reads the whole time slice once and keeps it in
+    a SliceCache; any other indexing is passed on to the variable.
+    Attributes are looked up on the wrapped variable, so this can stand in
+    for it.
+
+    The cached slices are read-only.
+    """
+    def __init__(self, data, max_bytes=None, prefetch=False):
+        """
+        :param data: the variable to wrap
+
+        :param max_bytes=None: memory budget for the cached slices -- if
+                               None, they go in the shared_cache.
+
+        :param prefetch=False: if True, read_ahead() loads the next slice
+                               in a background thread. Only reads through
+                               a TimeSliceCache are serialized, so don't
+                               turn this on if the file is read any other
+                               way while the model runs.
+        """
+        self._data = data
+        self.cache = (shared_cache if max_bytes is None
+                      else SliceCache(max_bytes))
+        self.prefetch = prefetch
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+
+        self._id = next(_cache_ids)
+        self._reads = {}
+
+        self._interval = None
+        self._prefetch_thread = None
+
+    def __getattr__(self, name):
+        # only called for attributes not found on this object
+        if name.startswith('__') or name == '_data':
+            raise AttributeError(name)
+
+        return getattr(self._data, name)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self[:], dtype=dtype)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if (len(key) == 0 or not isinstance(key[0], Integral) or
+                isinstance(key[0], bool)):
+            with _read_lock:
+                return self._data[key]
+
+        index = int(key[0])
+        if index < 0:
+            index += self._data.shape[0]
+
+        return self._get_slice(index)[key[1:]]
+
+    def _read_slice(self, index):
+        """
+        read a slice from the file into the cache. If another thread is
+        reading it already, wait for that instead.
+        """
+        with self.cache._lock:
+            read = self._reads.get(index)
+            reading = read is None
+
+            if reading:
+                read = self._reads[index] = _Read()
+
+        if not reading:
+            read.done.wait()
+
+            if read.arr is None:
+                # it failed in the other thread -- try again here
+                return self._read_slice(index)
+
+            return read.arr
+
+        try:
+            with _read_lock:
+                arr = self._data[index]
+
+            self.cache.put((self._id, index), arr)
+            read.arr = arr
+        finally:
+            with self.cache._lock:
+                del self._reads[index]
+
+                if read.arr is not None:
+                    self.bytes_read += _nbytes(read.arr)
+
+            read.done.set()
+
+        return arr
+
+    def _get_slice(self, index):
+        arr = self.cache.get((self._id, index))
+
+        if arr is None and not 0 <= index < self._data.shape[0]:
+            raise IndexError('time index {} out of range'.format(index))
+
+        with self.cache._lock:
+            if arr is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if arr is None:
+            arr = self._read_slice(index)
+
+        return arr
+
+    def read_ahead(self, index):
+        """
+        Tell the cache which data interval the model is in.
+
+        :param index: index of the later time of the interval:
+                      the model time is between index - 1 and index.
+
+        When the interval changes, the slice after the new interval (in the
+        direction the model is going) is loaded in the background, so it's
+        ready by the time it's needed.
+        """
+        last, self._interval = self._interval, index
+
+        if not self.prefetch or last is None or index == last:
+            return
+
+        next_index = index + 1 if index > last else index - 2
+
+        if (not 0 <= next_index < self._data.shape[0] or
+                (self._id, next_index) in self.cache or
+                next_index in self._reads):
+            return
+
+        if self._prefetch_thread is not None:
+            if self._prefetch_thread.is_alive():
+                # still busy with the last one
+                return
+
+        thread = threading.Thread(target=self._read_slice, args=(next_index,))
+        thread.daemon = True
+        thread.start()
+
+        self._prefetch_thread = thread
+
+    def wait(self):
+        """
+        wait for any prefetching in progress to finish
+        """
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+
+    def _keys(self):
+        # the keys of the slices of this one, in a (maybe shared) cache
+        return [k for k in self.cache.keys() if k[0] == self._id]
+
+    def clear(self):
+        self.wait()
+        self.cache.discard(self._keys())
+
+    @property
+    def stats(self):
+        """
+        cache hit and miss counts, and how much data has been read (bytes)
+        """
+        with self.cache._lock:
+            stats = {'hits': self.hits,
+                     'misses': self.misses,
+                     'bytes_read': self.bytes_read}
+
+        stats['bytes_cached'] = self.cache.size_of(self._keys())
+
+        return stats
@@ -5,11 +5,14 @@ the Wind object defines the Wind conditions for the spill
 import string
 import os
 import copy
+import datetime
+
+import numpy as np
 
 from colander import SchemaNode, String, Float, drop, Boolean
 
 import gnome
-from gnome.utilities.time_utils import sec_to_datetime
+from gnome.utilities.time_utils import sec_to_datetime, date_to_sec
 from gnome.utilities.inf_datetime import InfDateTime
 from gnome.persist.validators import convertible_to_seconds
 from gnome.persist.extend_colander import LocalDateTime
@@ -58,6 +61,13 @@ class Tide(Environment):
     _ref_as = 'tide'
     _schema = TideSchema
 
+    # interval of the precomputed Shio tide, in seconds -- it is the
+    # interval Shio computes its values at.
+    _precompute_interval = 600
+
+    # time precomputed at once, in seconds
+    _precompute_span = 48 * 3600
+
     def __init__(self,
                  filename,
                  yeardata=os.path.join(os.path.dirname(gnome.__file__),
@@ -92,6 +102,7 @@ class Tide(Environment):
         # though not used by OSSM files
         super(Tide, self).__init__(**kwargs)
         self._yeardata = None
+        self._precomputed = None
         self.filename=filename
         self.cy_obj = self._obj_to_create(filename)
         # self.yeardata = os.path.abspath( yeardata ) # set yeardata
@@ -135,13 +146,85 @@ class Tide(Environment):
 
         # set private variable and also shio object's yeardata path
         self._yeardata = value
+        self._precomputed = None
 
         if isinstance(self.cy_obj, CyShioTime):
             self.cy_obj.set_shio_yeardata_path(value)
 
-    scale_factor = property(lambda self:
-                            self.cy_obj.scale_factor, lambda self, val:
-                            setattr(self.cy_obj, 'scale_factor', val))
+    @property
+    def scale_factor(self):
+        return self.cy_obj.scale_factor
+
+    @scale_factor.setter
+    def scale_factor(self, val):
+        self.cy_obj.scale_factor = val
+        self._precomputed = None
+
+    def get_value(self, time):
+        """
+        The tide (the 'u' component of the C++ object's value) at time.
+
+        The Shio tide is computed from the harmonic constituents for
+        spans of time at once, and interpolated: see precompute().
+
+        :param time: datetime, time in seconds, or an array of times in
+                     seconds
+        :returns: the value, or an array of values for an array of times
+        """
+        if isinstance(time, datetime.datetime):
+            time = date_to_sec(time)
+
+        seconds = np.asarray(time, dtype=np.float64)
+
+        if not isinstance(self.cy_obj, CyShioTime):
+            value = self.cy_obj.get_time_value(seconds)[0]['u']
+
+            return value if seconds.ndim else value[0]
+
+        table = self._precomputed
+        if (table is None or
+                seconds.min() < table[0][0] or seconds.max() > table[0][-1]):
+            table = self.precompute(seconds.min(), seconds.max())
+
+        value = np.interp(seconds, table[0], table[1])
+
+        return value if seconds.ndim else float(value)
+
+    def precompute(self, start, stop=None):
+        """
+        Compute the Shio tide at a regular interval from start to stop, or
+        for _precompute_span from start, to be interpolated by get_value().
+
+        Shio works out its values for a few days at a time. All of them are
+        asked for in one call, rather than one at a time as the model
+        moves along.
+
+        :param start, stop: times in seconds
+        :returns: the times and the values
+        """
+        interval = self._precompute_interval
+
+        if stop is None or stop - start < self._precompute_span:
+            stop = start + self._precompute_span
+
+        # on the same grid as the Shio values
+        first = (start // interval) * interval
+        times = np.arange(first, stop + interval, interval)
+
+        values = self.cy_obj.get_time_value(times)[0]['u']
+
+        self._precomputed = (times, values)
+
+        return self._precomputed
+
+    def prepare_for_model_run(self, model_time):
+        """
+        Start the precomputed tide at the model start
+        """
+        self._precomputed = None
+
+        if isinstance(self.cy_obj, CyShioTime):
+            self.precompute(date_to_sec(model_time))
 
     def _obj_to_create(self, filename):
         """
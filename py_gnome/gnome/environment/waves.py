@@ -53,6 +53,9 @@ class Waves(Environment):
     _req_refs = ['wind', 'water']
     _schema = WavesSchema
 
+    # number of (time, positions) the values are kept for
+    _cache_size = 4
+
     def __init__(self, wind=None, water=None, **kwargs):
         """
         wind and water must be set before running the model; however, these
@@ -73,6 +76,8 @@ class Waves(Environment):
         self.wind = wind
         self.water = water
 
+        self._value_cache = []
+
         # turn off make_default_refs if references are defined and
         # make_default_refs is False
         if self.water is not None and self.wind is not None:
@@ -112,7 +117,18 @@ class Waves(Environment):
           peak_period: seconds
           whitecap_fraction: unit-less fraction
           dissipation_energy: not sure!! # fixme!
+
+        The arrays are kept for the next call with the same positions and
+        time -- don't change them.
         """
+        values = self._cached(points, time)
+
+        if 'waves' not in values:
+            values['waves'] = self._compute_waves(points, time)
+
+        return values['waves']
+
+    def _compute_waves(self, points, time):
         # make sure are we are up to date with water object
         wave_height = self.water.get('wave_height')
 
@@ -140,7 +156,16 @@ class Waves(Environment):
         '''
         Wrapper for the weatherers so they can extrapolate
         '''
-        retval = self.wind.at(points, model_time, coord_sys=coord_sys)
+        if coord_sys == 'r':
+            values = self._cached(points, model_time)
+
+            if 'wind' not in values:
+                values['wind'] = self.wind.at(points, model_time,
+                                              coord_sys=coord_sys)
+
+            retval = values['wind']
+        else:
+            retval = self.wind.at(points, model_time, coord_sys=coord_sys)
 
         if isinstance(retval, np.ma.MaskedArray):
             return retval.filled(fill_value)
@@ -175,6 +200,38 @@ class Waves(Environment):
                          U)
             return U
 
+    def _cached(self, points, time):
+        '''
+        The dict of values kept for the points at time.
+
+        In a time step, each weatherer asks for the wind speed and wave
+        values at the same positions, so they are computed once, and the
+        same arrays are given to all of them -- they should not be
+        changed. The values depend on the water too, so a change to it
+        is a new entry.
+        '''
+        if points is not None:
+            points = np.asarray(points)
+
+        water = self.water
+        key = (time, id(self.wind),
+               None if water is None else (water.wave_height, water.fetch,
+                                           water.salinity, water.temperature))
+
+        for i, (k, pts, values) in enumerate(self._value_cache):
+            if k == key and _same_points(pts, points):
+                # the most recently used go at the end
+                self._value_cache.append(self._value_cache.pop(i))
+                return values
+
+        values = {}
+        self._value_cache.append((key,
+                                  None if points is None else points.copy(),
+                                  values))
+        del self._value_cache[:-self._cache_size]
+
+        return values
+
     def compute_H(self, U):
         U = np.array(U).reshape(-1)
         return Adios2.wave_height(U, self.water.get('fetch'))
@@ -239,6 +296,8 @@ class Waves(Environment):
 
 
     def prepare_for_model_run(self, _model_time):
+        self._value_cache = []
+
         if self.wind is None:
             raise ReferencedObjectNotSet("wind object not defined for {}"
                                          .format(self.__class__.__name__))
@@ -246,3 +305,10 @@ class Waves(Environment):
         if self.water is None:
             raise ReferencedObjectNotSet("water object not defined for {}"
                                          .format(self.__class__.__name__))
+
+
+def _same_points(pts1, pts2):
+    if pts1 is None or pts2 is None:
+        return pts1 is pts2
+
+    return pts1.shape == pts2.shape and np.array_equal(pts1, pts2)
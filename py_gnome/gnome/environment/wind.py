@@ -278,7 +278,7 @@ class Wind(Timeseries, Environment):
 
             datetime_value_2d = self._xform_input_timeseries(wind_data)
             timeval = to_time_value_pair(wind_data, coord_sys)
-            self.ossm.timeseries = timeval
+            self._set_ossm_timeseries(timeval)
             if not hasattr(self, '_time') or self._time is None:
                 self._time = Time()
             self.time.data = self._timeseries['time'].astype(datetime.datetime)
@@ -491,11 +491,10 @@ class Wind(Timeseries, Environment):
         :param time: the time(s) you want the data for
         :type time: datetime object or sequence of datetime objects.
 
-        .. note:: It invokes get_wind_data(..) function
+        .. note:: The C++ object holds the data in m/s, so no unit
+                  conversion is needed: it uses get_values(..)
         '''
-        data = self.get_wind_data(time, 'm/s', 'r-theta')
-
-        return tuple(data[0]['value'])
+        return tuple(self.get_values(time, 'r-theta')[0])
 
     def at(self, points, time, coord_sys='r-theta', units=None,
            _auto_align=True):
@@ -520,7 +519,7 @@ class Wind(Timeseries, Environment):
         ret_data = np.zeros_like(pts, dtype='float64')
 
         if coord_sys in ('r-theta', 'uv'):
-            data = self.get_wind_data(time, 'm/s', coord_sys)[0]['value']
+            data = self.get_values(time, coord_sys)[0]
             ret_data[:, 0] = data[0]
             ret_data[:, 1] = data[1]
         elif coord_sys in ('u', 'v', 'r', 'theta'):
@@ -529,7 +528,7 @@ class Wind(Timeseries, Environment):
             else:
                 f = 'r-theta'
 
-            data = self.get_wind_data(time, 'm/s', f)[0]['value']
+            data = self.get_values(time, f)[0]
             if coord_sys in ('u', 'r'):
                 ret_data[:, 0] = data[0]
                 ret_data = ret_data[:, 0]
@@ -29,6 +29,7 @@ import numpy as np
 
 from colander import SchemaNode, String, Float, Integer, Boolean
 
+import geojson
 from geojson import FeatureCollection, Feature, MultiPolygon
 
 import unit_conversion as uc
@@ -50,6 +51,7 @@ from gnome.utilities.geometry import points_in_poly, point_in_poly
 from gnome.utilities.appearance import AppearanceSchema
 
 from gnome.cy_gnome.cy_land_check import check_land_layers, move_particles
+from gnome.maps.ugrid_land_check import face_neighbors, find_boundary_crossings
 from gnome.persist import base_schema
 
 
@@ -86,6 +88,7 @@ class MapFromUGridSchema(RasterMapSchema):
         String(), read_only=True, isdatafile=True, test_equal=False
     )
     refloat_halflife = SchemaNode(Float())
+    use_grid_boundary = SchemaNode(Boolean(), missing=False)
 
 
 class GnomeMap(GnomeId):
@@ -221,6 +224,9 @@ class GnomeMap(GnomeId):
 
     @land_polys.setter
     def land_polys(self, sa):
+        # simplified shorelines and geojson are built from the land polys
+        self._geojson_cache = {}
+
         if sa is None or (isinstance(sa, list) and len(sa) == 0):
             sa = PolygonSet()
         if isinstance(sa, PolygonSet):
@@ -290,9 +296,10 @@ class GnomeMap(GnomeId):
                   spills aren't allowed
         """
         if self.spillable_area is not None:
-            for poly in self.spillable_area:
-                if points_in_poly(poly.points, coord):
-                    return True
+            # the PolygonSet spatial index only checks the polygons
+            # that could contain the point
+            if self.spillable_area.points_in_any(coord)[0]:
+                return True
         else:
             if points_in_poly(self.map_bounds, coord):
                 return True
@@ -371,7 +378,21 @@ class GnomeMap(GnomeId):
         np.maximum(next_positions[:, 2], 0.0, out=next_positions[:, 2])
         return None
 
-    def to_geojson(self):
+    def _polys_in_viewport(self, viewport=None):
+        """
+        The land polygons that overlap the viewport -- all of them if
+        viewport is None.
+
+        Uses the PolygonSet spatial index, so only the polygons near the
+        viewport are touched.
+        """
+        if viewport is None:
+            return self.land_polys
+
+        return [self.land_polys[i]
+                for i in self.land_polys.polygons_in_bbox(viewport)]
+
+    def to_geojson(self, viewport=None):
         return FeatureCollection([])
 
 
@@ -637,8 +658,16 @@ class ParamMap(GnomeMap):
             # since new_from_dict will call update_from_dict
             super(ParamMap, self).update_from_dict(data)
 
-    def to_geojson(self):
-        shoreline_geo = [p.points.tolist() for p in self.land_polys]
+    def to_geojson(self, viewport=None):
+        """
+        Output the vector version of the shoreline polygon.
+
+        :param viewport=None: if given, only polygons that overlap this
+                              ((min_lon, min_lat), (max_lon, max_lat))
+                              box are included.
+        """
+        shoreline_geo = [p.points.tolist()
+                         for p in self._polys_in_viewport(viewport)]
 
         shoreline = Feature(id="1",
                             properties={'name': 'Shoreline Polys'},
@@ -745,25 +774,56 @@ class RasterMap(GnomeMap):
         then land was hit.
         """
         self.logger.info('generating coarser rasters')
-        self.layers = []
-        base_w = self.raster.shape[0]
-        base_h = self.raster.shape[1]
+        self.layers = [self._coarsen(self.raster, ratio)
+                       for ratio in self.ratios[:-1]]
 
-        for ratio in self.ratios[:-1]:
-            genned_layer = np.zeros((int(math.ceil(float(base_w) / ratio)),
-                                     int(math.ceil(float(base_h) / ratio))),
-                                    dtype=np.uint8, order='C')
+        self.layers.append(self.raster)
+        self.layers = np.array(self.layers)
 
-            for j in range(0, genned_layer.shape[1]):
-                for i in range(0, genned_layer.shape[0]):
-                    genned_layer[i, j] = np.any(self.raster[i * ratio:
-                                                                (i + 1) * ratio, j * ratio:
-                                                                (j + 1) * ratio])
+    @staticmethod
+    def _coarsen(raster, ratio):
+        """
+        Downsample a raster by the given ratio: a cell of the result is 1
+        if any of the (ratio x ratio) block of pixels it covers is non-zero.
 
-            self.layers.append(genned_layer)
+        The raster is padded with water out to a multiple of the ratio, so
+        the partial blocks at the edges are handled like any other.
+        """
+        w, h = raster.shape
+        cw = int(math.ceil(float(w) / ratio))
+        ch = int(math.ceil(float(h) / ratio))
 
-        self.layers.append(self.raster)
-        self.layers = np.array(self.layers)
+        if (cw * ratio, ch * ratio) != (w, h):
+            padded = np.zeros((cw * ratio, ch * ratio), dtype=raster.dtype)
+            padded[:w, :h] = raster
+            raster = padded
+
+        blocks = raster.reshape((cw, ratio, ch, ratio))
+
+        return np.ascontiguousarray(blocks.any(axis=3).any(axis=1),
+                                    dtype=np.uint8)
+
+    def update_coarser_rasters(self, window):
+        """
+        Re-compute the cells of the coarser rasters that cover a changed
+        window of the base raster.
+
+        :param window: ((x_min, y_min), (x_max, y_max)) pixel range of the
+                       base raster that has changed (max is exclusive)
+        """
+        (x0, y0), (x1, y1) = window
+
+        for layer, ratio in zip(self.layers[:-1], self.ratios[:-1]):
+            ratio = int(ratio)
+            i0, j0 = x0 // ratio, y0 // ratio
+            i1 = int(math.ceil(float(x1) / ratio))
+            j1 = int(math.ceil(float(y1) / ratio))
+
+            layer[i0:i1, j0:j1] = self._coarsen(self.raster[i0 * ratio:
+                                                            i1 * ratio,
+                                                            j0 * ratio:
+                                                            j1 * ratio],
+                                                ratio)
 
     @property
     def ratios(self):
@@ -1061,6 +1121,10 @@ class MapFromBNA(RasterMap):
     """
     _schema = MapFromBNASchema
 
+    # resolution (in degrees) of each level of simplified shoreline served
+    # by to_geojson -- level 0 is the full resolution data.
+    geojson_resolutions = (None, 0.0001, 0.001, 0.01)
+
     def __init__(self,
                  filename,
                  raster_size=4096 * 4096,
@@ -1182,17 +1246,38 @@ class MapFromBNA(RasterMap):
         w = int(np.sqrt(raster_size * aspect_ratio))
         h = int(raster_size / w)
 
-        canvas = MapCanvas(image_size=(w, h),
+        canvas = self._land_canvas((w, h), BB)
+        self._draw_land(canvas, land_polys)
+
+        # get the raster as a numpy array:
+        raster_array = canvas.back_asarray()
+
+        # need to return and use projection used to create the raster, or the to_pixel/from_pixel functions
+        # will give incorrect results going forward.
+        return raster_array, canvas.projection
+
+    @staticmethod
+    def _land_canvas(image_size, viewport):
+        """
+        a MapCanvas set up for drawing the land raster
+        """
+        canvas = MapCanvas(image_size=image_size,
                            preset_colors=None,
                            background_color='water',
-                           viewport=BB)
+                           viewport=viewport)
         # color doesn't matter here, only index
         canvas.add_colors((('water', (0, 255, 255)),  # aqua
                            ('land', (255, 204, 153)),  # brown
                            ))
         canvas.clear_background()
 
-        # draw the land to the background
+        return canvas
+
+    @staticmethod
+    def _draw_land(canvas, land_polys):
+        """
+        draw the land (and lake) polygons to the background of the canvas
+        """
         for poly in land_polys:
             # fixme -- this should be something like "land"
             if poly.metadata[2] == '1':
@@ -1210,12 +1295,113 @@ class MapFromBNA(RasterMap):
                                     line_width=1,
                                     background=True)
 
-                # get the raster as a numpy array:
-        raster_array = canvas.back_asarray()
+    @property
+    def land_polys(self):
+        return self._land_polys
 
-        # need to return and use projection used to create the raster, or the to_pixel/from_pixel functions
-        # will give incorrect results going forward.
-        return raster_array, canvas.projection
+    @land_polys.setter
+    def land_polys(self, polys):
+        old_polys = getattr(self, '_land_polys', None)
+        GnomeMap.land_polys.fset(self, polys)
+
+        if old_polys is None or getattr(self, '_raster', None) is None:
+            # still initializing -- __init__ builds the raster
+            return
+
+        self._update_raster(old_polys)
+
+    def _update_raster(self, old_polys):
+        """
+        Bring the raster up to date after the land polygons have changed
+
+        If the extent of the land is unchanged, so is the projection, and
+        only the part of the raster covered by the polygons that were added
+        or removed is redrawn. Otherwise the whole raster is rebuilt.
+        """
+        new_polys = self._land_polys
+
+        if len(new_polys) == 0:
+            self.logger.info('no land polygons: clearing the raster')
+            self._raster[:] = 0
+            self.build_coarser_rasters()
+            return
+
+        if (len(old_polys) == 0 or
+                not (old_polys.bounding_box == new_polys.bounding_box)):
+            self.raster, self.projection = self.build_raster()
+            return
+
+        dirty_bb = self._changed_polys_bbox(old_polys, new_polys)
+        if dirty_bb is None:
+            return
+
+        # pixel y is flipped, so take the min and max of the corners
+        corners = self.projection.to_pixel(dirty_bb, asint=True)
+        w, h = self.raster.shape
+        # pad a pixel for the outlines
+        x0, y0 = np.maximum(corners.min(axis=0) - 1, 0)
+        x1, y1 = np.minimum(corners.max(axis=0) + 2, (w, h))
+
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        self.logger.info('redrawing raster window: {}'
+                         .format(((x0, y0), (x1, y1))))
+        self._redraw_raster_window(((x0, y0), (x1, y1)))
+
+    @staticmethod
+    def _changed_polys_bbox(old_polys, new_polys):
+        """
+        The bounding box of all the polygons that are in one of the sets,
+        but not the other, or None if the sets hold the same polygons.
+        """
+        def keyed(polys):
+            return dict(((p.points.tobytes(), repr(p.metadata)), p)
+                        for p in polys)
+
+        old = keyed(old_polys)
+        new = keyed(new_polys)
+
+        changed = ([p for k, p in old.items() if k not in new] +
+                   [p for k, p in new.items() if k not in old])
+        if not changed:
+            return None
+
+        points = np.concatenate([p.points for p in changed])
+
+        return np.array((points.min(axis=0), points.max(axis=0)))
+
+    def _redraw_raster_window(self, window):
+        """
+        Redraw the land in a window of the raster, and update the coarser
+        rasters to match.
+
+        :param window: ((x_min, y_min), (x_max, y_max)) pixel range to
+                       redraw (max is exclusive)
+        """
+        (x0, y0), (x1, y1) = window
+
+        canvas = self._land_canvas((x1 - x0, y1 - y0),
+                                   self.land_polys.bounding_box)
+
+        # draw with the projection of the full raster, shifted to the window
+        proj = canvas.projection
+        proj.center = self.projection.center
+        proj.scale = self.projection.scale
+        proj.offset = self.projection.offset - (x0, y0)
+
+        # every polygon that touches the window (with a pixel to spare)
+        corners = self.projection.to_lonlat(np.array(((x0 - 1, y0 - 1),
+                                                      (x1 + 1, y1 + 1)),
+                                                     dtype=np.float64))
+        region = np.array((corners.min(axis=0), corners.max(axis=0)))
+
+        land_polys = self.land_polys
+        self._draw_land(canvas, (land_polys[i]
+                                 for i in land_polys.polygons_in_bbox(region)))
+
+        self._raster[x0:x1, y0:y1] = canvas.back_asarray()
+        self.update_coarser_rasters(window)
 
     @property
     def raster_size(self):
@@ -1231,7 +1417,29 @@ class MapFromBNA(RasterMap):
             #should trigger base class to recreate coarser rasters
             self.raster, self.projection = self.build_raster()
 
-    def to_geojson(self):
+    def simplified_land_polys(self, level=0):
+        """
+        The land polygons, thinned to the resolution of the given level
+        of geojson_resolutions.
+
+        Each level is computed once (with PolygonSet.thin) and cached until
+        the land polygons change.
+
+        :param level=0: index into geojson_resolutions. 0 is the full
+                        resolution data.
+        """
+        resolution = self.geojson_resolutions[level]
+        if resolution is None:
+            return self.land_polys
+
+        key = ('polys', level)
+        if key not in self._geojson_cache:
+            scale = 1.0 / resolution
+            self._geojson_cache[key] = self.land_polys.thin((scale, scale))
+
+        return self._geojson_cache[key]
+
+    def to_geojson(self, viewport=None, level=0, counter_clockwise=False):
         """
         Output the vector version of the shoreline polygons.
 
@@ -1241,17 +1449,43 @@ class MapFromBNA(RasterMap):
         object -- keeping the door open to that data coming from something
         other than a bna file.
 
-        FIXME: Technically, geojson recommends ccw polygons -- but putting that
-               check in was pretty slow, so it's commented out.
-
         FIXME: This really should export the map_bounds and spillable_area
         as well.
+
+        :param viewport=None: if given, only polygons that overlap this
+                              ((min_lon, min_lat), (max_lon, max_lat))
+                              box are included.
+
+        :param level=0: the simplification level to use: an index into
+                        geojson_resolutions. 0 is the full resolution data.
+
+        :param counter_clockwise=False: geojson recommends ccw polygons --
+                                        if True, clockwise polygons are
+                                        reversed.
+
+        The result for the whole map (no viewport) is cached for each level,
+        so don't alter the returned object.
         """
+        key = ('geojson', level, counter_clockwise)
+        if viewport is None and key in self._geojson_cache:
+            return self._geojson_cache[key]
+
+        polys = self.simplified_land_polys(level)
+
+        if counter_clockwise:
+            clockwise = polys.is_clockwise()
+
+        if viewport is None:
+            indexes = range(len(polys))
+        else:
+            indexes = polys.polygons_in_bbox(viewport)
+
         land_coords = []
         lake_coords = []
-        crds=None
+        crds = None
 
-        for poly in self.land_polys:
+        for i in indexes:
+            poly = polys[i]
             if poly.metadata[2] == '1':
                 crds = land_coords
             elif poly.metadata[2] == '2':
@@ -1260,12 +1494,10 @@ class MapFromBNA(RasterMap):
                 continue
             pts = poly.points.tolist()
             pts.append(pts[0])
+            # geojson polygons should be counter-clockwise
+            if counter_clockwise and clockwise[i]:
+                pts.reverse()
             crds.append([pts])
-            # FIXME: this is a good idea, but really slow...
-            # the is_clockwise() code could be cythonized, maybe that would help?
-            # # geojson polygons should be counter-clockwise
-            # if is_clockwise(poly):
-            #     p.reverse()
 
         features = []
         if land_coords:
@@ -1279,7 +1511,32 @@ class MapFromBNA(RasterMap):
                         )
             features.append(land)
             features.append(lakes)
-        return FeatureCollection(features)
+
+        fc = FeatureCollection(features)
+        if viewport is None:
+            self._geojson_cache[key] = fc
+
+        return fc
+
+    def serialized_geojson(self, level=0, counter_clockwise=False):
+        """
+        The geojson for the whole map as a JSON string, ready to send to
+        a client.
+
+        Cached per level, so repeated requests don't re-serialize.
+
+        :param level=0: the simplification level to use: an index into
+                        geojson_resolutions.
+
+        :param counter_clockwise=False: reverse clockwise polygons.
+        """
+        key = ('json', level, counter_clockwise)
+        if key not in self._geojson_cache:
+            self._geojson_cache[key] = geojson.dumps(
+                self.to_geojson(level=level,
+                                counter_clockwise=counter_clockwise))
+
+        return self._geojson_cache[key]
 
 
 
@@ -1289,7 +1546,8 @@ class MapFromUGrid(RasterMap):
     """
     _schema = MapFromUGridSchema
 
-    def __init__(self, filename, raster_size=1024 * 1024, **kwargs):
+    def __init__(self, filename, raster_size=1024 * 1024,
+                 use_grid_boundary=False, **kwargs):
         """
         Creates a GnomeMap (specifically a RasterMap) from a netcdf
         data file with a triangular mesh grid in it.
@@ -1307,6 +1565,13 @@ class MapFromUGrid(RasterMap):
                             aspect ratio of the bounding box of the land
         :type raster_size: integer
 
+        :param use_grid_boundary=False: if True, beaching is computed from
+                                        the boundary edges of the grid,
+                                        rather than the raster. This is
+                                        exact, so the raster can be kept
+                                        small.
+        :type use_grid_boundary: bool
+
         Optional arguments (kwargs):
 
         :param map_bounds: The polygon bounding the map -- could be larger or
@@ -1319,8 +1584,11 @@ class MapFromUGrid(RasterMap):
         :type id: string
         """
         self.filename = filename
+        self.use_grid_boundary = use_grid_boundary
 
         grid = PyGrid.from_netCDF(filename)
+        self.grid = grid
+        self._face_neighbors = None
 
         polygons = haz_files.ReadBNA(filename, 'PolygonSet')
         map_bounds = None
@@ -1415,6 +1683,81 @@ class MapFromUGrid(RasterMap):
 
         return None
 
+    @property
+    def face_neighbors(self):
+        """
+        The face across each edge of each face of the grid -- boundary
+        edges are flagged as land, or as open water if the grid has
+        boundary types (0 is land, 1 is open, as in the GNOME UGRID files)
+        """
+        if self._face_neighbors is None:
+            open_edges = None
+            boundaries = getattr(self.grid, 'boundaries', None)
+            boundary_types = getattr(self.grid, 'boundary_types', None)
+
+            if boundaries is not None and boundary_types is not None:
+                is_open = np.asarray(boundary_types) == 1
+                open_edges = np.asarray(boundaries)[is_open]
+
+            self._face_neighbors = face_neighbors(self.grid.faces, open_edges)
+
+        return self._face_neighbors
+
+    def beach_elements(self, sc, model_time=None):
+        """
+        Determines which elements were or weren't beached.
+
+        If use_grid_boundary is set, each element's move is traced across
+        the faces of the grid, and the ones that cross a land boundary edge
+        are beached at the crossing point. Otherwise the raster is used.
+
+        :param sc: the current spill container
+        :type sc:  :class:`gnome.spill_container.SpillContainer`
+        """
+        if not self.use_grid_boundary:
+            return super(MapFromUGrid, self).beach_elements(sc, model_time)
+
+        self.resurface_airborne_elements(sc)
+
+        start_pos = sc['positions']
+        next_pos = sc['next_positions']
+        status_codes = sc['status_codes']
+        last_water_positions = sc['last_water_positions']
+
+        in_water = np.nonzero(status_codes == oil_status.in_water)[0]
+
+        if in_water.size > 0:
+            starts = start_pos[in_water, :2]
+            ends = next_pos[in_water, :2]
+
+            start_faces = np.asarray(self.grid.locate_faces(starts)).reshape(-1)
+            end_faces = np.asarray(self.grid.locate_faces(ends)).reshape(-1)
+
+            # faces are convex: a move that ends in the face it started in
+            # can't have crossed anything
+            start_faces[start_faces == end_faces] = -1
+
+            hit, t = find_boundary_crossings(self.grid.nodes, self.grid.faces,
+                                             self.face_neighbors,
+                                             start_faces, starts, ends)
+            if hit.any():
+                beached = in_water[hit]
+                moves = ends[hit] - starts[hit]
+                t = t[hit].reshape((-1, 1))
+
+                next_pos[beached, :2] = starts[hit] + moves * t
+                # just short of the boundary, so still in the grid
+                last_water_positions[beached, :2] = (starts[hit] +
+                                                     moves * t * 0.999)
+                status_codes[beached] = oil_status.on_land
+
+        self._set_off_map_status(sc)
+
+        sc.mass_balance['beached'] = \
+            sc['mass'][sc['status_codes'] == oil_status.on_land].sum()
+        sc.mass_balance['off_maps'] += \
+            sc['mass'][sc['status_codes'] == oil_status.off_maps].sum()
+
 
 def map_from_rectangular_grid(mask, lon, lat, refine=1, **kwargs):
     """
@@ -13,12 +13,14 @@ It is set back to in_water when the water depth indicates the tide flat
 is no longer a tide flat.
 """
 
+from collections import OrderedDict
+
 import numpy as np
 
 from gnome.gnomeobject import GnomeId
 from gnome.maps import GnomeMap
 from gnome.basic_types import oil_status
-from gnome.utilities.time_utils import asdatetime
+from gnome.utilities.time_utils import asdatetime, date_to_sec
 
 from gnome.utilities.geometry import (points_in_poly,
                                       # point_in_poly,
@@ -179,3 +181,243 @@ class SimpleTideflat(TideflatBase):
             return np.zeros(points.shape[0], dtype=np.bool)
 
         return points_in_poly(self.bounds, points)
+
+
+class RasterTideflat(TideflatBase):
+    """
+    Tideflat driven by gridded water depth, looked up from rasters
+
+    The water depth is sampled on a raster, for each of the data's time
+    steps. is_dry() is then a bilinear interpolation in the two rasters
+    that bracket the model time, and a linear interpolation in time between
+    them -- rather than a full gridded interpolation for every element.
+
+    The raster is usually aligned with the land raster of a RasterMap: see
+    from_raster_map(). The depth is sampled every `resolution` pixels of
+    it, and only over the bounds of the tidal flats, if they are given.
+
+    Only the rasters for the two time steps last used are kept -- the
+    others are sampled again if they are needed again.
+    """
+    # the depth rasters kept
+    max_rasters = 2
+
+    # the most depth samples per time step, if the resolution isn't given
+    max_samples = 256 * 256
+
+    def __init__(self, water_depth, projection, raster_shape,
+                 dry_depth=0.0, times=None, bounds=None, resolution=None):
+        """
+        :param water_depth: gridded water depth (total depth of the water
+                            column, positive) -- a Variable, or anything
+                            with an at(points, time) method.
+
+        :param projection: the projection to convert lon-lat to pixels
+        :type projection: :class:`gnome.utilities.projections.GeoProjection`
+
+        :param raster_shape: (width, height) of the raster, in pixels
+
+        :param dry_depth=0.0: a point is dry if the water is this deep
+                              or shallower (meters)
+
+        :param times=None: the times to build the rasters for. If None, the
+                           times of the water_depth data are used.
+
+        :param bounds=None: (lon, lat) points around the tidal flats -- e.g.
+                            ((min_lon, min_lat), (max_lon, max_lat)). Only
+                            the pixels inside their bounding box are sampled,
+                            points outside it are never dry. If None, the
+                            whole raster is sampled.
+
+        :param resolution=None: the depth is sampled every `resolution`
+                                pixels. If None, it is chosen so there are
+                                no more than max_samples samples.
+        """
+        self.water_depth = water_depth
+        self.projection = projection
+        self.raster_shape = tuple(raster_shape)
+        self.dry_depth = dry_depth
+
+        if times is None:
+            times = water_depth.time.data
+
+        self.times = [asdatetime(t) for t in times]
+        self._seconds = np.asarray(date_to_sec(self.times),
+                                   dtype=np.float64).reshape(-1)
+
+        # the box of pixels sampled: (x0, y0, x1, y1)
+        w, h = self.raster_shape
+        if bounds is None:
+            self._box = (0, 0, w, h)
+        else:
+            corners = projection.to_pixel(np.asarray(bounds, dtype=np.float64)
+                                          .reshape((-1, 2)), asint=True)
+            self._box = (max(0, int(corners[:, 0].min())),
+                         max(0, int(corners[:, 1].min())),
+                         min(w, int(corners[:, 0].max()) + 1),
+                         min(h, int(corners[:, 1].max()) + 1))
+
+        x0, y0, x1, y1 = self._box
+        if resolution is None:
+            area = max(x1 - x0, 0) * max(y1 - y0, 0)
+            resolution = max(1, int(np.ceil(np.sqrt(float(area) /
+                                                    self.max_samples))))
+
+        self.resolution = resolution
+
+        self._depth_rasters = OrderedDict()
+
+    @classmethod
+    def from_raster_map(cls, raster_map, water_depth, **kwargs):
+        """
+        create a RasterTideflat aligned with the land raster of a RasterMap
+
+        :param raster_map: the map to match
+        :type raster_map: :class:`gnome.maps.RasterMap`
+
+        :param water_depth: gridded water depth
+
+        Other keyword arguments are passed on to __init__
+        """
+        return cls(water_depth,
+                   raster_map.projection,
+                   raster_map.raster.shape,
+                   **kwargs)
+
+    @property
+    def sample_shape(self):
+        """
+        (width, height) of the depth rasters
+        """
+        x0, y0, x1, y1 = self._box
+        res = self.resolution
+
+        return (max(0, -(-(x1 - x0) // res)), max(0, -(-(y1 - y0) // res)))
+
+    def _sample_depth(self, time_index):
+        """
+        the raster of water depth at one of the data time steps -- sampled
+        at the centers of the blocks of resolution x resolution pixels.
+        """
+        x0, y0 = self._box[:2]
+        nx, ny = self.sample_shape
+        res = self.resolution
+
+        pixels = np.indices((nx, ny), dtype=np.float64).reshape((2, -1)).T
+        pixels = (pixels + 0.5) * res + (x0, y0)
+
+        points = np.zeros((len(pixels), 3), dtype=np.float64)
+        points[:, :2] = self.projection.to_lonlat(pixels)
+
+        depth = self.water_depth.at(points, self.times[time_index])
+        depth = np.ma.filled(np.ma.asarray(depth, dtype=np.float64), np.nan)
+
+        return depth.astype(np.float32).reshape((nx, ny))
+
+    def _depth_raster(self, time_index):
+        """
+        the raster of water depth at one of the data time steps
+
+        Computed on first use, and kept while it is one of the max_rasters
+        last used.
+        """
+        raster = self._depth_rasters.pop(time_index, None)
+
+        if raster is None:
+            raster = self._sample_depth(time_index)
+
+        # the most recently used go at the end
+        self._depth_rasters[time_index] = raster
+
+        while len(self._depth_rasters) > self.max_rasters:
+            self._depth_rasters.popitem(last=False)
+
+        return raster
+
+    def _time_bracket(self, time):
+        """
+        the indexes of the two time steps that bracket the time,
+        and the interpolation weight of the second one.
+
+        Times outside the data are clamped to the first or last time.
+        """
+        if len(self._seconds) == 1:
+            return 0, 0, 0.0
+
+        sec = date_to_sec(asdatetime(time))
+        i = np.searchsorted(self._seconds, sec, side='right') - 1
+
+        if i < 0:
+            return 0, 0, 0.0
+        elif i >= len(self._seconds) - 1:
+            last = len(self._seconds) - 1
+            return last, last, 0.0
+
+        alpha = ((sec - self._seconds[i]) /
+                 (self._seconds[i + 1] - self._seconds[i]))
+
+        return i, i + 1, alpha
+
+    @staticmethod
+    def _bilinear(raster, fx, fy):
+        """
+        raster interpolated at the (fractional) indexes fx, fy -- clamped
+        to the edges.
+        """
+        nx, ny = raster.shape
+
+        fx = np.clip(fx, 0, nx - 1)
+        fy = np.clip(fy, 0, ny - 1)
+
+        ix = np.minimum(fx.astype(np.int32), max(nx - 2, 0))
+        iy = np.minimum(fy.astype(np.int32), max(ny - 2, 0))
+        ix1 = np.minimum(ix + 1, nx - 1)
+        iy1 = np.minimum(iy + 1, ny - 1)
+
+        ax = fx - ix
+        ay = fy - iy
+
+        return ((raster[ix, iy] * (1 - ax) + raster[ix1, iy] * ax) * (1 - ay) +
+                (raster[ix, iy1] * (1 - ax) + raster[ix1, iy1] * ax) * ay)
+
+    def is_dry(self, points, time):
+        """
+        :param points: locations for testing if the locations are dry.
+        :type points: Nx3 numpy array or equivelent.
+
+        :param time: time at which to check for wet/dry
+
+        :return: numpy array of bools one for each point.
+                 Points off the sampled raster, or where there is no depth
+                 data, are never dry.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+        dry = np.zeros(points.shape[0], dtype=np.bool)
+
+        x0, y0, x1, y1 = self._box
+        if x1 <= x0 or y1 <= y0:
+            return dry
+
+        pixels = self.projection.to_pixel(points)
+        on_raster = ((pixels[:, 0] >= x0) &
+                     (pixels[:, 1] >= y0) &
+                     (pixels[:, 0] < x1) &
+                     (pixels[:, 1] < y1))
+
+        if not on_raster.any():
+            return dry
+
+        # fractional indexes in the depth rasters
+        fx = (pixels[on_raster, 0] - x0) / self.resolution - 0.5
+        fy = (pixels[on_raster, 1] - y0) / self.resolution - 0.5
+
+        i0, i1, alpha = self._time_bracket(time)
+        depth = self._bilinear(self._depth_raster(i0), fx, fy)
+        if alpha > 0.0:
+            depth += (self._bilinear(self._depth_raster(i1), fx, fy) -
+                      depth) * alpha
+
+        # NaN (no data) compares False, so is left wet
+        dry[on_raster] = depth <= self.dry_depth
+
+        return dry
@@ -0,0 +1,164 @@
+"""
+Land checking against the boundary of an unstructured grid
+
+Rather than rasterizing the land, this uses the grid itself: the water
+domain is the set of faces, and the land is everything across a boundary
+edge. Each element's move is traced from face to face, across shared
+edges, until it either ends up in a face, or crosses a boundary edge.
+
+All the elements are walked together -- each pass of the loop moves every
+element that is still going one face along its path -- so the work is
+vectorized over elements, and the number of passes is the largest number
+of faces any one element crosses in a step.
+"""
+
+import numpy as np
+
+# values in the face neighbor array for edges with no face on the other side
+LAND_EDGE = -1
+OPEN_EDGE = -2
+
+
+def face_neighbors(faces, open_edges=None):
+    """
+    Compute the face on the other side of each edge of each face
+
+    :param faces: the node indexes of each face. Edge k of a face is from
+                  node k to node k + 1 (wrapping around).
+    :type faces: (num_faces, num_vertices) integer array
+
+    :param open_edges=None: pairs of node indexes of boundary edges that
+                            are open water, rather than land.
+    :type open_edges: (N, 2) integer array
+
+    :returns: (num_faces, num_vertices) array of face indexes. Boundary
+              edges are LAND_EDGE, or OPEN_EDGE if they are in open_edges.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    num_faces, num_verts = faces.shape
+    num_nodes = faces.max() + 1
+
+    # key each edge by its (sorted) pair of nodes
+    n0 = faces.reshape(-1)
+    n1 = np.roll(faces, -1, axis=1).reshape(-1)
+    keys = np.minimum(n0, n1) * num_nodes + np.maximum(n0, n1)
+
+    # an edge shared by two faces shows up twice
+    order = np.argsort(keys, kind='mergesort')
+    sorted_keys = keys[order]
+    shared = np.nonzero(sorted_keys[1:] == sorted_keys[:-1])[0]
+
+    neighbors = np.empty((num_faces * num_verts,), dtype=np.int64)
+    neighbors.fill(LAND_EDGE)
+    neighbors[order[shared]] = order[shared + 1] // num_verts
+    neighbors[order[shared + 1]] = order[shared] // num_verts
+
+    if open_edges is not None and len(open_edges) > 0:
+        open_edges = np.asarray(open_edges, dtype=np.int64).reshape((-1, 2))
+        open_keys = (open_edges.min(axis=1) * num_nodes +
+                     open_edges.max(axis=1))
+        is_open = (np.in1d(keys, open_keys) &
+                   (neighbors == LAND_EDGE))
+        neighbors[is_open] = OPEN_EDGE
+
+    return neighbors.reshape((num_faces, num_verts))
+
+
+def find_boundary_crossings(nodes, faces, neighbors,
+                            start_faces, starts, ends,
+                            tolerance=1e-9):
+    """
+    Trace the moves from starts to ends across the faces of the grid,
+    and find the ones that cross a land boundary edge.
+
+    :param nodes: (num_nodes, 2) array of node coordinates
+
+    :param faces: (num_faces, num_vertices) array of node indexes.
+                  Faces must be convex.
+
+    :param neighbors: face neighbor array, as made by face_neighbors()
+
+    :param start_faces: index of the face each start point is in,
+                        -1 for points not in the grid (which aren't traced)
+    :type start_faces: (N,) integer array
+
+    :param starts: start positions
+    :type starts: (N, 2) array
+
+    :param ends: end positions
+    :type ends: (N, 2) array
+
+    :param tolerance=1e-9: slop in the parametric edge intersection, so a
+                           path through a node doesn't slip between edges.
+
+    :returns: (hit, t): hit is a (N,) bool array, True for the moves that
+              cross a land edge. t is a (N,) array with the fraction of the
+              move at which it hit (1.0 for the ones that didn't).
+    """
+    nodes = np.asarray(nodes, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.float64)[:, :2]
+    moves = np.asarray(ends, dtype=np.float64)[:, :2] - starts
+
+    hit = np.zeros((len(starts),), dtype=np.bool)
+    t_hit = np.ones((len(starts),), dtype=np.float64)
+
+    current = np.array(start_faces, dtype=np.int64)
+    # the face we came from, so the entry edge isn't taken as the exit.
+    # (-3 matches no face and no boundary flag)
+    previous = np.empty_like(current)
+    previous.fill(-3)
+    t_current = np.zeros((len(starts),), dtype=np.float64)
+
+    active = np.nonzero(current >= 0)[0]
+
+    # can't cross more faces than there are
+    for _step in range(len(faces)):
+        if len(active) == 0:
+            break
+
+        f = current[active]
+        s = starts[active]
+        d = moves[active]
+
+        v0 = nodes[faces[f]]
+        edges = np.roll(v0, -1, axis=1) - v0
+        w = v0 - s[:, None, :]
+
+        # intersection of the move with the line of each edge:
+        #    s + t * d == v0 + u * edge
+        denom = d[:, None, 0] * edges[..., 1] - d[:, None, 1] * edges[..., 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (w[..., 0] * edges[..., 1] - w[..., 1] * edges[..., 0]) / denom
+            u = (w[..., 0] * d[:, None, 1] - w[..., 1] * d[:, None, 0]) / denom
+
+        face_nbrs = neighbors[f]
+        exits = ((denom != 0.0) &
+                 (u >= -tolerance) & (u <= 1.0 + tolerance) &
+                 (t >= t_current[active, None] - tolerance) &
+                 (face_nbrs != previous[active, None]))
+        t = np.where(exits, t, np.inf)
+
+        exit_edge = np.argmin(t, axis=1)
+        rows = np.arange(len(active))
+        t_exit = t[rows, exit_edge]
+        next_face = face_nbrs[rows, exit_edge]
+
+        # the move ends inside this face (or is zero length)
+        stays = t_exit > 1.0
+        crossing = ~stays
+        lands = crossing & (next_face == LAND_EDGE)
+
+        hit[active[lands]] = True
+        t_hit[active[lands]] = t_exit[lands]
+
+        # keep walking the ones that moved into another face.
+        walking = crossing & (next_face >= 0)
+        moving = active[walking]
+        previous[moving] = f[walking]
+        current[moving] = next_face[walking]
+        t_current[moving] = t_exit[walking]
+
+        active = moving
+
+    return hit, t_hit
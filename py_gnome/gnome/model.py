@@ -17,7 +17,7 @@ from gnome.utilities.time_utils import round_time, asdatetime
 import gnome.utilities.rand
 from gnome.utilities.cache import ElementCache
 from gnome.utilities.orderedcollection import OrderedCollection
-from gnome.spill_container import SpillContainerPair
+from gnome.spill_container import SpillContainerPair, ActiveElements
 from gnome.basic_types import oil_status, fate
 
 from gnome.maps.map import (GnomeMapSchema,
@@ -29,8 +29,11 @@ from gnome.maps.map import (GnomeMapSchema,
 from gnome.environment import Environment, Wind
 from gnome.array_types import gat
 from gnome.environment import schemas as env_schemas
+from gnome.environment.gridded_objects_base import Variable, VectorVariable
+from gnome.environment.grid_subset import buffered_bbox
 
 from gnome.movers import Mover, mover_schemas
+from gnome.movers.integrator import CombinedIntegrator
 from gnome.weatherers import (weatherer_sort,
                               Weatherer,
                               WeatheringData,
@@ -68,6 +71,7 @@ class ModelSchema(ObjTypeSchema):
     )
     uncertain = SchemaNode(Bool())
     cache_enabled = SchemaNode(Bool())
+    fused_integration = SchemaNode(Bool(), missing=drop)
     num_time_steps = SchemaNode(Int(), read_only=True)
     make_default_refs = SchemaNode(Bool())
     mode = SchemaNode(
@@ -170,6 +174,7 @@ class Model(GnomeId):
                  spills=[],
                  uncertain_spills=[],
                  manual_weathering=False,
+                 fused_integration=False,
                  **kwargs):
         '''
         Initializes a model.
@@ -199,6 +204,11 @@ class Model(GnomeId):
         :param mode='Gnome': The runtime 'mode' that the model should use.
                              This is a value that the Web Client uses to
                              decide which UI views it should present.
+
+        :param fused_integration=False: Flag for integrating the moves of
+                                        the PyMovers together, with a
+                                        CombinedIntegrator -- see the
+                                        integrator attribute.
         '''
         # making sure basic stuff is in place before properties are set
         super(Model, self).__init__(**kwargs)
@@ -223,6 +233,11 @@ class Model(GnomeId):
         self._cache = ElementCache()
         self._cache.enabled = cache_enabled
 
+        # the ActiveElements of each spill container, by uncertain
+        self._active_elements = {}
+
+        self.fused_integration = fused_integration
+
         # default to now, rounded to the nearest hour
         self.start_time = start_time
         self._duration = duration
@@ -345,6 +360,8 @@ class Model(GnomeId):
         # clear the cache:
         self._cache.rewind()
 
+        self._active_elements.clear()
+
         for outputter in self.outputters:
             outputter.rewind()
 
@@ -754,7 +771,10 @@ class Model(GnomeId):
 
         '''Step 5 & 6: Call prepare_for_model_run and misc setup'''
         transport = False
-        for mover in self.movers:
+        for index, mover in enumerate(self.movers):
+            # keys the random streams of the mover for the run
+            mover.random_stream = index
+
             if mover.on:
                 mover.prepare_for_model_run()
                 transport = True
@@ -845,14 +865,38 @@ class Model(GnomeId):
             if sc.num_released > 0:  # can this check be removed?
                 # possibly refloat elements
                 self.map.refloat_elements(sc, self.time_step, self.model_time)
+                sc.positions_changed()
 
                 # reset next_positions
                 (sc['next_positions'])[:] = sc['positions']
 
+                # the elements in the water -- the movers that can, only
+                # compute the moves of those
+                active = self._get_active_elements(sc)
+
                 # loop through the movers
-                for m in self.movers:
-                    delta = m.get_move(sc, self.time_step, self.model_time)
-                    sc['next_positions'] += delta
+                # each adds its move to next_positions
+                next_positions = sc['next_positions']
+                movers = list(self.movers)
+
+                if self.integrator is not None:
+                    # the PyMovers that can be integrated together
+                    combined = [m for m in movers
+                                if self.integrator.combinable(m)]
+
+                    if combined:
+                        self.integrator.add_move(combined, sc,
+                                                 self.time_step,
+                                                 self.model_time,
+                                                 next_positions, active)
+
+                        # by identity: == compares the whole movers
+                        ids = set(id(m) for m in combined)
+                        movers = [m for m in movers if id(m) not in ids]
+
+                for m in movers:
+                    m.add_move(sc, self.time_step, self.model_time,
+                               next_positions, active)
 
                 self.map.beach_elements(sc, self.model_time)
 
@@ -866,6 +910,38 @@ class Model(GnomeId):
 
                 # the final move to the new positions
                 (sc['positions'])[:] = sc['next_positions']
+                sc.positions_changed()
+
+    @property
+    def fused_integration(self):
+        '''
+        True if the moves of the PyMovers (e.g. current and wind) are
+        integrated together, by self.integrator. Its settings (numerical
+        method, substeps) can be changed on it.
+        '''
+        return self.integrator is not None
+
+    @fused_integration.setter
+    def fused_integration(self, value):
+        if not value:
+            self.integrator = None
+        elif self.__dict__.get('integrator') is None:
+            self.integrator = CombinedIntegrator()
+
+    def _get_active_elements(self, sc):
+        '''
+        The ActiveElements of sc, for this step. Its scratch arrays are kept
+        from step to step.
+        '''
+        active = self._active_elements.get(sc.uncertain)
+
+        if active is None or active.sc is not sc:
+            active = ActiveElements(sc)
+            self._active_elements[sc.uncertain] = active
+
+        active.update()
+
+        return active
 
     def _update_fate_status(self, sc):
         '''
@@ -1713,3 +1789,47 @@ class Model(GnomeId):
                         break
                 else:
                     self.environment.add(item)
+
+    def subset_environment(self, bbox=None, buffer=0.5):
+        '''
+        Crop the gridded environment objects -- those in the environment
+        collection, and the currents and winds used by the movers -- to a
+        bounding box, so only the part of the source model that covers the
+        region of interest is loaded.
+
+        :param bbox=None: ((min_lon, min_lat), (max_lon, max_lat)).
+                          Defaults to the bounds of the map.
+        :param buffer=0.5: added on all sides of the bounding box (degrees)
+
+        :returns: the objects that were cropped.
+
+        Objects that don't overlap the box are left as they are.
+        '''
+        if bbox is None:
+            bounds = np.asarray(self.map.map_bounds)
+            bbox = (bounds.min(axis=0), bounds.max(axis=0))
+
+        bbox = buffered_bbox(bbox, buffer)
+
+        objs = list(self.environment)
+        for mover in self.movers:
+            for name in ('current', 'wind'):
+                obj = getattr(mover, name, None)
+                if obj is not None and not any(obj is o for o in objs):
+                    objs.append(obj)
+
+        done = {}
+        cropped = []
+        for obj in objs:
+            if not isinstance(obj, (Variable, VectorVariable)):
+                continue
+
+            try:
+                obj.subset(bbox, _done=done)
+            except ValueError as err:
+                self.logger.warning('{0} not cropped: {1}'
+                                    .format(obj.name, err))
+            else:
+                cropped.append(obj)
+
+        return cropped
@@ -38,6 +38,7 @@ from vertical_movers import (RiseVelocityMover,
 
 from py_wind_movers import PyWindMover, PyWindMoverSchema
 from py_current_movers import PyCurrentMover, PyCurrentMoverSchema
+from integrator import CombinedIntegrator
 
 
 mover_schemas = [
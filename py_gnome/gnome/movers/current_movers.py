@@ -389,8 +389,7 @@ class CatsMover(CurrentMoversBase):
         ref_scale = self.ref_scale 
 
         if self._tide is not None:
-            time_value, _err = self._tide.cy_obj.get_time_value(model_time)
-            tide = time_value[0][0]
+            tide = self._tide.get_value(model_time)
         else:
             tide = 1
 
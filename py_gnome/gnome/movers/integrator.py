@@ -0,0 +1,179 @@
+'''
+Integration of the moves of several PyMovers together
+
+Each PyMover integrates its own velocity field: the intermediate positions
+of its Runge-Kutta stages don't include the moves of the other movers,
+and each mover evaluates its field, and projects its stages, on its own.
+
+The CombinedIntegrator sums the velocities of all the movers that give
+them (PyMover.velocities(): the current, the wind times the windages...)
+at shared stage positions -- with one projection to lon/lat per stage.
+The time step can be split into substeps, so no element moves more than
+a given distance in one of them.
+'''
+from datetime import timedelta
+
+import numpy as np
+
+from gnome.basic_types import oil_status
+from gnome.utilities.projections import FlatEarthProjection
+
+from gnome.movers.movers import PyMover
+
+
+class CombinedIntegrator(object):
+    """
+    Integrates the combined velocities of the PyMovers of a model
+    """
+    num_methods = ('Euler', 'RK2', 'RK4')
+
+    def __init__(self, num_method='RK2', max_distance=None, max_substeps=16):
+        """
+        :param num_method='RK2': Numerical method: 'Euler', 'RK2' or 'RK4'
+
+        :param max_distance=None: largest distance, in meters, an element
+                                  should move in one substep. The number of
+                                  substeps comes from the fastest element at
+                                  the start of the step. If None, the step
+                                  is not split.
+
+        :param max_substeps=16: the most substeps a step is split into
+        """
+        if num_method not in self.num_methods:
+            raise ValueError('num_method must be one of {0}'
+                             .format(self.num_methods))
+
+        if max_distance is not None and max_distance <= 0:
+            raise ValueError('max_distance must be greater than 0')
+
+        if max_substeps < 1:
+            raise ValueError('max_substeps must be 1 or more')
+
+        self.num_method = num_method
+        self.max_distance = max_distance
+        self.max_substeps = max_substeps
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}(num_method={0.num_method!r}, '
+                'max_distance={0.max_distance}, '
+                'max_substeps={0.max_substeps})'.format(self))
+
+    @staticmethod
+    def combinable(mover):
+        '''
+        True if mover is active, and gives its velocities
+        '''
+        return (isinstance(mover, PyMover) and mover.combinable and
+                mover.active)
+
+    def velocities(self, movers, sc, points, time, memo_key=None):
+        '''
+        the sum of the velocities of movers at points
+        '''
+        vels = np.zeros((len(points), 3), dtype=np.float64)
+
+        for m in movers:
+            vels += m.velocities(sc, points, time, memo_key)
+
+        return vels
+
+    def num_substeps(self, vels, time_step):
+        '''
+        the number of substeps, for elements moving at vels
+        '''
+        if self.max_distance is None or len(vels) == 0:
+            return 1
+
+        speed = np.max(np.hypot(vels[:, 0], vels[:, 1]))
+        num = int(np.ceil(speed * time_step / self.max_distance))
+
+        return min(max(num, 1), self.max_substeps)
+
+    def get_move(self, movers, sc, time_step, model_time_datetime):
+        """
+        The combined move of movers, in (long, lat, z), of each element of
+        sc -- an Nx3 array.
+
+        :param movers: the PyMovers, all combinable
+        :param sc: the spill container, or its ActiveElements
+        :param time_step: time step in seconds
+        :param model_time_datetime: current model time as datetime object
+        """
+        positions = sc['positions']
+
+        if len(positions) == 0 or len(movers) == 0:
+            return np.zeros_like(positions)
+
+        key = PyMover._memo_key(sc, positions)
+        step_key = (tuple(id(m) for m in movers), self.num_method, time_step)
+
+        v0 = self.velocities(movers, sc, positions, model_time_datetime, key)
+
+        num = self.num_substeps(v0, time_step)
+        dt = float(time_step) / num
+
+        pos = positions.copy()
+        t = model_time_datetime
+
+        for i in range(num):
+            # the stage positions depend on all the movers, and the steps
+            stage_keys = [PyMover._stage_key(key, 'combined', step_key, num,
+                                             i, stage)
+                          for stage in range(4)]
+
+            if i > 0:
+                v0 = self.velocities(movers, sc, pos, t, stage_keys[0])
+
+            pos += self._step(movers, sc, pos, t, dt, v0, stage_keys)
+            t = t + timedelta(seconds=dt)
+
+        deltas = pos - positions
+        deltas[sc['status_codes'] != oil_status.in_water] = (0, 0, 0)
+
+        return deltas
+
+    def _step(self, movers, sc, pos, t, dt, v0, stage_keys):
+        '''
+        the move, in (long, lat, z), from pos over dt seconds -- one
+        projection for each stage.
+        '''
+        def stage(vels, fraction):
+            # the positions for the next stage
+            return pos + FlatEarthProjection.meters_to_lonlat(vels * dt *
+                                                              fraction, pos)
+
+        def at(points, time_fraction, num):
+            return self.velocities(movers, sc, points,
+                                   t + timedelta(seconds=dt * time_fraction),
+                                   stage_keys[num])
+
+        if self.num_method == 'Euler':
+            vels = v0
+        elif self.num_method == 'RK2':
+            v1 = at(stage(v0, 1.0), 1.0, 1)
+
+            vels = (v0 + v1) / 2
+        else:
+            v1 = at(stage(v0, 0.5), 0.5, 1)
+            v2 = at(stage(v1, 0.5), 0.5, 2)
+            v3 = at(stage(v2, 1.0), 1.0, 3)
+
+            vels = (v0 + 2 * v1 + 2 * v2 + v3) / 6
+
+        return FlatEarthProjection.meters_to_lonlat(vels * dt, pos)
+
+    def add_move(self, movers, sc, time_step, model_time_datetime,
+                 next_positions, active=None):
+        """
+        Add the combined move of movers to next_positions -- see
+        Mover.add_move()
+        """
+        if active is not None and not active.all_active:
+            if len(active) > 0:
+                active.scatter_add(next_positions,
+                                   self.get_move(movers, active, time_step,
+                                                 model_time_datetime))
+            return
+
+        next_positions += self.get_move(movers, sc, time_step,
+                                        model_time_datetime)
@@ -168,6 +168,13 @@ class Process(GnomeId):
 
 
 class Mover(Process):
+    # True if get_move() only needs the elements in the water -- the model
+    # passes it an ActiveElements in place of the spill container then.
+    compact_elements = False
+
+    # the mover's index in the model's movers, set by the model for a run --
+    # it keys the random streams of the random movers
+    random_stream = None
 
     def get_move(self, sc, time_step, model_time_datetime):
         """
@@ -193,8 +200,40 @@ class Mover(Process):
 
         return delta
 
+    def add_move(self, sc, time_step, model_time_datetime, next_positions,
+                 active=None):
+        """
+        Add the move of each element to next_positions -- this is what the
+        model calls, with the spill container's 'next_positions' array.
+
+        The default adds the delta from get_move(). Movers that can add
+        their move in place may override it.
+
+        :param next_positions: array of the same shape as sc['positions']
+        :param active=None: the ActiveElements of sc for this step. If
+                            given, and the mover's compact_elements is True,
+                            get_move() is only called for the active
+                            elements, and their moves scattered back.
+        """
+        if (self.compact_elements and active is not None and
+                not active.all_active):
+            if len(active) > 0:
+                active.scatter_add(next_positions,
+                                   self.get_move(active, time_step,
+                                                 model_time_datetime))
+            return
+
+        next_positions += self.get_move(sc, time_step, model_time_datetime)
+
 
 class PyMover(Mover):
+    # the velocity fields are only evaluated for the elements in the water
+    compact_elements = True
+
+    # True if velocities() is implemented: the model's CombinedIntegrator
+    # can then integrate the mover together with the others
+    combinable = False
+
     def __init__(self, default_num_method='RK2',
                  **kwargs):
         super(PyMover, self).__init__(**kwargs)
@@ -229,8 +268,58 @@ class PyMover(Mover):
 
         return self.num_methods[method_name]
 
+    @staticmethod
+    def _memo_key(sc, pos):
+        '''
+        A key for the velocity field's memo, based on the spill container's
+        positions version, or None if pos are not the container's current
+        positions (the field will hash the points instead).
+        '''
+        try:
+            positions = sc['positions']
+            key = sc.positions_key()
+        except (KeyError, TypeError, AttributeError):
+            return None
+
+        if (pos.shape != positions.shape or
+                pos.ctypes.data != positions.ctypes.data):
+            return None
+
+        return key
+
+    @staticmethod
+    def _stage_key(key, *extra):
+        '''
+        key for points computed from the positions in an integration stage
+        '''
+        return None if key is None else key + extra
+
+    @staticmethod
+    def _field_at(vel_field, points, time, memo_key=None):
+        '''
+        vel_field.at(points, time), with the results memoized under memo_key,
+        if given and the field has a memo (the gridded objects).
+        '''
+        if memo_key is None or not hasattr(vel_field, '_result_memo'):
+            return vel_field.at(points, time)
+
+        return vel_field.at(points, time, _hash=(memo_key, time))
+
+    def velocities(self, sc, points, time, memo_key=None):
+        """
+        The velocities (m/s) the mover gives the elements at points, at
+        time -- an Nx3 array. Movers that implement it set combinable.
+
+        :param sc: the spill container (or ActiveElements) the points are
+                   for -- for per element data, like the windages
+        :param memo_key=None: key for the velocity field's memo, see
+                              _field_at()
+        """
+        raise NotImplementedError
+
     def get_delta_Euler(self, sc, time_step, model_time, pos, vel_field):
-        vels = vel_field.at(pos, model_time)
+        key = self._memo_key(sc, pos)
+        vels = self._field_at(vel_field, pos, model_time, key)
 
         return vels * time_step
 
@@ -239,12 +328,17 @@ class PyMover(Mover):
         dt_s = dt.seconds
         t = model_time
 
-        v0 = vel_field.at(pos, t)
+        key = self._memo_key(sc, pos)
+
+        v0 = self._field_at(vel_field, pos, t, key)
         d0 = FlatEarthProjection.meters_to_lonlat(v0 * dt_s, pos)
         p1 = pos.copy()
         p1 += d0
 
-        v1 = vel_field.at(p1, t + dt)
+        # the intermediate points depend on the field and the time step too
+        v1 = self._field_at(vel_field, p1, t + dt,
+                            self._stage_key(key, 'RK2', id(vel_field),
+                                            time_step))
 
         return dt_s / 2 * (v0 + v1)
 
@@ -253,22 +347,27 @@ class PyMover(Mover):
         dt_s = dt.seconds
         t = model_time
 
-        v0 = vel_field.at(pos, t)
+        key = self._memo_key(sc, pos)
+        stage_keys = [self._stage_key(key, 'RK4', stage, id(vel_field),
+                                      time_step)
+                      for stage in (1, 2, 3)]
+
+        v0 = self._field_at(vel_field, pos, t, key)
         d0 = FlatEarthProjection.meters_to_lonlat(v0 * dt_s / 2, pos)
         p1 = pos.copy()
         p1 += d0
 
-        v1 = vel_field.at(p1, t + dt / 2)
+        v1 = self._field_at(vel_field, p1, t + dt / 2, stage_keys[0])
         d1 = FlatEarthProjection.meters_to_lonlat(v1 * dt_s / 2, pos)
         p2 = pos.copy()
         p2 += d1
 
-        v2 = vel_field.at(p2, t + dt / 2)
+        v2 = self._field_at(vel_field, p2, t + dt / 2, stage_keys[1])
         d2 = FlatEarthProjection.meters_to_lonlat(v2 * dt_s, pos)
         p3 = pos.copy()
         p3 += d2
 
-        v3 = vel_field.at(p3, t + dt)
+        v3 = self._field_at(vel_field, p3, t + dt, stage_keys[2])
 
         return dt_s / 6 * (v0 + 2 * v1 + 2 * v2 + v3)
 
@@ -299,6 +398,10 @@ class CyMover(Mover):
         self.delta = np.zeros((0, 3), dtype=world_point_type)
         self.status_codes = np.zeros((0, 1), dtype=status_code_type)
 
+        # the delta arrays, one for each spill type, kept between calls
+        self._delta_buffers = {}
+        self._positions_source = None
+
         # either a 1, or 2 depending on whether spill is certain or not
         self.spill_type = 0
 
@@ -362,6 +465,10 @@ class CyMover(Mover):
         Override for things like the WindMover since it has a different
         implementation
 
+        The delta returned is a view of a buffer the mover keeps -- it is
+        overwritten by the next call for the same type of spill (certain or
+        uncertain).
+
         :param sc: spill_container.SpillContainer object
         :param time_step: time step in seconds
         :param model_time_datetime: current model time as datetime object
@@ -374,11 +481,21 @@ class CyMover(Mover):
         if self.active and len(self.positions) > 0:
             self.mover.get_move(self.model_time, time_step,
                                 self.positions, self.delta,
-                                self.status_codes, self.spill_type)
+                                self.status_codes, self.spill_type,
+                                **self.get_move_kwargs(sc))
 
         return (self.delta.view(dtype=world_point_type)
                 .reshape((-1, len(world_point))))
 
+    def get_move_kwargs(self, sc):
+        """
+        Extra keyword arguments for the Cython wrapper's get_move(...).
+        None in the base class.
+
+        :param sc: an instance of gnome.spill_container.SpillContainer class
+        """
+        return {}
+
     def prepare_data_for_get_move(self, sc, model_time_datetime):
         """
         organizes the spill object into inputs for calling with Cython
@@ -403,10 +520,35 @@ class CyMover(Mover):
             self.spill_type = spill_type.forecast
 
         # Array is not the same size, change view and reshape
-        self.positions = (self.positions.view(dtype=world_point)
-                          .reshape((len(self.positions),)))
+        # (the same view, until the container makes a new array)
+        if self.positions is not self.__dict__.get('_positions_source'):
+            self._positions_source = self.positions
+            self._positions_view = (self.positions.view(dtype=world_point)
+                                    .reshape((len(self.positions),)))
+
+        self.positions = self._positions_view
+
+        self.delta = self._delta_buffer(len(self.positions))
+
+    def _delta_buffer(self, num_elements):
+        """
+        A zeroed delta array for num_elements -- a view of a buffer kept
+        for the spill type, that grows with the spill container.
+        """
+        buffers = self.__dict__.setdefault('_delta_buffers', {})
+        buf = buffers.get(self.spill_type)
+
+        if buf is None or len(buf) < num_elements:
+            # room for more, as the elements are released
+            size = num_elements if buf is None else max(num_elements,
+                                                         2 * len(buf))
+            buf = np.zeros((size, 3), dtype=world_point_type)
+            buffers[self.spill_type] = buf
+
+        delta = buf[:num_elements]
+        delta.fill(0)
 
-        self.delta = np.zeros(len(self.positions), dtype=world_point)
+        return delta.view(dtype=world_point).reshape((num_elements,))
 
     def model_step_is_done(self, sc=None):
         """
@@ -45,6 +45,8 @@ class PyCurrentMover(movers.PyMover):
 
     _ref_as = 'py_current_movers'
 
+    combinable = True
+
     _req_refs = {'current': GridCurrent}
 
     def __init__(self,
@@ -218,6 +220,25 @@ class PyCurrentMover(movers.PyMover):
 
         return vels
 
+    def velocities(self, sc, points, time, memo_key=None):
+        """
+        The velocities of the current at points (m/s), scaled by
+        scale_value.
+
+        :param sc: the spill container (unused)
+        :param points: Nx3 array of positions
+        :param time: datetime
+        :param memo_key=None: key for the current's memo -- see
+                              PyMover._field_at()
+        """
+        vels = self._field_at(self.current, points, time, memo_key)
+
+        res = np.zeros((len(points), 3), dtype=np.float64)
+        res[:, :vels.shape[1]] = vels[:, :3]
+        res *= self.scale_value
+
+        return res
+
     def get_move(self, sc, time_step, model_time_datetime, num_method=None):
         """
         Compute the move in (long,lat,z) space. It returns the delta move
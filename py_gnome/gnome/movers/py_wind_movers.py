@@ -44,6 +44,8 @@ class PyWindMover(movers.PyMover):
 
     _ref_as = 'py_wind_movers'
 
+    combinable = True
+
     _req_refs = {'wind': GridWind}
 
     def __init__(self,
@@ -168,7 +170,9 @@ class PyWindMover(movers.PyMover):
                                     sc['windage_range'][:, 1],
                                     sc['windages'],
                                     sc['windage_persist'],
-                                    time_step)
+                                    time_step,
+                                    **rand.element_keys(sc, 'windages',
+                                                        model_time_datetime))
 
     def get_grid_data(self):
         """
@@ -208,6 +212,26 @@ class PyWindMover(movers.PyMover):
 
             return centroids
 
+    def velocities(self, sc, points, time, memo_key=None):
+        """
+        The drift of the elements at points due to the wind (m/s): the
+        wind times the windage of each element, scaled by scale_value.
+
+        :param sc: the spill container, for the 'windages'
+        :param points: Nx3 array of positions
+        :param time: datetime
+        :param memo_key=None: key for the wind's memo -- see
+                              PyMover._field_at()
+        """
+        vels = self._field_at(self.wind, points, time, memo_key)
+
+        # no vertical drift from the wind
+        res = np.zeros((len(points), 3), dtype=np.float64)
+        res[:, :2] = vels[:, :2]
+        res[:, :2] *= (sc['windages'] * self.scale_value)[:, np.newaxis]
+
+        return res
+
     def get_move(self, sc, time_step, model_time_datetime, num_method=None):
         """
         Compute the move in (long,lat,z) space. It returns the delta move
@@ -3,7 +3,7 @@ Movers using diffusion as the forcing function
 '''
 import numpy as np
 
-from colander import (SchemaNode, Float, Boolean, drop)
+from colander import (SchemaNode, Float, Int, Boolean, drop)
 
 from gnome.basic_types import oil_status
 from gnome.cy_gnome.cy_random_mover import CyRandomMover
@@ -17,12 +17,52 @@ from gnome.movers import CyMover, ProcessSchema
 from gnome.persist.validators import convertible_to_seconds
 from gnome.persist.extend_colander import LocalDateTime
 from gnome.utilities.inf_datetime import InfTime, MinusInfTime
+from gnome.utilities import rand
+
+
+def element_streams(mover, sc):
+    """
+    The keyword arguments for the Cython get_move(...) of the random movers:
+    each element draws from a random stream of its own, keyed by the random
+    seed, its id, a step and the mover (and whether the spill is uncertain).
+    So the moves don't depend on the order of the elements, or on how they
+    are split across threads.
+
+    The step counts the moves the mover has drawn for the spill container
+    since prepare_for_model_run(), so each call gets new numbers. The mover
+    is known by its index in the model's movers (random_stream) -- or its
+    class, outside a model -- so a seeded run gives the same moves whatever
+    else the process has done.
+
+    If the spill container has no ids, the moves come from the C rand().
+    """
+    try:
+        ids = sc['id']
+    except KeyError:
+        return {}
+
+    uncertain = sc.uncertain
+
+    steps = mover.__dict__.setdefault('_random_steps', {})
+    step = steps.get(uncertain, 0)
+    steps[uncertain] = step + 1
+
+    if mover.random_stream is None:
+        name = type(mover).__name__
+    else:
+        name = mover.random_stream
+
+    return {'le_ids': np.ascontiguousarray(ids, dtype=np.uint32),
+            'seed': rand.get_seed(),
+            'step': step,
+            'stream': rand.stream_id(name, uncertain)}
 
 
 class RandomMoverSchema(ProcessSchema):
     diffusion_coef = SchemaNode(Float(), save=True, update=True, missing=drop)
     uncertain_factor = SchemaNode(Float(), save=True, update=True,
                                   missing=drop)
+    num_threads = SchemaNode(Int(), save=True, update=True, missing=drop)
     data_start = SchemaNode(LocalDateTime(), validator=convertible_to_seconds,
                             read_only=True)
     data_stop = SchemaNode(LocalDateTime(), validator=convertible_to_seconds,
@@ -38,6 +78,10 @@ class RandomMover(CyMover):
     """
     _schema = RandomMoverSchema
 
+    # the random streams are keyed by element id, so the moves don't
+    # change when only the elements in the water are passed
+    compact_elements = True
+
     def __init__(self, **kwargs):
         """
         Uses super to invoke base class __init__ method.
@@ -47,15 +91,20 @@ class RandomMover(CyMover):
         :param diffusion_coef: Diffusion coefficient for random diffusion.
             Default is 100,000 cm2/sec
         :param uncertain_factor: Uncertainty factor. Default is 2
+        :param num_threads: Number of threads the elements are split across
+            when computing the moves. Default is 1. The moves don't depend
+            on the number of threads.
 
         Remaining kwargs are passed onto :class:`gnome.movers.Mover` __init__
         using super.  See Mover documentation for remaining valid kwargs.
         """
         diffusion_coeff = kwargs.pop('diffusion_coef', 100000)
         uncertain_factor = kwargs.pop('uncertain_factor', 2)
+        num_threads = kwargs.pop('num_threads', 1)
 
         self.mover = CyRandomMover(diffusion_coef=diffusion_coeff,
-                                   uncertain_factor=uncertain_factor)
+                                   uncertain_factor=uncertain_factor,
+                                   num_threads=num_threads)
 
         super(RandomMover, self).__init__(**kwargs)
 
@@ -83,6 +132,23 @@ class RandomMover(CyMover):
     def uncertain_factor(self, value):
         self.mover.uncertain_factor = value
 
+    @property
+    def num_threads(self):
+        return self.mover.num_threads
+
+    @num_threads.setter
+    def num_threads(self, value):
+        self.mover.num_threads = value
+
+    def prepare_for_model_run(self):
+        super(RandomMover, self).prepare_for_model_run()
+
+        # the random streams start again
+        self._random_steps = {}
+
+    def get_move_kwargs(self, sc):
+        return element_streams(self, sc)
+
     def __repr__(self):
         return ('RandomMover(diffusion_coef={0}, uncertain_factor={1}, '
                 'active_range={2}, on={3})'
@@ -141,24 +207,21 @@ class IceAwareRandomMover(RandomMover):
         positions = sc['positions']
         deltas = np.zeros_like(positions)
 
-        cctn = (self.ice_concentration.at(positions, model_time_datetime,
-                                            extrapolate=True)
-                  .copy())
+        try:
+            key = sc.positions_key()
+        except AttributeError:
+            key = None
 
-        if np.any(cctn >= 0.2):
-            ice_mask = cctn >= 0.8
-            water_mask = cctn < 0.2
-            interp_mask = np.logical_and(cctn >= 0.2, cctn < 0.8)
-
-            ice_vel_factor = cctn.copy()
-            ice_vel_factor[ice_mask] = 0
-            ice_vel_factor[water_mask] = 1
-            ice_vel_factor[interp_mask] = 1 - ((ice_vel_factor[interp_mask] - 0.2) * 10) / 6
+        ice = self.ice_concentration.ice_state(positions,
+                                               model_time_datetime,
+                                               extrapolate=True, key=key)
 
+        if ice.any_ice:
             deltas = (super(IceAwareRandomMover, self)
                       .get_move(sc, time_step, model_time_datetime))
 
-            deltas *= ice_vel_factor
+            # full diffusion in open water, none in the ice
+            deltas *= 1 - ice.ice_factor
             deltas[status] = (0,0,0)
 
             return deltas
@@ -195,6 +258,8 @@ class RandomMover3D(CyMover):
     """
     _schema = RandomMover3DSchema
 
+    compact_elements = True
+
     def __init__(self, **kwargs):
         """
         Uses super to invoke base class __init__ method.
@@ -276,6 +341,15 @@ class RandomMover3D(CyMover):
     def surface_is_allowed(self, value):
         self.mover.surface_is_allowed = value
 
+    def prepare_for_model_run(self):
+        super(RandomMover3D, self).prepare_for_model_run()
+
+        # the random streams start again
+        self._random_steps = {}
+
+    def get_move_kwargs(self, sc):
+        return element_streams(self, sc)
+
     def __repr__(self):
         return ('RandomMover3D(vertical_diffusion_coef_above_ml={0}, '
                 'vertical_diffusion_coef_below_ml={1}, mixed_layer_depth={2}, '
@@ -163,7 +163,10 @@ class ShipDriftMover(Mover):
                                          sc['windage_range'][:, 1],
                                          sc['windages'],
                                          sc['windage_persist'],
-                                         time_step)
+                                         time_step,
+                                         **rand.element_keys(
+                                             sc, 'windages',
+                                             model_time_datetime))
 
     def prepare_data_for_get_move(self, sc, model_time_datetime):
         """
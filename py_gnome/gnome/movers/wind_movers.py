@@ -21,7 +21,7 @@ from gnome.cy_gnome.cy_gridwind_mover import CyGridWindMover
 from gnome.cy_gnome.cy_ice_wind_mover import CyIceWindMover
 
 from gnome.utilities.time_utils import sec_to_datetime
-from gnome.utilities.rand import random_with_persistance
+from gnome.utilities.rand import random_with_persistance, element_keys
 
 
 from gnome.environment import Wind, WindSchema
@@ -143,7 +143,9 @@ class WindMoversBase(CyMover):
                                     sc['windage_range'][:, 1],
                                     sc['windages'],
                                     sc['windage_persist'],
-                                    time_step)
+                                    time_step,
+                                    **element_keys(sc, 'windages',
+                                                   model_time_datetime))
 
     def get_move(self, sc, time_step, model_time_datetime):
         """
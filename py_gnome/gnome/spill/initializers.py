@@ -11,7 +11,7 @@ import numpy as np
 
 from colander import SchemaNode, Int, Float, Range, TupleSchema
 
-from gnome.utilities.rand import random_with_persistance
+from gnome.utilities.rand import random_with_persistance, element_keys
 from gnome.array_types import gat
 
 from gnome.cy_gnome.cy_rise_velocity_mover import rise_velocity_from_drop_size
@@ -123,7 +123,8 @@ class InitWindages(InitBaseClass):
         random_with_persistance(
             data_arrays['windage_range'][-num_new_particles:, 0],
             data_arrays['windage_range'][-num_new_particles:, 1],
-            data_arrays['windages'][-num_new_particles:]
+            data_arrays['windages'][-num_new_particles:],
+            **element_keys(data_arrays, 'windages', num=num_new_particles)
         )
 
 
@@ -7,6 +7,7 @@ set of arrays. The spills themselves provide some of the arrays themselves
 (adding more each time LEs are released).
 """
 import os
+import itertools
 from collections import namedtuple
 
 import numpy as np
@@ -40,6 +41,10 @@ from gnome.spill.substance import NonWeatheringSubstance
 #                                 's_id',
 #                                 'spills'])
 
+# unique ids for containers, for keying memos on their positions --
+# unlike id(), these are never reused.
+_container_ids = itertools.count()
+
 
 class FateDataView(AddLogger):
     _dicts_ = ('surface_weather', 'subsurf_weather', 'skim', 'burn',
@@ -222,6 +227,39 @@ class SpillContainerData(object):
         # to double
         self._array_allclose_atol = 0
 
+        self._container_id = next(_container_ids)
+        self._positions_version = 0
+
+    @property
+    def positions_version(self):
+        '''
+        A counter that goes up every time the positions of the elements
+        change
+        '''
+        return self._positions_version
+
+    def positions_changed(self):
+        '''
+        Bump the positions version.
+
+        The positions array is often changed in place, which the container
+        can't see -- code that does that (the model, when it moves the
+        elements) must call this afterward.
+        '''
+        self._positions_version += 1
+
+    def positions_key(self, *extra):
+        '''
+        A cheap key for memoizing results computed from the current
+        positions of the elements -- the same until the positions change.
+        Use it in place of hashing the positions array.
+
+        :param extra: anything else needed to identify the result, e.g.
+                      for arrays computed from the positions.
+        '''
+        return (('positions', self._container_id, self._positions_version) +
+                tuple(extra))
+
     def __contains__(self, item):
         return item in self._data_arrays
 
@@ -277,6 +315,9 @@ class SpillContainerData(object):
 
         self._data_arrays[data_name] = array
 
+        if data_name == 'positions':
+            self.positions_changed()
+
     def __eq__(self, other):
         'Compare equality of two SpillContanerData objects'
         if type(self) != type(other):
@@ -300,6 +341,9 @@ class SpillContainerData(object):
                 code to check equality for this
                 '''
                 pass
+            elif key == '_container_id' or key == '_positions_version':
+                # bookkeeping for memos, not data
+                pass
             elif val != other.__dict__[key]:
                 return False
 
@@ -367,6 +411,105 @@ class SpillContainerData(object):
         return self._data_arrays.keys()
 
 
+class ActiveElements(object):
+    """
+    The elements of a spill container that are moved in a time step -- the
+    ones in the water.
+
+    It stands in for the spill container in the get_move() of the movers
+    that can work on just those elements (Mover.compact_elements): the data
+    arrays are the ones of the active elements, compacted into contiguous
+    scratch arrays that are reused from step to step. An array is only
+    compacted when it is first asked for. Changes to the arrays are not
+    copied back to the spill container.
+    """
+    def __init__(self, sc):
+        """
+        :param sc: the SpillContainer
+        """
+        self.sc = sc
+        self.indices = np.zeros((0,), dtype=np.intp)
+        self.all_active = True
+
+        self._version = 0
+        self._arrays = {}
+        self._buffers = {}
+
+    def update(self):
+        """
+        find the active elements -- after the status codes, or the
+        positions, have changed.
+        """
+        in_water = self.sc['status_codes'] == oil_status.in_water
+
+        self.indices = np.flatnonzero(in_water)
+        self.all_active = len(self.indices) == len(in_water)
+
+        self._version += 1
+        self._arrays.clear()
+
+    def __len__(self):
+        return len(self.indices)
+
+    @property
+    def num_released(self):
+        return len(self.indices)
+
+    @property
+    def uncertain(self):
+        return self.sc.uncertain
+
+    def __contains__(self, item):
+        return item in self.sc
+
+    def keys(self):
+        return self.sc.keys()
+
+    def positions_key(self, *extra):
+        '''
+        like SpillContainer.positions_key(), for the active elements
+        '''
+        return self.sc.positions_key('active', self._version, *extra)
+
+    def __getitem__(self, data_name):
+        """
+        the data of the active elements
+
+        :raises KeyError: raised if the data is not there
+        """
+        try:
+            return self._arrays[data_name]
+        except KeyError:
+            pass
+
+        data = self.sc[data_name]
+        num = len(self.indices)
+
+        buf = self._buffers.get(data_name)
+        if (buf is None or len(buf) < num or buf.dtype != data.dtype or
+                buf.shape[1:] != data.shape[1:]):
+            size = num if buf is None else max(num, 2 * len(buf))
+            buf = np.empty((size,) + data.shape[1:], dtype=data.dtype)
+            self._buffers[data_name] = buf
+
+        array = buf[:num]
+        np.take(data, self.indices, axis=0, out=array)
+
+        self._arrays[data_name] = array
+
+        return array
+
+    def scatter_add(self, target, values):
+        """
+        add values, one for each active element, to their elements in target
+        -- an array of the spill container's (e.g. 'next_positions').
+        """
+        if self.all_active:
+            target += values
+        else:
+            target[self.indices] += values
+
+
 class SpillContainer(AddLogger, SpillContainerData):
     """
     Container class for all spills -- it takes care of capturing the released
@@ -397,6 +540,7 @@ class SpillContainer(AddLogger, SpillContainerData):
         # copy, cause we don't want to change the defaults!
         self._array_types = {}
         self._data_arrays = {}
+        self.positions_changed()
 
 
     def _reset__substances_spills(self):
@@ -936,6 +1080,10 @@ class SpillContainer(AddLogger, SpillContainerData):
 
             # reset fate_dataview at each step - do it after release elements
         self.reset_fate_dataview()
+
+        if total_rel > 0:
+            self.positions_changed()
+
         return total_rel
 
     def split_element(self, ix, num, l_frac=None):
@@ -973,6 +1121,7 @@ class SpillContainer(AddLogger, SpillContainerData):
         # update fate_dataview which contains this LE
         # for now we only have one type of substance
         self._fate_data_view._reset_fatedata(self, ix)
+        self.positions_changed()
 
     def model_step_is_done(self):
         '''
@@ -992,6 +1141,7 @@ class SpillContainer(AddLogger, SpillContainerData):
                 self._data_arrays[key] = np.delete(self[key], to_be_removed,
                                                    axis=0)
             self._fate_data_view.reset()
+            self.positions_changed()
 
     def __str__(self):
         return ('gnome.spill_container.SpillContainer\n'
@@ -0,0 +1,207 @@
+"""
+Spatial index for PolygonSet, part of the geometry package
+
+A uniform grid of "buckets" over the bounding boxes of the polygons in a
+PolygonSet. Each bucket holds the indexes of the polygons whose bounding
+box overlaps it, so a query only needs to touch the polygons in the
+buckets that it covers, rather than every polygon in the set.
+
+This is built lazily by PolygonSet -- you usually don't create one
+directly.
+"""
+
+import numpy as np
+
+from .cy_point_in_polygon import points_in_poly
+
+
+class PolygonGridIndex(object):
+    """
+    A uniform grid bucket index of polygon bounding boxes
+
+    The index is stored in compressed form: ``cell_start[c]`` to
+    ``cell_start[c + 1]`` are the range in ``cell_polys`` that holds the
+    polygon indexes for cell ``c``. Cells are numbered row-major:
+    ``c = j * nx + i``.
+    """
+    # upper limit for the number of cells on a side, to keep the index small
+    max_cells_per_side = 1024
+
+    def __init__(self, points, index, cells_per_side=None):
+        """
+        :param points: all the vertices in the PolygonSet
+        :type points: Nx2 numpy array of float64
+
+        :param index: the PolygonSet index array: polygon i is
+                      points[index[i]:index[i + 1]]
+        :type index: (num_polys + 1,) numpy array of ints
+
+        :param cells_per_side=None: number of grid cells on each side. If
+                                    None, it is set to about the square root
+                                    of the number of polygons, so there is
+                                    on the order of one polygon per cell.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 2))
+        index = np.asarray(index, dtype=np.int64)
+
+        self.num_polys = len(index) - 1
+
+        starts = index[:-1]
+        ends = index[1:]
+        # polygons with no points can't contain anything -- leave them out
+        self.poly_ids = np.nonzero(ends > starts)[0]
+
+        self.bboxes = np.empty((self.num_polys, 2, 2), dtype=np.float64)
+        self.bboxes.fill(np.nan)
+
+        if len(self.poly_ids) == 0:
+            self.extent = None
+            self.nx = self.ny = 0
+            self.cell_start = np.zeros((1,), dtype=np.int64)
+            self.cell_polys = np.zeros((0,), dtype=np.int64)
+            return
+
+        # empty polygons take up no points, so reducing over the starts of
+        # the non-empty ones gives exactly one polygon per segment
+        valid_starts = starts[self.poly_ids]
+        points = points[:index[-1]]
+        self.bboxes[self.poly_ids, 0] = np.minimum.reduceat(points,
+                                                            valid_starts,
+                                                            axis=0)
+        self.bboxes[self.poly_ids, 1] = np.maximum.reduceat(points,
+                                                            valid_starts,
+                                                            axis=0)
+
+        bbs = self.bboxes[self.poly_ids]
+        self.extent = np.array((bbs[:, 0].min(axis=0), bbs[:, 1].max(axis=0)))
+
+        if cells_per_side is None:
+            cells_per_side = int(np.sqrt(len(self.poly_ids)))
+        cells_per_side = max(1, min(int(cells_per_side),
+                                    self.max_cells_per_side))
+        self.nx = self.ny = cells_per_side
+
+        size = self.extent[1] - self.extent[0]
+        # zero-sized extent (a single point, or a line) still needs a cell
+        size[size == 0.0] = 1.0
+        self.cell_size = size / (self.nx, self.ny)
+
+        lo = self._cell_coords(bbs[:, 0])
+        hi = self._cell_coords(bbs[:, 1])
+
+        # expand every polygon to the cells its bounding box covers
+        span_x = hi[:, 0] - lo[:, 0] + 1
+        span_y = hi[:, 1] - lo[:, 1] + 1
+        counts = span_x * span_y
+        owner = np.repeat(np.arange(len(self.poly_ids)), counts)
+        offset = (np.arange(counts.sum()) -
+                  np.repeat(np.cumsum(counts) - counts, counts))
+        ci = lo[owner, 0] + offset % span_x[owner]
+        cj = lo[owner, 1] + offset // span_x[owner]
+        cells = cj * self.nx + ci
+
+        order = np.argsort(cells, kind='mergesort')
+        self.cell_polys = self.poly_ids[owner[order]]
+        self.cell_start = np.searchsorted(cells[order],
+                                          np.arange(self.nx * self.ny + 1))
+
+    def _cell_coords(self, xy):
+        """
+        (i, j) cell coordinates of the points in xy, clipped to the grid
+        """
+        ij = np.floor((xy - self.extent[0]) / self.cell_size).astype(np.int64)
+        ij[:, 0] = np.clip(ij[:, 0], 0, self.nx - 1)
+        ij[:, 1] = np.clip(ij[:, 1], 0, self.ny - 1)
+
+        return ij
+
+    def _in_extent(self, xy):
+        return ((xy[:, 0] >= self.extent[0, 0]) &
+                (xy[:, 0] <= self.extent[1, 0]) &
+                (xy[:, 1] >= self.extent[0, 1]) &
+                (xy[:, 1] <= self.extent[1, 1]))
+
+    def candidates_in_bbox(self, bbox):
+        """
+        indexes of the polygons whose bounding box overlaps the given one
+
+        :param bbox: ((min_x, min_y), (max_x, max_y))
+
+        :returns: sorted array of polygon indexes
+        """
+        if self.extent is None:
+            return np.zeros((0,), dtype=np.int64)
+
+        bbox = np.asarray(bbox, dtype=np.float64).reshape((2, 2))
+
+        if (bbox[1, 0] < self.extent[0, 0] or bbox[0, 0] > self.extent[1, 0] or
+                bbox[1, 1] < self.extent[0, 1] or
+                bbox[0, 1] > self.extent[1, 1]):
+            return np.zeros((0,), dtype=np.int64)
+
+        (i0, j0), (i1, j1) = self._cell_coords(bbox)
+        found = [self.cell_polys[self.cell_start[j * self.nx + i0]:
+                                 self.cell_start[j * self.nx + i1 + 1]]
+                 for j in range(j0, j1 + 1)]
+        candidates = np.unique(np.concatenate(found))
+
+        # buckets are coarse -- check the actual bounding boxes
+        bbs = self.bboxes[candidates]
+        overlap = ((bbs[:, 1, 0] >= bbox[0, 0]) &
+                   (bbs[:, 0, 0] <= bbox[1, 0]) &
+                   (bbs[:, 1, 1] >= bbox[0, 1]) &
+                   (bbs[:, 0, 1] <= bbox[1, 1]))
+
+        return candidates[overlap]
+
+    def points_in_polygons(self, polygon_set, points):
+        """
+        which polygon of the set, if any, each point is in
+
+        :param polygon_set: the PolygonSet this index was built from
+        :param points: the points to test
+        :type points: Nx3 numpy array of (x, y, z) floats
+
+        :returns: (N,) array of polygon indexes, -1 where the point is not
+                  in any polygon. If polygons overlap, the last one in the
+                  set wins.
+        """
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape((-1, 3))
+        result = np.empty((len(points),), dtype=np.int64)
+        result.fill(-1)
+
+        if self.extent is None or len(points) == 0:
+            return result
+
+        inside = np.nonzero(self._in_extent(points))[0]
+        if len(inside) == 0:
+            return result
+
+        cells = self._cell_coords(points[inside, :2])
+        cells = cells[:, 1] * self.nx + cells[:, 0]
+
+        # group the points by cell so each candidate polygon is tested
+        # once against all the points in the cell
+        order = np.argsort(cells, kind='mergesort')
+        cells = cells[order]
+        inside = inside[order]
+        bounds = np.r_[0, np.nonzero(np.diff(cells))[0] + 1, len(cells)]
+
+        for b in range(len(bounds) - 1):
+            cell = cells[bounds[b]]
+            idx = inside[bounds[b]:bounds[b + 1]]
+            pts = points[idx]
+
+            for p in self.cell_polys[self.cell_start[cell]:
+                                     self.cell_start[cell + 1]]:
+                bb = self.bboxes[p]
+                in_bb = ((pts[:, 0] >= bb[0, 0]) & (pts[:, 0] <= bb[1, 0]) &
+                         (pts[:, 1] >= bb[0, 1]) & (pts[:, 1] <= bb[1, 1]))
+                if not in_bb.any():
+                    continue
+
+                poly = np.ascontiguousarray(polygon_set[p], dtype=np.float64)
+                hits = points_in_poly(poly, pts[in_bb])
+                result[idx[in_bb][hits]] = p
+
+        return result
@@ -12,6 +12,7 @@ import copy
 import numpy as np
 
 import BBox
+from .polygon_index import PolygonGridIndex
 
 
 class Polygon(np.ndarray):
@@ -206,6 +207,7 @@ class PolygonSet(object):
             self._PointsArray = np.array(data[0])
             self._IndexArray = np.array(data[1])
             self._MetaDataList = np.array(data[2])
+        self._spatial_index = None
 
     def append(self, polygon, metadata=None):
 
@@ -235,6 +237,7 @@ class PolygonSet(object):
         self._IndexArray.resize((self._IndexArray.shape[0] + 1))
         self._IndexArray[-1] = self._PointsArray.shape[0]
         self._MetaDataList.append(metadata)
+        self._spatial_index = None
 
     def _get_bounding_box(self):
         if len(self._PointsArray) > 0:
@@ -249,6 +252,47 @@ class PolygonSet(object):
 
     total_num_points = property(_get_total_num_points)
 
+    @property
+    def spatial_index(self):
+        """
+        A PolygonGridIndex of the polygon bounding boxes
+
+        Built on first use, and thrown away when the polygons change
+        """
+        if self._spatial_index is None:
+            self._spatial_index = PolygonGridIndex(self._PointsArray,
+                                                   self._IndexArray)
+        return self._spatial_index
+
+    def polygons_in_bbox(self, bbox):
+        """
+        Returns the indexes of the polygons whose bounding boxes overlap
+        the passed-in bounding box
+
+        :param bbox: ((min_x, min_y), (max_x, max_y)) -- a BBox works
+        """
+        return self.spatial_index.candidates_in_bbox(bbox)
+
+    def points_in_polygons(self, points):
+        """
+        Returns the index of the polygon each point is in, -1 if it is
+        not in any of them
+
+        :param points: the points to test
+        :type points: Nx3 numpy array of (x, y, z) floats
+        """
+        return self.spatial_index.points_in_polygons(self, points)
+
+    def points_in_any(self, points):
+        """
+        Returns a boolean array: True for the points that are in any of
+        the polygons in the set
+
+        :param points: the points to test
+        :type points: Nx3 numpy array of (x, y, z) floats
+        """
+        return self.points_in_polygons(points) >= 0
+
     def GetPointsData(self):
         """
         returns a copy of the points and indexes arrays
@@ -290,6 +334,7 @@ class PolygonSet(object):
             self._DataArray = MetaData
         else:
             self._DataArray = [None] * len(self.PointsArray)
+        self._spatial_index = None
 
     def Copy(self):
         """
@@ -322,6 +367,7 @@ class PolygonSet(object):
         """
         self._PointsArray = TransformFunction(self._PointsArray, *args,
                                               **kwargs)
+        self._spatial_index = None
 
     def __len__(self):
         # there is an extra index at the end, so that IndexArray[i+1] works
@@ -391,14 +437,105 @@ class PolygonSet(object):
               Perhaps it would be better for the mean location of the
               sequence to be used instead? It should make no difference
               for rendering, but could make a difference for other purposes
+
+        This gives the same results as Polygon.thin() on each polygon, but
+        works on the whole points array at once, rather than point by point.
         """
         new_polys = PolygonSet()
-        for poly in self:
-            poly = poly.thin(scale)
-            if len(poly):
-                new_polys.append(poly)
+        points = np.asarray(self._PointsArray, dtype=np.float64)
+        starts = self._IndexArray[:-1]
+        ends = self._IndexArray[1:]
+
+        if len(points) == 0:
+            return new_polys
+
+        sc_points = self._scaled_points(points, scale)
+
+        # keep the first point of each polygon, and any point that
+        # doesn't land on the same pixel as the one before it.
+        keep = np.ones((len(points),), dtype=np.bool)
+        keep[1:] = np.any(sc_points[1:] != sc_points[:-1], axis=1)
+
+        not_empty = ends > starts
+        keep[starts[not_empty]] = True
+
+        # if first and last point are the same, that property is preserved:
+        # the closing point is dropped here and put back after thinning
+        closed = np.zeros((len(self),), dtype=np.bool)
+        closed[not_empty] = np.all(points[starts[not_empty]] ==
+                                   points[ends[not_empty] - 1], axis=1)
+        keep[ends[closed] - 1] = False
+
+        poly_ids = np.repeat(np.arange(len(self)), ends - starts)
+        counts = np.bincount(poly_ids[keep], minlength=len(self))
+
+        # polygons reduced to 1 point are removed.
+        valid = counts > 1
+        if not valid.any():
+            return new_polys
+
+        keep &= valid[poly_ids]
+        new_points = points[keep]
+
+        counts = counts[valid]
+        closed = closed[valid]
+        first_points = new_points[np.r_[0, np.cumsum(counts)[:-1]]]
+        new_points = np.insert(new_points,
+                               np.cumsum(counts)[closed],
+                               first_points[closed],
+                               axis=0)
+        counts += closed
+
+        new_polys._PointsArray = new_points
+        new_polys._IndexArray = np.r_[0, np.cumsum(counts)].astype(np.int)
+        new_polys._MetaDataList = [self._MetaDataList[i]
+                                   for i in np.nonzero(valid)[0]]
+
         return new_polys
 
+    @staticmethod
+    def _scaled_points(points, scale):
+        """
+        the points scaled and rounded to (integer) pixels
+        """
+        return np.round(points * np.asarray(scale, dtype=np.float64))
+
+    def is_clockwise(self):
+        """
+        Returns a boolean array: True for each polygon that is clockwise
+        ordered.
+
+        Same result as geometry.is_clockwise() on each polygon (i.e.
+        computed from the signed area), but computed for the whole set in
+        one pass over the points array.
+        """
+        points = np.asarray(self._PointsArray, dtype=np.float64)
+        starts = self._IndexArray[:-1]
+        ends = self._IndexArray[1:]
+
+        if len(points) == 0:
+            return np.ones((len(self),), dtype=np.bool)
+
+        x = points[:, 0]
+        y = points[:, 1]
+        poly_ids = np.repeat(np.arange(len(self)), ends - starts)
+
+        # each point to the next one, not counting the step from the last
+        # point of one polygon to the first of the next
+        cross = x[:-1] * y[1:] - x[1:] * y[:-1]
+        same_poly = poly_ids[:-1] == poly_ids[1:]
+        total = np.bincount(poly_ids[:-1][same_poly],
+                            weights=cross[same_poly],
+                            minlength=len(self))
+
+        # last point to first point
+        not_empty = ends > starts
+        first = starts[not_empty]
+        last = ends[not_empty] - 1
+        total[not_empty] += x[last] * y[first] - x[first] * y[last]
+
+        return total <= 0
+
 
 # def test():
 #     #  a test function
@@ -3,13 +3,139 @@ rand.py
 
 Contains functions for adding randomness - not to
 confuse with standard python random functions
+
+The random movers and the windages draw from a counter-based generator
+(Philox4x32-10, Salmon et al. 2011): the numbers for an element are a
+function of (seed, element id, step, stream), so they don't depend on the
+order the elements are processed in, or on how they are split across
+threads or processes.
 """
 
+import zlib
+
 import numpy as np
 
 from gnome.cy_gnome import cy_helpers
+from gnome.utilities.time_utils import date_to_sec
 import random
 
+# seed of the counter-based generator -- set by seed()
+_counter_seed = 1
+
+# Philox4x32 multipliers and Weyl key increments
+_philox_m = (np.uint64(0xD2511F53), np.uint64(0xCD9E8D57))
+_philox_w = (0x9E3779B9, 0xBB67AE85)
+
+_mask32 = np.uint64(0xFFFFFFFF)
+_shift32 = np.uint64(32)
+
+
+def philox(counter, key, rounds=10):
+    """
+    The Philox4x32 block function, on arrays of counters
+
+    :param counter: four 32 bit words -- ints or arrays, broadcast together
+    :param key: two 32 bit words
+    :param rounds=10: number of rounds
+
+    :returns: uint32 array, of shape (4,) + the shape of the counters
+    """
+    c0, c1, c2, c3 = np.broadcast_arrays(*[np.asarray(c, dtype=np.uint64) &
+                                           _mask32 for c in counter])
+    k0, k1 = int(key[0]) & 0xFFFFFFFF, int(key[1]) & 0xFFFFFFFF
+
+    for _r in range(rounds):
+        p0 = _philox_m[0] * c0
+        p1 = _philox_m[1] * c2
+
+        c0, c1, c2, c3 = ((p1 >> _shift32) ^ c1 ^ np.uint64(k0),
+                          p1 & _mask32,
+                          (p0 >> _shift32) ^ c3 ^ np.uint64(k1),
+                          p0 & _mask32)
+
+        k0 = (k0 + _philox_w[0]) & 0xFFFFFFFF
+        k1 = (k1 + _philox_w[1]) & 0xFFFFFFFF
+
+    return np.array([c0, c1, c2, c3], dtype=np.uint32)
+
+
+def stream_id(*names):
+    """
+    A 32 bit stream number for names (e.g. a mover's name, and whether the
+    spill is uncertain) -- the same in every run.
+    """
+    return zlib.crc32('/'.join(str(n) for n in names)) & 0xFFFFFFFF
+
+
+def get_seed():
+    """
+    The seed of the counter-based generator
+    """
+    return _counter_seed
+
+
+def uniforms(ids, step, stream, num=4, seed=None):
+    """
+    Uniform random numbers in [0, 1), num for each element -- the same as
+    the C++ RandomStream draws, in order, for the same arguments.
+
+    :param ids: element ids -- the 'id' data array
+    :param step: the step -- the model time in seconds, or a count of
+                 the draws
+    :param stream: stream number, from stream_id()
+    :param num=4: number of values for each element
+    :param seed=None: the seed -- the one set by seed() if None
+
+    :returns: array of shape (len(ids), num)
+    """
+    if seed is None:
+        seed = _counter_seed
+
+    ids = np.asarray(ids)
+    key = (seed & 0xFFFFFFFF, (seed >> 32) & 0xFFFFFFFF)
+
+    # four numbers per block, the last counter word numbers the blocks
+    blocks = [philox((ids, step, stream, b), key)
+              for b in range((num + 3) // 4)]
+    words = np.concatenate(blocks, axis=0)[:num].T
+
+    # 24 bits, the precision of a (C) float
+    return (words >> 8) * (1.0 / 2 ** 24)
+
+
+def element_keys(data_arrays, name, model_time=None, num=None):
+    """
+    The keyword arguments of random_with_persistance() that key the values
+    of the elements on their ids, the model time and name (and whether the
+    spill is uncertain). Empty, if there are no element ids.
+
+    :param data_arrays: the spill container, or a dict of data arrays
+    :param name: name of the values, e.g. 'windages'
+    :param model_time=None: the model time (datetime) -- step 0 if None
+    :param num=None: only the last num elements -- the ones just released
+    """
+    if 'id' not in data_arrays:
+        return {}
+
+    ids = data_arrays['id']
+    if num is not None:
+        ids = ids[len(ids) - num:]
+
+    step = 0 if model_time is None else int(date_to_sec(model_time))
+    uncertain = getattr(data_arrays, 'uncertain', False)
+
+    return {'ids': ids,
+            'step': step,
+            'stream': stream_id(name, uncertain)}
+
+
+def _uniform(low, high, ids, step, stream):
+    # from numpy's global generator, if there are no element ids
+    if ids is None:
+        return np.random.uniform(low, high)
+
+    return low + (high - low) * uniforms(ids, step, stream, 1)[:, 0]
+
 
 def random_with_persistance(
     low,
@@ -17,6 +143,9 @@ def random_with_persistance(
     array=None,  # update this array, if provided
     persistence=None,
     time_step=1.,
+    ids=None,
+    step=0,
+    stream=0,
     ):
     """
     Used by gnome to generate a randomness between low and high, which is
@@ -33,6 +162,13 @@ def random_with_persistance(
         size of time_step. Default is None. If persistence is None, it gets set
         equal to 'time_step'. If persistence < 0 for any elements, their values
         are not updated in the 'array'
+    :param ids: element ids. If given, the values come from the
+        counter-based generator, keyed by ids, step and stream. Otherwise
+        they come from numpy's global generator.
+    :param step: the step for the counter-based generator -- the model
+        time in seconds
+    :param stream: stream number for the counter-based generator, from
+        stream_id()
 
     :returns: returns 'array' with newly computed values
 
@@ -50,6 +186,9 @@ def random_with_persistance(
     low = np.copy(low)
     high = np.copy(high)
 
+    if ids is not None:
+        ids = np.asarray(ids)
+
     if array is None:
         array = np.zeros(len(low,), dtype=float)
     else:
@@ -81,7 +220,7 @@ def random_with_persistance(
         if persistence == time_step, then no need to scale the [low, high]
         interval
         """
-        array[:] = np.random.uniform(low, high)
+        array[:] = _uniform(low, high, ids, step, stream)
     else:
         """
         if persistence == time_step, then no need to scale the [low, high]
@@ -111,18 +250,23 @@ def random_with_persistance(
                 low[u_mask] = mean - l__range / 2.
                 high[u_mask] = mean + l__range / 2.
 
-            array[u_mask] = np.random.uniform(low[u_mask], high[u_mask])
+            array[u_mask] = _uniform(low[u_mask], high[u_mask],
+                                     None if ids is None else ids[u_mask],
+                                     step, stream)
 
     return array
 
 
 def seed(seed=1):
     """
-    Set the C++, the python and the numpy random seed to desired value
+    Set the C++, the python, the numpy and the counter-based random seed to
+    desired value
 
     :param seed: Random number generator should be seeded by this value.
         Default is 1
     """
+    global _counter_seed
+    _counter_seed = int(seed)
 
     cy_helpers.srand(seed)
     random.seed(seed)
@@ -1,4 +1,5 @@
 import datetime
+from collections import OrderedDict
 
 import numpy as np
 
@@ -11,6 +12,7 @@ from gnome.utilities.time_utils import (zero_time,
 from gnome.utilities.convert import (to_time_value_pair,
                                      tsformat,
                                      to_datetime_value_2d)
+from gnome.utilities.transforms import uv_to_r_theta_wind
 from gnome.persist.base_schema import ObjTypeSchema
 
 
@@ -24,6 +26,9 @@ class TimeseriesError(Exception):
 class Timeseries(GnomeId):
     _schema = ObjTypeSchema
 
+    # number of times for which get_values() results are kept
+    _memo_size = 8
+
     def __init__(self, timeseries=None, filename=None, coord_sys='uv',
                  extrapolation_is_allowed=False, **kwargs):
         """
@@ -105,6 +110,7 @@ class Timeseries(GnomeId):
             self.ossm = CyTimeseries(filename=self._filename,
                                      file_format=ts_format)
 
+        self._clear_interp_cache()
         self.extrapolation_is_allowed = extrapolation_is_allowed
 
     def _check_timeseries(self, timeseries):
@@ -221,6 +227,121 @@ class Timeseries(GnomeId):
     @extrapolation_is_allowed.setter
     def extrapolation_is_allowed(self, value):
         self.ossm.extrapolation_is_allowed = value
+        self._value_memo = OrderedDict()
+
+    def _set_ossm_timeseries(self, time_value_pair):
+        '''
+        set the data in the C++ object -- always use this, so the data used
+        by get_values() are updated too
+        '''
+        self.ossm.timeseries = time_value_pair
+        self._clear_interp_cache()
+
+    def _clear_interp_cache(self):
+        self._interp_table = None
+        self._value_memo = OrderedDict()
+
+    def _get_interp_table(self):
+        '''
+        the data of the C++ object as float arrays: times in seconds, and
+        an Nx2 array of (u, v)
+        '''
+        if self._interp_table is None:
+            timeval = self.ossm.timeseries
+
+            self._interp_table = (timeval['time'].astype(np.float64),
+                                  np.column_stack((timeval['value']['u'],
+                                                   timeval['value']['v'])))
+
+        return self._interp_table
+
+    def _out_of_range(self, datetime):
+        msg = ('No available data in the time interval that is being '
+               'modeled\n'
+               '\tModel time: {}\n'
+               '\tMover: {} of type {}\n'
+               .format(datetime, self.name, self.__class__))
+
+        self.logger.error(msg)
+        return RuntimeError(msg)
+
+    def interpolate(self, seconds):
+        '''
+        The (u, v) values at the given times, interpolated the way the C++
+        object does it (linearly, holding the end values if extrapolation
+        is allowed), but for all the times at once.
+
+        :param seconds: time, or array of times, in seconds
+        :returns: Nx2 array of (u, v) -- in the units the C++ object has
+
+        Raises a RuntimeError for a time outside of the data if
+        extrapolation is not allowed.
+        '''
+        times, values = self._get_interp_table()
+        seconds = np.asarray(seconds, dtype=np.float64).reshape(-1)
+
+        if len(times) == 0:
+            raise self._out_of_range(sec_to_date(seconds))
+
+        if len(times) == 1:
+            # a constant
+            return np.repeat(values, len(seconds), axis=0)
+
+        if self.extrapolation_is_allowed:
+            seconds = np.clip(seconds, times[0], times[-1])
+        elif np.any((seconds < times[0]) | (seconds > times[-1])):
+            raise self._out_of_range(sec_to_date(seconds))
+
+        # the interval each time is in -- the last time is in the last one
+        idx = np.clip(np.searchsorted(times, seconds, side='right'),
+                      1, len(times) - 1)
+
+        t0 = times[idx - 1]
+        weight = ((seconds - t0) / (times[idx] - t0)).reshape(-1, 1)
+
+        return (1.0 - weight) * values[idx - 1] + weight * values[idx]
+
+    def get_values(self, datetime, coord_sys='uv'):
+        '''
+        The values at the given time(s), like get_timeseries(datetime,
+        coord_sys)['value'], without the round trip through the C++ object
+        and the datetime_value_2d array.
+
+        The results for a single time are kept, so asking again, e.g. for
+        each substep of a model step, is cheap.
+
+        :param datetime: datetime object, or list of datetime objects
+        :param coord_sys='uv': 'uv' or 'r-theta'
+
+        :returns: Nx2 array of values. Don't change it: it may be the one
+                  that is kept for the next call.
+        '''
+        if isinstance(coord_sys, basestring):
+            coord_sys = tsformat(coord_sys)
+
+        try:
+            key = (datetime, coord_sys)
+            return self._value_memo[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # not hashable -- e.g. a list of times
+            key = None
+
+        times = np.asarray(datetime, dtype='datetime64[s]').reshape(-1)
+        values = self.interpolate(date_to_sec(times))
+
+        if coord_sys == basic_types.ts_format.magnitude_direction:
+            values = uv_to_r_theta_wind(values)
+
+        if key is not None and len(values) == 1:
+            values.flags.writeable = False
+
+            self._value_memo[key] = values
+            while len(self._value_memo) > self._memo_size:
+                self._value_memo.popitem(last=False)
+
+        return values
 
     def get_timeseries(self, datetime=None, coord_sys='uv'):
         """
@@ -256,14 +377,7 @@ class Timeseries(GnomeId):
             (timeval['value'], err) = self.ossm.get_time_value(timeval['time'])
 
             if err != 0:
-                msg = ('No available data in the time interval that is being '
-                       'modeled\n'
-                       '\tModel time: {}\n'
-                       '\tMover: {} of type {}\n'
-                       .format(datetime, self.name, self.__class__))
-
-                self.logger.error(msg)
-                raise RuntimeError(msg)
+                raise self._out_of_range(datetime)
 
             datetimeval = to_datetime_value_2d(timeval, coord_sys)
 
@@ -293,4 +407,4 @@ class Timeseries(GnomeId):
         datetime_value_2d = self._xform_input_timeseries(datetime_value_2d)
         timeval = to_time_value_pair(datetime_value_2d, coord_sys)
 
-        self.ossm.timeseries = timeval
\ No newline at end of file
+        self._set_ossm_timeseries(timeval)
\ No newline at end of file
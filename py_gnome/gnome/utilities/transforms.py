@@ -88,7 +88,7 @@ def uv_to_r_theta_wind(uv):
 
     uv = np.asarray(uv, dtype=np.float64).reshape(-1, 2)
     r_theta = np.zeros_like(uv)
-    r_theta[:, 0] = np.apply_along_axis(np.linalg.norm, 1, uv)
+    r_theta[:, 0] = np.hypot(uv[:, 0], uv[:, 1])
 
     # NOTE: Since desired angle is different from the angle that arctan2 outputs;
     #      the uv array is transformed (multiply by -1) and atan2 is called with (u,v)
@@ -103,6 +103,14 @@ class Weatherer(Process):
         '''
             Wrapper for the weatherers so they can get wind speeds
         '''
+        waves = getattr(self, 'waves', None)
+
+        if waves is not None and waves.wind is self.wind:
+            # the waves keep the wind speeds for the time step
+            return waves.get_wind_speed(points, model_time,
+                                        coord_sys=coord_sys,
+                                        fill_value=fill_value)
+
         retval = self.wind.at(points, model_time, coord_sys=coord_sys)
 
         if isinstance(retval, np.ma.MaskedArray):
@@ -326,6 +326,7 @@ macros = [('pyGNOME', 1), ]
 
 # suppressing certain warnings
 compile_args = ["-Wno-unused-function",  # unused function - cython creates a lot
+                "-std=c++11",  # std::thread in lib_gnome (darwin builds it here)
                 ]
 
 extensions = []
@@ -424,7 +425,10 @@ elif sys.platform == "linux2":
                                  cpp_files,
                                  language='c++',
                                  define_macros=macros,
-                                 libraries=['netcdf'],
+                                 # else gcc < 6 builds lib_gnome without
+                                 # std::thread: get_move runs in one thread
+                                 extra_compile_args=['-std=c++11'],
+                                 libraries=['netcdf', 'pthread'],
                                  include_dirs=[cpp_code_dir],
                                  )])
 
@@ -0,0 +1,145 @@
+"""
+tests for the pool of open netCDF datasets
+"""
+
+import os
+import sys
+import gc
+
+import pytest
+import netCDF4 as nc4
+
+from gnome.environment.dataset_pool import DatasetPool
+
+
+class User(object):
+    """
+    stands in for an environment object using a dataset
+    """
+    pass
+
+
+@pytest.fixture
+def nc_files(tmpdir):
+    filenames = []
+
+    for i in range(3):
+        fn = str(tmpdir.join('data_{0}.nc'.format(i)))
+
+        ds = nc4.Dataset(fn, 'w')
+        ds.createDimension('x', 4)
+        ds.createVariable('x', 'f8', ('x',))[:] = range(4)
+        ds.close()
+
+        filenames.append(fn)
+
+    return filenames
+
+
+def test_shared(nc_files):
+    pool = DatasetPool()
+    fn = nc_files[0]
+
+    ds = pool.get_dataset(fn)
+
+    assert pool.get_dataset(fn) is ds
+    assert pool.get_dataset(os.path.relpath(fn)) is ds
+    assert pool.get_dataset([fn]) is ds
+    assert fn in pool and len(pool) == 1
+
+    # a dataset passed in is just returned
+    assert pool.get_dataset(nc_files[1], dataset=ds) is ds
+    assert len(pool) == 1
+
+    pool.clear()
+
+
+def test_reopen_closed(nc_files):
+    pool = DatasetPool()
+
+    ds = pool.get_dataset(nc_files[0])
+    ds.close()
+
+    ds2 = pool.get_dataset(nc_files[0])
+
+    assert ds2 is not ds
+    assert ds2.isopen()
+
+    pool.clear()
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'),
+                    reason="an open file can't be replaced on Windows")
+def test_reopen_changed(nc_files, tmpdir):
+    pool = DatasetPool()
+    fn = nc_files[0]
+
+    ds = pool.get_dataset(fn)
+
+    # a new version of the file, put in its place
+    new = str(tmpdir.join('new.nc'))
+
+    new_ds = nc4.Dataset(new, 'w')
+    new_ds.createDimension('x', 8)
+    new_ds.createVariable('x', 'f8', ('x',))[:] = range(8)
+    new_ds.close()
+
+    os.rename(new, fn)
+
+    ds2 = pool.get_dataset(fn)
+
+    # the old one was not in use, so it was closed
+    assert ds2 is not ds
+    assert not ds.isopen()
+    assert len(ds2.variables['x']) == 8
+    assert len(pool) == 1
+
+    assert pool.get_dataset(fn) is ds2
+
+    pool.clear()
+
+
+def test_refcount(nc_files):
+    pool = DatasetPool()
+    fn = nc_files[0]
+
+    user1, user2 = User(), User()
+    pool.attach(user1, fn)
+    pool.attach(user2, fn)
+    pool.attach(user2, fn)
+
+    assert pool.refcount(fn) == 2
+
+    pool.detach(user1, fn)
+    assert pool.refcount(fn) == 1
+
+    del user2
+    gc.collect()
+
+    assert pool.refcount(fn) == 0
+
+
+def test_max_open(nc_files):
+    pool = DatasetPool(max_open=2)
+
+    user = User()
+    in_use = pool.get_dataset(nc_files[0])
+    pool.attach(user, nc_files[0])
+
+    unused = pool.get_dataset(nc_files[1])
+    pool.get_dataset(nc_files[2])
+
+    # the least recently used one that is not in use was closed
+    assert len(pool) == 2
+    assert in_use.isopen()
+    assert not unused.isopen()
+    assert nc_files[1] not in pool
+
+    # once it's not used any more, it can be closed
+    del user
+    gc.collect()
+
+    assert len(pool) == 2
+    pool.close_unused()
+    assert len(pool) == 0
+    assert not in_use.isopen()
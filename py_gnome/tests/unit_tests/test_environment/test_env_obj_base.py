@@ -11,6 +11,7 @@ import unit_conversion as uc
 from gnome.environment.gridded_objects_base import (Variable,
                                                     VectorVariable,
                                                     PyGrid,
+                                                    Grid_S,
                                                     Time)
 from gnome.environment.timeseries_objects_base import (TimeseriesData,
                                                        TimeseriesVector)
@@ -460,6 +461,35 @@ class TestGridVectorProp:
         assert gvp.units == 'm/s'
         assert gvp.varnames[0] == 'u_rho'
 
+    def test_get_data_vectors(self):
+        ds = circular_3D
+        grid = Grid_S(node_lon=ds['x'][:], node_lat=ds['y'][:])
+        time = Time(nc.num2date(ds['time'][:], ds['time'].units))
+
+        u = Variable(name='u', units='m/s', time=time, grid=grid,
+                     data=ds['tvx'])
+        v = Variable(name='v', units='m/s', time=time, grid=grid,
+                     data=ds['tvy'])
+        gvp = VectorVariable(name='velocity', units='m/s', time=time,
+                             grid=grid, variables=[u, v])
+
+        vectors = gvp.get_data_vectors()
+        assert vectors.shape == (2, 11, 61 * 61)
+        assert vectors.dtype == np.float32
+        assert np.allclose(vectors[0, 4], ds['tvx'][4].reshape(-1))
+
+        # kept
+        assert gvp.get_data_vectors() is vectors
+
+        # only the time slices asked for
+        assert np.array_equal(gvp.get_data_vectors(3), vectors[:, 3:4])
+        assert np.array_equal(gvp.get_data_vectors(slice(2, 5)),
+                              vectors[:, 2:5])
+
+        q, scale = gvp.get_data_vectors(quantize=True)
+        assert q.dtype == np.int16
+        assert np.allclose(q * scale, vectors, rtol=0, atol=scale)
+
     # def test_at(self):
     #     curr_file = os.path.join(s_data, 'staggered_sine_channel.nc')
     #     gvp = VectorVariable.from_netCDF(filename=curr_file,
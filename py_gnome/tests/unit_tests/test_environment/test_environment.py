@@ -205,3 +205,94 @@ def test_properties_in_si(attr, unit, val, exp_si):
     assert w.units[attr] == unit
 
     assert w.get(attr) == exp_si
+
+
+class FakeVar(object):
+    def __init__(self, dimensions, standard_name=None):
+        self.dimensions = dimensions
+        if standard_name is not None:
+            self.standard_name = standard_name
+
+
+class FakeDataset(object):
+    def __init__(self, **variables):
+        self.variables = variables
+
+
+def test_match_env_classes():
+    from gnome.environment.environment import match_env_classes
+    from gnome.environment import (GridCurrent, GridWind, GridTemperature,
+                                   IceConcentration, IceAwareCurrent)
+
+    dims = ('time', 'y', 'x')
+    ds = FakeDataset(water_u=FakeVar(dims),
+                     water_v=FakeVar(dims),
+                     t=FakeVar(dims,
+                               standard_name='sea_water_temperature'),
+                     # not gridded, so not a match
+                     air_u=FakeVar(('time',)),
+                     air_v=FakeVar(('time',)))
+
+    matches, report = match_env_classes(ds, [GridCurrent,
+                                             GridWind,
+                                             GridTemperature,
+                                             IceConcentration,
+                                             IceAwareCurrent])
+    matches = dict(matches)
+
+    assert matches[GridCurrent] == {'u': 'water_u', 'v': 'water_v'}
+    assert matches[GridTemperature] == 't'
+    assert GridWind not in matches
+    assert IceConcentration not in matches
+
+    # has the current components, but not the ice
+    assert IceAwareCurrent not in matches
+    assert 'ice_concentration' in report['IceAwareCurrent']
+    assert 'u' in report['GridWind']
+
+
+def test_ice_state():
+    from datetime import datetime
+    from collections import OrderedDict
+
+    import numpy as np
+    from gnome.environment import IceConcentration
+
+    class FakeIce(IceConcentration):
+        # counts the interpolations
+        def __init__(self, values):
+            self.values = values
+            self.calls = 0
+            self._ice_states = OrderedDict()
+
+        def at(self, points, time, *args, **kwargs):
+            self.calls += 1
+            return self.values.copy()
+
+    class FakeIceVelocity(object):
+        calls = 0
+
+        def at(self, points, time, *args, **kwargs):
+            self.calls += 1
+            return np.ones((len(points), 3))
+
+    ice = FakeIce(np.array([[0.0], [0.2], [0.5], [0.8], [1.0]]))
+    ice_v = FakeIceVelocity()
+    points = np.zeros((5, 3))
+    time = datetime(2020, 1, 1)
+
+    state = ice.ice_state(points, time, key=('positions', 1, 0))
+
+    assert state.any_ice
+    assert np.allclose(state.ice_factor.reshape(-1),
+                       [0.0, 0.0, 0.5, 1.0, 1.0])
+
+    # the same points and time: found once, for all the users
+    assert ice.ice_state(points, time, key=('positions', 1, 0)) is state
+    assert state.velocity(ice_v) is state.velocity(ice_v)
+    assert ice.calls == 1
+    assert ice_v.calls == 1
+
+    # the positions moved
+    assert ice.ice_state(points, time, key=('positions', 1, 1)) is not state
+    assert ice.calls == 2
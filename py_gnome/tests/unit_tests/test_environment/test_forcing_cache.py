@@ -0,0 +1,173 @@
+"""
+tests for the local, memory-mapped copy of gridded forcing files
+"""
+
+import shutil
+
+import numpy as np
+import pytest
+import netCDF4 as nc4
+
+import gnome.environment.forcing_cache
+from gnome.environment.forcing_cache import (ForcingCache,
+                                             CachedDataset,
+                                             file_hash)
+from gnome.environment.dataset_pool import DatasetPool
+
+num_times, ny, nx = 4, 3, 5
+
+
+def write_file(fn):
+    with nc4.Dataset(fn, 'w') as ds:
+        ds.createDimension('time', None)
+        ds.createDimension('y', ny)
+        ds.createDimension('x', nx)
+
+        time = ds.createVariable('time', 'f8', ('time',))
+        time.units = 'hours since 2020-01-01 00:00:00'
+        time[:] = np.arange(num_times)
+
+        angle = ds.createVariable('angle', 'f8', ('y', 'x'))
+        angle.units = 'radians'
+        angle[:] = np.pi / 2
+
+        for name in ('u', 'v', 'temp'):
+            var = ds.createVariable(name, 'f8', ('time', 'y', 'x'),
+                                    zlib=True, fill_value=-999.0)
+            var.units = 'm/s'
+            var[:] = np.ones((num_times, ny, nx))
+
+        ds.variables['u'][:, 0, 0] = np.ma.masked
+        ds.variables['v'][:] = 2.0
+
+
+@pytest.fixture
+def forcing_file(tmpdir):
+    fn = str(tmpdir.join('forcing.nc'))
+    write_file(fn)
+
+    return fn
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return ForcingCache(str(tmpdir.join('cache')))
+
+
+def test_prepare(forcing_file, cache):
+    assert not cache.is_prepared(forcing_file)
+
+    cache.prepare(forcing_file, fill_value=0.0)
+
+    assert cache.is_prepared(forcing_file, ['u', 'v', 'temp'])
+
+    ds = cache.open(forcing_file)
+    assert isinstance(ds, CachedDataset)
+
+    u, v, temp = ds['u'], ds['v'], ds['temp']
+    assert u.shape == (num_times, ny, nx)
+    assert u.dtype == np.float32
+    assert u.units == 'm/s'
+    assert not hasattr(u, '_FillValue')
+
+    # rotated by 90 degrees
+    assert u.gnome_rotated
+    assert np.allclose(u[1, 1, 1], -2.0)
+    assert np.allclose(v[1, 1, 1], 1.0)
+
+    # masked values filled
+    assert not np.ma.isMaskedArray(u[:])
+    assert np.allclose(u[:, 0, 0], -2.0)
+    assert np.allclose(v[:, 0, 0], 0.0)
+
+    assert np.allclose(temp[:], 1.0)
+    assert not hasattr(temp, 'gnome_rotated')
+
+    # the rest from the file
+    assert np.array_equal(ds['time'][:], np.arange(num_times))
+    assert len(ds.dimensions['x']) == nx
+
+    ds.close()
+
+
+def test_reused(forcing_file, cache, tmpdir):
+    directory = cache.prepare(forcing_file, ['temp'])
+
+    # keyed on the contents: a copy uses the same converted files
+    copy = str(tmpdir.join('copy.nc'))
+    shutil.copy(forcing_file, copy)
+
+    assert cache.is_prepared(copy, ['temp'])
+    assert cache.prepare(copy, ['temp']) == directory
+
+    # more variables added to it
+    assert not cache.is_prepared(copy, ['u'])
+    assert cache.prepare(copy, ['u', 'v']) == directory
+    assert cache.is_prepared(forcing_file, ['u', 'v', 'temp'])
+
+    cache.remove(forcing_file)
+    assert not cache.is_prepared(copy)
+    assert cache.open(copy) is None
+
+
+def test_hashed_when_needed(forcing_file, cache, tmpdir, monkeypatch):
+    cache.prepare(forcing_file, ['temp'])
+
+    hashed = []
+
+    def counting_hash(filename, *args):
+        hashed.append(filename)
+        return file_hash(filename, *args)
+
+    monkeypatch.setattr(gnome.environment.forcing_cache, 'file_hash',
+                        counting_hash)
+
+    # known by its path, size and time
+    assert cache.is_prepared(forcing_file)
+    assert hashed == []
+
+    # not the size of a prepared file: it can't be a copy of one
+    other = tmpdir.join('other.nc')
+    other.write('not a prepared file')
+
+    assert not cache.is_prepared(str(other))
+    assert hashed == []
+
+    # a copy is hashed once
+    copy = str(tmpdir.join('copy.nc'))
+    shutil.copy(forcing_file, copy)
+
+    assert cache.is_prepared(copy)
+    assert cache.is_prepared(copy)
+    assert len(hashed) == 1
+
+
+def test_index_rewritten(forcing_file, cache, tmpdir):
+    # the index and metadata files are replaced, not just created
+    cache.prepare(forcing_file, ['temp'])
+    cache.prepare(forcing_file, ['u'])
+
+    copy = str(tmpdir.join('copy.nc'))
+    shutil.copy(forcing_file, copy)
+
+    assert cache.is_prepared(copy, ['temp', 'u'])
+
+
+def test_opened_by_pool(forcing_file, cache):
+    pool = DatasetPool(cache=cache)
+
+    ds = pool.get_dataset(forcing_file)
+    assert not isinstance(ds, CachedDataset)
+    pool.clear()
+
+    cache.prepare(forcing_file, ['temp'])
+
+    ds = pool.get_dataset(forcing_file)
+    assert isinstance(ds, CachedDataset)
+    assert ds['temp'].dtype == np.float32
+    assert np.allclose(ds['temp'][:], 1.0)
+
+    # the others from the file
+    assert ds['u'].dtype == np.float64
+
+    pool.clear()
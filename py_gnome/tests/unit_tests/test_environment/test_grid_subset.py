@@ -0,0 +1,329 @@
+"""
+tests for the spatial subsetting of grids and gridded data
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from gnome.model import Model
+from gnome.environment import GridCurrent
+from gnome.movers import PyCurrentMover
+from gnome.environment.gridded_objects_base import (Grid_S,
+                                                    Grid_U,
+                                                    Time,
+                                                    Variable)
+from gnome.environment.grid_subset import (buffered_bbox,
+                                           structured_window,
+                                           structured_index,
+                                           regular_window,
+                                           ugrid_subset,
+                                           renumbering,
+                                           renumber_connectivity,
+                                           WindowedData)
+
+
+class CountingData(object):
+    """
+    stands in for a netCDF variable -- keeps track of the reads
+    """
+    def __init__(self, arr):
+        self.arr = arr
+        self.shape = arr.shape
+        self.units = 'm/s'
+        self.reads = []
+
+    def __getitem__(self, key):
+        self.reads.append(key)
+        return self.arr[key]
+
+
+def curvilinear_grid(ny=20, nx=30):
+    lon, lat = np.meshgrid(np.linspace(-130, -120, nx),
+                           np.linspace(40, 50, ny))
+    # skew it a bit, so it's not regular
+    return lon + 0.1 * (lat - 40), lat
+
+
+def test_buffered_bbox():
+    bbox = buffered_bbox(((-125, 45), (-124, 46)), 0.5)
+
+    assert np.array_equal(bbox, [(-125.5, 44.5), (-123.5, 46.5)])
+
+
+def test_structured_window():
+    lon, lat = curvilinear_grid()
+    bbox = ((-126, 44), (-124, 46))
+
+    (r0, r1), (c0, c1) = structured_window(lon, lat, bbox)
+
+    inside = ((lon >= -126) & (lon <= -124) & (lat >= 44) & (lat <= 46))
+    rows, cols = np.nonzero(inside)
+
+    # covers all the nodes in the box, plus one all around
+    assert r0 == rows.min() - 1 and r1 == rows.max() + 2
+    assert c0 == cols.min() - 1 and c1 == cols.max() + 2
+
+
+def test_structured_window_outside():
+    lon, lat = curvilinear_grid()
+
+    assert structured_window(lon, lat, ((0, 0), (1, 1))) is None
+
+
+def test_structured_window_edge():
+    lon, lat = curvilinear_grid()
+
+    # at the corner of the grid: can't pad past the edge
+    (r0, r1), (c0, c1) = structured_window(lon, lat,
+                                           ((-131, 39), (-129.5, 40.2)))
+
+    assert r0 == 0 and c0 == 0
+    assert r1 - r0 >= 2 and c1 - c0 >= 2
+
+
+def test_structured_index_padding():
+    window = ((3, 8), (5, 11))
+    node_shape = (20, 30)
+
+    # ROMS style: rho points one bigger all around, u and v in between
+    rho = structured_index(window, node_shape, (22, 32))
+    u = structured_index(window, node_shape, (22, 31))
+    psi = structured_index(window, node_shape, (20, 30))
+
+    assert rho == (slice(3, 10), slice(5, 13))
+    assert u == (slice(3, 10), slice(5, 12))
+    assert psi == (slice(3, 8), slice(5, 11))
+
+
+def test_regular_window():
+    lon = np.linspace(-130, -120, 101)
+    lat = np.linspace(40, 50, 51)
+
+    (lon0, lon1), (lat0, lat1) = regular_window(lon, lat,
+                                                ((-125, 44), (-124, 45)))
+
+    assert lon[lon0] < -125 and lon[lon1 - 1] > -124
+    assert lat[lat0] < 44 and lat[lat1 - 1] > 45
+
+    assert regular_window(lon, lat, ((0, 0), (1, 1))) is None
+
+
+def triangle_grid(n=10, m=None):
+    """
+    a grid of squares, each split in two triangles -- n nodes across, and
+    m (n by default) up.
+    """
+    if m is None:
+        m = n
+
+    x, y = np.meshgrid(np.arange(n, dtype=np.float64),
+                       np.arange(m, dtype=np.float64))
+    nodes = np.column_stack((x.ravel(), y.ravel()))
+
+    faces = []
+    for j in range(m - 1):
+        for i in range(n - 1):
+            a = j * n + i
+            faces.append((a, a + 1, a + n + 1))
+            faces.append((a, a + n + 1, a + n))
+
+    return nodes, np.array(faces)
+
+
+def test_ugrid_subset():
+    nodes, faces = triangle_grid()
+    bbox = ((2.5, 2.5), (4.5, 3.5))
+
+    node_idx, face_idx, new_faces = ugrid_subset(nodes, faces, bbox)
+
+    in_box = set(np.nonzero((nodes[:, 0] >= 2.5) & (nodes[:, 0] <= 4.5) &
+                            (nodes[:, 1] >= 2.5) & (nodes[:, 1] <= 3.5))[0])
+
+    # exactly the faces with a node in the box
+    expected = [i for i, f in enumerate(faces) if in_box & set(f)]
+    assert np.array_equal(face_idx, expected)
+
+    # the renumbered faces are the same triangles
+    assert np.array_equal(nodes[node_idx][new_faces], nodes[faces[face_idx]])
+    assert new_faces.max() == len(node_idx) - 1
+
+
+def test_ugrid_subset_masked():
+    nodes, faces = triangle_grid(4)
+
+    # a mixed grid: the first face is a quad, the others are padded
+    faces = np.column_stack((faces, np.zeros((len(faces),), dtype=int)))
+    faces = np.ma.array(faces, mask=np.zeros(faces.shape, dtype=bool))
+    faces.mask[1:, 3] = True
+    faces[0, 3] = 4
+
+    node_idx, face_idx, new_faces = ugrid_subset(nodes, faces,
+                                                 ((-0.5, -0.5), (0.5, 0.5)))
+
+    assert 0 in face_idx
+    assert np.ma.isMaskedArray(new_faces)
+    assert not new_faces.mask[0].any()
+    assert new_faces.mask[1:, 3].all()
+
+
+def test_renumber_connectivity():
+    renumber = renumbering(np.array([1, 3, 4]), 6)
+
+    assert np.array_equal(renumber, [-1, 0, -1, 1, 2, -1])
+
+    conn = np.array([(1, 3), (0, 4), (4, -1), (5, 2)])
+    result = renumber_connectivity(conn, np.array([0, 1, 2]), renumber)
+
+    assert np.array_equal(result, [(0, 1), (-1, 2), (2, -1)])
+
+
+def test_windowed_data_slices():
+    arr = np.arange(4 * 3 * 10 * 12, dtype=np.float64).reshape((4, 3, 10, 12))
+    data = CountingData(arr)
+    windowed = WindowedData(data, (slice(2, 6), slice(3, 9)))
+
+    assert windowed.shape == (4, 3, 4, 6)
+    assert windowed.units == 'm/s'
+
+    assert np.array_equal(windowed[1], arr[1, :, 2:6, 3:9])
+    assert np.array_equal(windowed[1, 2], arr[1, 2, 2:6, 3:9])
+    assert np.array_equal(windowed[-1, :, 1:3, 0], arr[-1, :, 3:5, 3])
+    assert np.array_equal(windowed[..., 0], arr[:, :, 2:6, 3])
+    assert np.array_equal(np.asarray(windowed), arr[:, :, 2:6, 3:9])
+
+    # only the window was read
+    assert data.reads[0] == (1, slice(None), slice(2, 6), slice(3, 9))
+
+
+def test_windowed_data_indexes():
+    arr = np.arange(5 * 20, dtype=np.float64).reshape((5, 20))
+    data = CountingData(arr)
+    idx = np.array([3, 4, 7, 12])
+    windowed = WindowedData(data, (idx,))
+
+    assert windowed.shape == (5, 4)
+    assert np.array_equal(windowed[2], arr[2, idx])
+    assert np.array_equal(windowed[:, 1:3], arr[:, idx[1:3]])
+
+    # one contiguous read, covering the indexes
+    assert data.reads[0] == (2, slice(3, 13))
+
+
+times = Time([datetime(2020, 1, 1), datetime(2020, 1, 1, 6)])
+mid_time = datetime(2020, 1, 1, 3)
+
+
+def linear_data(lon, lat):
+    """
+    two time steps of a field that is linear in space
+    """
+    return np.array([lon + 2 * lat, lon + 2 * lat + 1.0])
+
+
+def s_grid_variable(name='u', scale=1.0, grid=None):
+    lon, lat = curvilinear_grid()
+
+    if grid is None:
+        grid = Grid_S(node_lon=lon, node_lat=lat)
+
+    return Variable(name=name, units='m/s', time=times, grid=grid,
+                    data=linear_data(lon, lat) * scale)
+
+
+s_grid_bbox = ((-126, 44), (-124, 46))
+s_grid_points = np.array([(-125.5, 44.5, 0.0),
+                          (-124.2, 45.9, 0.0),
+                          (-125.0, 45.0, 0.0)])
+
+
+def test_subset_s_grid_variable():
+    u = s_grid_variable()
+    full_shape = u.grid.node_lon.shape
+    expected = u.at(s_grid_points, mid_time)
+
+    u.subset(s_grid_bbox)
+
+    shape = u.grid.node_lon.shape
+    assert shape[0] < full_shape[0] and shape[1] < full_shape[1]
+    assert u.data.shape == (2,) + shape
+
+    assert np.allclose(u.at(s_grid_points, mid_time), expected)
+
+
+def test_subset_u_grid_variable():
+    nodes, faces = triangle_grid()
+    u = Variable(name='u', units='m/s', time=times, location='node',
+                 grid=Grid_U(nodes=nodes, faces=faces),
+                 data=linear_data(nodes[:, 0], nodes[:, 1]))
+
+    points = np.array([(3.2, 3.7, 0.0),
+                       (4.5, 4.1, 0.0),
+                       (5.0, 3.0, 0.0)])
+    expected = u.at(points, mid_time)
+
+    u.subset(((2.5, 2.5), (5.5, 5.5)))
+
+    assert len(u.grid.nodes) < len(nodes)
+    assert u.data.shape == (2, len(u.grid.nodes))
+
+    result = u.at(points, mid_time)
+    assert np.allclose(result, expected)
+    assert np.allclose(np.asarray(result).reshape(-1),
+                       points[:, 0] + 2 * points[:, 1] + 0.5)
+
+
+def test_subset_u_grid_location():
+    # as many nodes as faces: the location can't come from the shape
+    nodes, faces = triangle_grid(3, 4)
+    assert len(nodes) == len(faces)
+
+    grid = Grid_U(nodes=nodes, faces=faces)
+    bbox = ((-0.5, -0.5), (0.5, 0.5))
+
+    sub = grid.subset(bbox)
+    node_idx, face_idx, _new_faces = ugrid_subset(nodes, faces, bbox)
+
+    assert np.array_equal(sub.subset_data_index((2, 12), 'node')[0],
+                          node_idx)
+    assert np.array_equal(sub.subset_data_index((2, 12), 'face')[0],
+                          face_idx)
+    assert np.array_equal(sub.subset_data_index((2, 12), 'center')[0],
+                          face_idx)
+
+    with pytest.raises(ValueError):
+        sub.subset_data_index((2, 12))
+
+    data = np.arange(2 * 12, dtype=np.float64).reshape((2, 12))
+    u = Variable(name='u', units='m/s', time=times, location='face',
+                 grid=grid, data=data)
+    u.subset(bbox)
+
+    assert np.array_equal(u.data[:], data[:, face_idx])
+
+
+def test_model_subset_environment():
+    u = s_grid_variable('u')
+    v = s_grid_variable('v', 0.5, u.grid)
+    current = GridCurrent(name='current', units='m/s', time=times,
+                          grid=u.grid, variables=[u, v])
+    full_shape = current.grid.node_lon.shape
+    expected = current.at(s_grid_points, mid_time)
+
+    model = Model()
+    model.environment += current
+    model.movers += PyCurrentMover(current=current)
+
+    cropped = model.subset_environment(s_grid_bbox, buffer=0.0)
+
+    # the mover's current is the same object: cropped once
+    assert len(cropped) == 1
+    assert cropped[0] is current
+
+    # the components share the cropped grid
+    assert u.grid is current.grid
+    assert v.grid is current.grid
+    assert current.grid.node_lon.shape[0] < full_shape[0]
+
+    assert np.allclose(current.at(s_grid_points, mid_time), expected)
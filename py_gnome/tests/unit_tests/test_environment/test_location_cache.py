@@ -0,0 +1,135 @@
+"""
+tests for the cell location cache shared by the variables on a grid
+"""
+
+import numpy as np
+
+from gnome.environment.gridded_objects_base import LocationCacheMixin
+
+
+class CountingGrid(object):
+    """
+    a very simple "grid": unit square cells
+    """
+    def __init__(self):
+        self.located = 0
+        self.alphas = 0
+
+    def locate_faces(self, points, _memo=False, _copy=False, _hash=None):
+        self.located += 1
+        return np.floor(np.asarray(points)[:, :2]).astype(np.int32)
+
+    def interpolation_alphas(self, points, location='node', _memo=False):
+        self.alphas += 1
+        pts = np.asarray(points)[:, :2]
+        return pts - np.floor(pts)
+
+
+class CachedGrid(LocationCacheMixin, CountingGrid):
+    pass
+
+
+points = np.array([(0.5, 0.5, 0.0),
+                   (2.25, 1.75, 1.0),
+                   (3.5, 0.5, 0.0)])
+
+
+def test_located_once():
+    grid = CachedGrid()
+
+    first = grid.locate_faces(points)
+    # different variables, different arguments
+    second = grid.locate_faces(points.copy(), _memo=True)
+
+    assert grid.located == 1
+    assert np.array_equal(first, second)
+    assert np.array_equal(first, [(0, 0), (2, 1), (3, 0)])
+
+
+def test_keyed_on_hash():
+    grid = CachedGrid()
+
+    key = ('positions', 1, 0)
+    first = grid.locate_faces(points, _hash=key)
+    # the key identifies the points: they aren't looked at again
+    second = grid.locate_faces(points + 1.0, _memo=True, _hash=key)
+
+    assert grid.located == 1
+    assert second is first
+
+    # new positions, new key
+    faces = grid.locate_faces(points + 1.0, _hash=('positions', 1, 1))
+
+    assert grid.located == 2
+    assert np.array_equal(faces, [(1, 1), (3, 2), (4, 1)])
+
+    # no key: the points are hashed, not matched to a key
+    grid.locate_faces(points)
+    assert grid.located == 3
+
+
+def test_depth_ignored():
+    grid = CachedGrid()
+
+    grid.locate_faces(points)
+    deeper = points.copy()
+    deeper[:, 2] = 10.0
+    grid.locate_faces(deeper)
+
+    assert grid.located == 1
+
+
+def test_new_positions():
+    grid = CachedGrid()
+
+    grid.locate_faces(points)
+    moved = points + 1.0
+    faces = grid.locate_faces(moved)
+
+    assert grid.located == 2
+    assert np.array_equal(faces, [(1, 1), (3, 2), (4, 1)])
+
+
+def test_copy():
+    grid = CachedGrid()
+
+    first = grid.locate_faces(points)
+    second = grid.locate_faces(points, _copy=True)
+
+    assert second is not first
+    assert np.array_equal(first, second)
+
+
+def test_alphas_keyed_on_args():
+    grid = CachedGrid()
+
+    grid.interpolation_alphas(points, location='node')
+    grid.interpolation_alphas(points, location='node', _memo=True)
+    assert grid.alphas == 1
+
+    grid.interpolation_alphas(points, location='center')
+    assert grid.alphas == 2
+
+
+def test_unhashable_args():
+    grid = CachedGrid()
+
+    grid.interpolation_alphas(points, location=np.array([1, 2]))
+    grid.interpolation_alphas(points, location=np.array([1, 2]))
+
+    assert grid.alphas == 2
+
+
+def test_cache_size():
+    grid = CachedGrid()
+
+    for i in range(grid.location_cache_size + 1):
+        grid.locate_faces(points + i)
+
+    # the first one has been dropped
+    grid.locate_faces(points)
+    assert grid.located == grid.location_cache_size + 2
+
+    grid.clear_location_cache()
+    grid.locate_faces(points)
+    assert grid.located == grid.location_cache_size + 3
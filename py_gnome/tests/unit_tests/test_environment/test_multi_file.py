@@ -0,0 +1,144 @@
+"""
+tests for the lazy aggregation of a time series of netCDF files
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+import netCDF4 as nc4
+
+from gnome.environment.multi_file import (MultiFileDataset,
+                                          expand_filenames,
+                                          is_multi_file)
+
+start = datetime(2020, 1, 1)
+
+
+def write_file(fn, first_hour, num_times=3, nx=4, ny=3):
+    """
+    a file with num_times hourly records, starting at first_hour --
+    its time units are relative to its own start, like forecast files.
+    """
+    file_start = start + timedelta(hours=first_hour)
+
+    with nc4.Dataset(fn, 'w') as ds:
+        ds.createDimension('time', None)
+        ds.createDimension('y', ny)
+        ds.createDimension('x', nx)
+        ds.title = 'test forcing'
+
+        time = ds.createVariable('time', 'f8', ('time',))
+        time.units = 'hours since {0}'.format(file_start.isoformat(' '))
+        time[:] = np.arange(num_times)
+
+        lon = ds.createVariable('lon', 'f8', ('y', 'x'))
+        lon[:] = np.arange(nx * ny).reshape((ny, nx))
+
+        u = ds.createVariable('u', 'f8', ('time', 'y', 'x'))
+        u.units = 'm/s'
+        u.standard_name = 'eastward_sea_water_velocity'
+        for i in range(num_times):
+            u[i] = first_hour + i
+
+
+@pytest.fixture
+def daily_files(tmpdir):
+    """
+    five files of three hours each, written out of order
+    """
+    filenames = []
+
+    for day in (3, 0, 4, 1, 2):
+        fn = str(tmpdir.join('forcing_{0:02d}.nc'.format(day)))
+        write_file(fn, day * 3)
+        filenames.append(fn)
+
+    return filenames
+
+
+def test_expand_filenames(daily_files, tmpdir):
+    pattern = str(tmpdir.join('forcing_*.nc'))
+
+    assert expand_filenames(pattern) == sorted(daily_files)
+    assert expand_filenames(daily_files[0]) == daily_files[0]
+    assert is_multi_file(pattern)
+    assert is_multi_file(daily_files)
+    assert not is_multi_file(daily_files[:1])
+    assert not is_multi_file(daily_files[0])
+
+    with pytest.raises(ValueError):
+        expand_filenames(str(tmpdir.join('nothing_*.nc')))
+
+
+def test_time_index(daily_files):
+    ds = MultiFileDataset(daily_files)
+
+    assert ds.num_times == 15
+    assert len(ds.dimensions['time']) == 15
+    assert ds.dimensions['time'].isunlimited()
+
+    # all on the units of the first file (in time)
+    times = nc4.num2date(ds.variables['time'][:],
+                         ds.variables['time'].units)
+    assert times[0] == start
+    assert times[-1] == start + timedelta(hours=14)
+
+    # only the first file (for the metadata) is open
+    assert len(ds.open_files) == 1
+
+
+def test_read(daily_files):
+    ds = MultiFileDataset(daily_files)
+    u = ds.variables['u']
+
+    assert u.shape == (15, 3, 4)
+    assert u.units == 'm/s'
+    assert ds.title == 'test forcing'
+
+    for i in range(15):
+        assert np.all(u[i] == i)
+
+    assert np.all(u[-1, 2, 3] == 14)
+
+    # across files
+    values = u[2:8, 0, 0]
+    assert np.array_equal(values, np.arange(2, 8))
+
+    assert np.array_equal(u[[1, 7, 13], 0, 0], [1, 7, 13])
+    assert u[5:5].shape == (0, 3, 4)
+
+    # not aggregated: from the first file
+    assert ds.variables['lon'].shape == (3, 4)
+    assert np.array_equal(ds['lon'][:], np.arange(12).reshape((3, 4)))
+
+
+def test_max_open(daily_files):
+    ds = MultiFileDataset(daily_files, max_open=2)
+    u = ds.variables['u']
+
+    for i in range(15):
+        u[i]
+        assert len(ds.open_files) <= 2
+
+    ds.close()
+    assert len(ds.open_files) == 0
+
+    # opened again when needed
+    assert np.all(u[0] == 0)
+
+
+def test_overlapping_forecasts(tmpdir):
+    # each file is a 6 hour forecast, a new one every 3 hours
+    filenames = []
+    for i in range(3):
+        fn = str(tmpdir.join('fc_{0}.nc'.format(i)))
+        write_file(fn, i * 3, num_times=6)
+        filenames.append(fn)
+
+    ds = MultiFileDataset(filenames)
+
+    # the later forecast is used where they overlap
+    assert ds.num_times == 12
+    assert np.array_equal(ds.variables['time'][:], np.arange(12))
+    assert np.array_equal(ds.variables['u'][:, 0, 0], np.arange(12))
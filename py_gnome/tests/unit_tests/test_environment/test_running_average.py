@@ -7,6 +7,7 @@ from pytest import raises
 import numpy as np
 
 from gnome.utilities.time_utils import (zero_time,
+                                        date_to_sec,
                                         sec_to_date)
 from gnome.basic_types import datetime_value_2d
 from gnome.environment import Wind, constant_wind, RunningAverage
@@ -187,3 +188,35 @@ def test_serialize_deserialize():
     # deserialize and ensure the dict's are correct
     d_av = RunningAverage.deserialize(json_)
     assert d_av == av
+
+
+def test_same_as_cpp():
+    '''
+    the running average is what the C++ code computes
+    '''
+    start_time = datetime(2015, 1, 1, 1)
+    speeds = 10 + 5 * np.sin(np.arange(97) / 5.)
+
+    ts = np.zeros((97,), dtype=datetime_value_2d)
+    ts['time'] = [sec_to_date(date_to_sec(start_time) + 3600 * i)
+                  for i in range(97)]
+    ts['value'][:, 0] = speeds
+    ts['value'][:, 1] = 270
+
+    wm = Wind(timeseries=ts, units='m/s')
+    av = RunningAverage(wm)
+
+    expected = wm.ossm.create_running_average(3)
+    assert np.all(av.ossm.timeseries['time'] == expected['time'])
+    assert np.allclose(av.ossm.timeseries['value']['u'],
+                       expected['value']['u'])
+
+    # past the two days computed: extended from there
+    model_time = date_to_sec(datetime(2015, 1, 3, 10))
+    av.prepare_for_model_step(sec_to_date(model_time))
+
+    expected = wm.ossm.create_running_average(3, model_time)
+    assert av.ossm.timeseries['time'][0] == model_time
+    assert np.all(av.ossm.timeseries['time'] == expected['time'])
+    assert np.allclose(av.ossm.timeseries['value']['u'],
+                       expected['value']['u'])
@@ -0,0 +1,83 @@
+'''
+tests of the sigma depth coordinate (S_Depth_T1) in environment_objects
+'''
+import numpy as np
+
+from gnome.environment.environment_objects import S_Depth_T1
+
+
+class FlatBathymetry(object):
+    '''
+    bathymetry that is given per-point
+    '''
+    def __init__(self, depths):
+        self.depths = depths
+
+    def at(self, points, time, _hash=None):
+        return self.depths.reshape(-1, 1)
+
+
+def sigma_terms(num_levels=11):
+    s_w = np.linspace(-1, 0, num_levels)
+    s_rho = (s_w[1:] + s_w[:-1]) / 2
+
+    return {'s_w': s_w,
+            'Cs_w': -(1 - np.linspace(0, 1, num_levels)) ** 2,
+            's_rho': s_rho,
+            'Cs_r': -(1 - (s_rho + 1)) ** 2,
+            'hc': 20.0}
+
+
+def loop_alphas(sd, z, depths):
+    '''
+    level by level, as it used to be done
+    '''
+    s_w, Cs_w, hc = sd.terms['s_w'], sd.terms['Cs_w'], sd.terms['hc']
+
+    ind = -np.ones(len(z), dtype=np.int64)
+    alph = -np.ones(len(z))
+    below = None
+
+    for lev in range(len(s_w)):
+        lev_depths = -(hc * (s_w[lev] - Cs_w[lev]) + Cs_w[lev] * depths)
+        within = np.nonzero((lev_depths < z) & (ind == -1))[0]
+        ind[within] = lev
+
+        if lev == 0:
+            alph[within] = -2
+        else:
+            alph[within] = ((z[within] - below[within]) /
+                            (lev_depths[within] - below[within]))
+        below = lev_depths
+
+    return ind, alph
+
+
+def test_interpolation_alphas():
+    num = 1000
+    depths = np.random.uniform(5, 500, num)
+    points = np.zeros((num, 3))
+    points[:, 2] = np.random.uniform(-10, 600, num)
+
+    # the terms are passed in, so the dataset isn't used
+    sd = S_Depth_T1(FlatBathymetry(depths), dataset={}, terms=sigma_terms())
+    # small chunks, so more than one is used
+    sd.max_level_array_size = 1000
+
+    indices, alphas = sd.interpolation_alphas(points, (sd.num_w_levels,))
+
+    underwater = points[:, 2] > 0
+    ind, alph = loop_alphas(sd, points[underwater, 2], depths[underwater])
+
+    assert np.all(indices[~underwater] == -1)
+    assert np.all(alphas[~underwater] == -1)
+    assert np.array_equal(indices[underwater], ind)
+    assert np.allclose(alphas[underwater], alph)
+
+
+def test_interpolation_alphas_surface():
+    points = np.zeros((5, 3))
+    sd = S_Depth_T1(FlatBathymetry(np.ones((5,)) * 100),
+                    dataset={}, terms=sigma_terms())
+
+    assert sd.interpolation_alphas(points, (sd.num_w_levels,)) == (None, None)
@@ -0,0 +1,210 @@
+"""
+tests for the time slice cache for gridded data
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from gnome.environment.slice_cache import (SliceCache, TimeSliceCache,
+                                           shared_cache)
+
+
+class CountingData(object):
+    """
+    stands in for a netCDF variable -- keeps track of the reads
+    """
+    def __init__(self, arr):
+        self.arr = arr
+        self.shape = arr.shape
+        self.units = 'm/s'
+        self.reads = []
+
+    def __getitem__(self, key):
+        self.reads.append(key)
+        return self.arr[key]
+
+
+def make_data(nt=6):
+    return CountingData(np.arange(nt * 4 * 3, dtype=np.float64)
+                        .reshape((nt, 4, 3)))
+
+
+def test_slice_cache_lru():
+    cache = SliceCache(max_bytes=3 * 80)
+
+    for i in range(3):
+        cache.put(i, np.zeros((10,)))
+
+    assert cache.nbytes == 240
+
+    # use 0, so 1 is the least recently used
+    assert cache.get(0) is not None
+    cache.put(3, np.zeros((10,)))
+
+    assert 1 not in cache
+    assert 0 in cache and 2 in cache and 3 in cache
+    assert cache.nbytes == 240
+
+
+def test_slice_cache_too_big():
+    cache = SliceCache(max_bytes=40)
+    cache.put(0, np.zeros((10,)))
+
+    assert len(cache) == 0
+    assert cache.get(0) is None
+
+
+def test_same_values():
+    data = make_data()
+    cached = TimeSliceCache(data, max_bytes=1e6, prefetch=False)
+
+    assert np.array_equal(cached[2], data.arr[2])
+    assert np.array_equal(cached[2, 1], data.arr[2, 1])
+    assert np.array_equal(cached[-1, :, 2], data.arr[-1, :, 2])
+    assert np.array_equal(cached[:], data.arr)
+    assert np.array_equal(np.asarray(cached), data.arr)
+
+    # attributes are passed through
+    assert cached.shape == data.shape
+    assert cached.units == 'm/s'
+
+
+def test_reads_once():
+    data = make_data()
+    cached = TimeSliceCache(data, max_bytes=1e6, prefetch=False)
+
+    for _i in range(3):
+        cached[1, 0]
+        cached[2, 0]
+
+    assert data.reads == [1, 2]
+    assert cached.stats['hits'] == 4
+    assert cached.stats['misses'] == 2
+    assert cached.stats['bytes_read'] == 2 * 12 * 8
+
+
+def test_read_ahead_forward():
+    data = make_data()
+    cached = TimeSliceCache(data, max_bytes=1e6, prefetch=True)
+
+    # first interval: no direction yet
+    cached.read_ahead(1)
+    cached.wait()
+    assert data.reads == []
+
+    # into the next interval: 2 and 3 are needed next
+    cached.read_ahead(2)
+    cached.wait()
+    assert data.reads == [3]
+
+    cached[2]
+    cached[3]
+
+    assert cached.stats['hits'] == 1
+    assert cached.stats['misses'] == 1
+
+
+def test_read_ahead_backward():
+    data = make_data()
+    cached = TimeSliceCache(data, max_bytes=1e6, prefetch=True)
+
+    cached.read_ahead(4)
+    cached.read_ahead(3)
+    cached.wait()
+
+    # model is between 2 and 3, going backward -- 1 is next
+    assert data.reads == [1]
+
+
+def test_read_ahead_off_end():
+    data = make_data()
+    cached = TimeSliceCache(data, max_bytes=1e6, prefetch=True)
+
+    cached.read_ahead(4)
+    cached.read_ahead(5)
+    cached.wait()
+
+    assert data.reads == []
+
+
+def test_no_prefetch():
+    data = make_data()
+    cached = TimeSliceCache(data, max_bytes=1e6, prefetch=False)
+
+    cached.read_ahead(1)
+    cached.read_ahead(2)
+    cached.wait()
+
+    assert data.reads == []
+
+
+def test_slices_read_only():
+    data = make_data()
+    cached = TimeSliceCache(data, max_bytes=1e6, prefetch=False)
+
+    with pytest.raises(ValueError):
+        cached[1][0, 0] = -1.
+
+    with pytest.raises(ValueError):
+        cached[1, 0][:] = -1.
+
+    assert np.array_equal(cached[1], data.arr[1])
+
+
+def test_shared_cache():
+    first = TimeSliceCache(make_data(), prefetch=False)
+    second = TimeSliceCache(make_data(), prefetch=False)
+
+    assert first.cache is shared_cache
+    assert second.cache is shared_cache
+
+    first[1]
+    second[1]
+    second[2]
+
+    assert first.stats['bytes_cached'] == 12 * 8
+    assert second.stats['bytes_cached'] == 2 * 12 * 8
+
+    second.clear()
+
+    assert second.stats['bytes_cached'] == 0
+    assert first.stats['bytes_cached'] == 12 * 8
+
+    first.clear()
+
+
+class SlowData(CountingData):
+    """
+    a read that doesn't finish till it's let go
+    """
+    def __init__(self, arr):
+        super(SlowData, self).__init__(arr)
+        self.go = threading.Event()
+
+    def __getitem__(self, key):
+        self.go.wait()
+        return super(SlowData, self).__getitem__(key)
+
+
+def test_wait_for_prefetch():
+    """
+    a slice that is being read ahead is not read a second time
+    """
+    data = SlowData(make_data().arr)
+    cached = TimeSliceCache(data, max_bytes=1e6, prefetch=True)
+
+    cached.read_ahead(1)
+    cached.read_ahead(2)
+
+    thread = threading.Timer(0.1, data.go.set)
+    thread.start()
+
+    assert np.array_equal(cached[3], data.arr[3])
+
+    cached.wait()
+    thread.join()
+
+    assert data.reads == [3]
+    assert cached.stats['bytes_read'] == 12 * 8
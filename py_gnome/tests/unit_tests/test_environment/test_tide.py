@@ -3,11 +3,14 @@ Test all operations for cats mover work
 '''
 
 import os
+from datetime import datetime
 
+import numpy as np
 import pytest
 from pytest import raises
 
 from gnome.environment import Tide
+from gnome.utilities.time_utils import date_to_sec, sec_to_date
 from gnome.utilities.remote_data import get_datafile
 
 from ..conftest import testdata
@@ -55,3 +58,32 @@ def test_serialize_deserialize(filename):
     new_t = Tide.deserialize(serial)
     assert new_t is not tide
     assert new_t == tide
+
+
+@pytest.mark.parametrize('filename', [shio_file, ossm_file])
+def test_get_value(filename):
+    '''
+    the precomputed tide is what the C++ object gives
+    '''
+    tide = Tide(filename)
+
+    if filename == ossm_file:
+        start = tide.cy_obj.get_start_time()
+        times = np.linspace(start, tide.cy_obj.get_end_time(), 37).astype(int)
+    else:
+        start = date_to_sec(datetime(2013, 3, 5, 2, 10))
+        times = start + np.arange(0, 24 * 3600, 900)
+
+    tide.prepare_for_model_run(sec_to_date(start))
+
+    expected = tide.cy_obj.get_time_value(times)[0]['u']
+
+    assert np.allclose(tide.get_value(times), expected, atol=1e-2)
+    assert np.isclose(tide.get_value(times[3]), expected[3], atol=1e-2)
+
+    if filename == shio_file:
+        # past the precomputed time
+        later = start + 5 * 24 * 3600
+        assert np.isclose(tide.get_value(later),
+                          tide.cy_obj.get_time_value(later)[0]['u'][0],
+                          atol=1e-2)
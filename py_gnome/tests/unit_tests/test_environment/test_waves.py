@@ -309,3 +309,27 @@ def test_get_emulsification_wind_with_wave_height2():
     print w.get_emulsification_wind(None, start_time)
     # input wave height should not have overwhelmed wind speed
     assert w.get_emulsification_wind(None, start_time) == 10.0
+
+
+def test_values_kept():
+    """
+    the values are computed once for a time and set of positions
+    """
+    water = copy(default_water)
+    w = Waves(test_wind_5, water)
+
+    points = np.array([(-75.0, 45.0), (-75.1, 45.2)])
+
+    values = w.get_value(points, start_time)
+    assert w.get_value(points.copy(), start_time) is values
+    assert w.get_wind_speed(points, start_time) is \
+        w.get_wind_speed(points, start_time)
+
+    # other positions, time or water: computed again
+    assert w.get_value(points[:1], start_time) is not values
+    assert w.get_value(points,
+                       start_time + datetime.timedelta(hours=1)) is not values
+
+    water.wave_height = 1.0
+    H = w.get_value(points, start_time)[0]
+    assert np.allclose(H, .707)
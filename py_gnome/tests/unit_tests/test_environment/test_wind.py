@@ -625,6 +625,47 @@ def test_wind_from_values_knots():
         assert np.allclose(vals[1], theta)
 
 
+
+def test_get_values():
+    """
+    the vectorized interpolation gives what the C++ object gives
+    """
+    values = [(datetime(2016, 5, 10, 12,  0), 5, 45),
+              (datetime(2016, 5, 10, 12, 20), 6, 50),
+              (datetime(2016, 5, 10, 12, 40), 7, 355),
+              (datetime(2016, 5, 10, 13, 40), 2, 10),
+              ]
+
+    wind = wind_from_values(values, units='knot')
+
+    times = [values[0][0] + timedelta(minutes=m) for m in range(0, 101, 7)]
+
+    for coord_sys in ('uv', 'r-theta'):
+        expected = wind.get_wind_data(times, 'm/s', coord_sys)['value']
+
+        assert np.allclose(wind.get_values(times, coord_sys), expected)
+
+        for t, val in zip(times, expected):
+            assert np.allclose(wind.get_values(t, coord_sys)[0], val)
+
+    # a single time is kept
+    assert wind.get_values(times[1]) is wind.get_values(times[1])
+
+    # outside of the data
+    later = values[-1][0] + timedelta(hours=1)
+    with raises(RuntimeError):
+        wind.get_value(later)
+
+    wind.extrapolation_is_allowed = True
+    assert np.allclose(wind.get_value(later),
+                       wind.get_value(values[-1][0]))
+
+    # a new timeseries is used right away
+    wind.set_wind_data(wind.get_wind_data()[:1], 'knot')
+    assert np.allclose(wind.get_value(times[1])[0],
+                       unit_conversion.convert('velocity', 'knot', 'm/s', 5))
+
+
 node_lon = np.array(([1, 3, 5], [1, 3, 5], [1, 3, 5]))
 node_lat = np.array(([1, 1, 1], [3, 3, 3], [5, 5, 5]))
 edge2_lon = np.array(([0, 2, 4, 6], [0, 2, 4, 6], [0, 2, 4, 6]))
@@ -17,6 +17,7 @@ import numpy as np
 # import gnome.maps.map
 from gnome.basic_types import oil_status, status_code_type
 from gnome.utilities.projections import NoProjection
+from gnome.utilities.geometry import is_clockwise
 
 from gnome.maps import GnomeMap, MapFromBNA, RasterMap, ParamMap
 # MapFromUGrid
@@ -342,6 +343,30 @@ class Test_RasterMap:
         # outside polygon, off land:
         assert not gmap.allowable_spill_position((3.0, 3.0, 0.))
 
+    def test_coarser_rasters(self):
+        # odd sized, so there are partial blocks on the edges
+        raster = (np.random.random((37, 21)) > 0.97).astype(np.uint8)
+        gmap = RasterMap(raster=raster, projection=NoProjection())
+
+        ratio = gmap.ratios[0]
+        coarse = gmap.layers[0]
+
+        assert coarse.shape == (3, 2)
+        for i in range(coarse.shape[0]):
+            for j in range(coarse.shape[1]):
+                assert coarse[i, j] == np.any(raster[i * ratio:(i + 1) * ratio,
+                                                     j * ratio:(j + 1) * ratio])
+
+    def test_update_coarser_rasters(self):
+        gmap = RasterMap(raster=np.zeros((37, 21), dtype=np.uint8),
+                         projection=NoProjection())
+
+        gmap.raster[35, 20] = 1
+        gmap.update_coarser_rasters(((35, 20), (36, 21)))
+
+        assert gmap.layers[0][2, 1] == 1
+        assert gmap.layers[0].sum() == 1
+
 
 class TestRefloat:
 
@@ -593,6 +618,79 @@ class Test_MapfromBNA:
                 for c in coord_coll[0]:
                     assert len(c) == 2
 
+    def test_to_geojson_viewport(self):
+        # a viewport around the island only
+        geo_json = self.bna_map.to_geojson(viewport=((-127.0, 47.7),
+                                                     (-126.9, 47.8)))
+        all_json = self.bna_map.to_geojson()
+
+        land = geo_json['features'][0]['geometry']['coordinates']
+        all_land = all_json['features'][0]['geometry']['coordinates']
+        assert 0 < len(land) <= len(all_land)
+
+        # nowhere near the land
+        geo_json = self.bna_map.to_geojson(viewport=((10.0, 10.0),
+                                                     (11.0, 11.0)))
+        assert geo_json['features'] == []
+
+    def test_to_geojson_simplified(self):
+        full = self.bna_map.to_geojson()
+        coarse = self.bna_map.to_geojson(level=3)
+
+        def num_points(gj):
+            return sum([len(p[0])
+                        for f in gj['features']
+                        for p in f['geometry']['coordinates']])
+
+        assert num_points(coarse) <= num_points(full)
+
+    def test_to_geojson_cached(self):
+        assert self.bna_map.to_geojson(level=1) is self.bna_map.to_geojson(level=1)
+        assert (self.bna_map.serialized_geojson(level=1) is
+                self.bna_map.serialized_geojson(level=1))
+
+    def test_to_geojson_counter_clockwise(self):
+        geo_json = self.bna_map.to_geojson(counter_clockwise=True)
+
+        for f in geo_json['features']:
+            for poly in f['geometry']['coordinates']:
+                assert not is_clockwise(poly[0][:-1])
+
+    def test_update_land_polys(self):
+        """
+        changing the land polygons redraws just the changed part of the
+        raster -- it should match a full rebuild
+        """
+        gmap = MapFromBNA(testbnamap, refloat_halflife=6, raster_size=10000)
+        original = gmap.land_polys
+        BB = original.bounding_box
+
+        # a small island, well inside the land bounding box
+        (x0, y0), (x1, y1) = BB
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        dx, dy = (x1 - x0) / 20, (y1 - y0) / 20
+        island = ((cx - dx, cy - dy), (cx + dx, cy - dy),
+                  (cx + dx, cy + dy), (cx - dx, cy + dy))
+
+        with_island = original.Copy()
+        with_island.append(island, metadata=('polygon', 'island', '1'))
+        projection = gmap.projection
+
+        gmap.land_polys = with_island
+
+        assert gmap.projection is projection
+        assert gmap.on_land((cx, cy, 0.))
+        assert np.array_equal(gmap.raster, gmap.build_raster()[0])
+        assert np.array_equal(gmap.layers[0],
+                              RasterMap._coarsen(gmap.raster, gmap.ratios[0]))
+
+        gmap.land_polys = original
+
+        assert not gmap.on_land((cx, cy, 0.))
+        assert np.array_equal(gmap.raster, gmap.build_raster()[0])
+        assert np.array_equal(gmap.layers[0],
+                              RasterMap._coarsen(gmap.raster, gmap.ratios[0]))
+
     def test_serialize_deserialize(self):
         """
         test create new object from to_dict
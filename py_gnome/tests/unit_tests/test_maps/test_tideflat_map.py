@@ -17,7 +17,9 @@ from gnome.basic_types import oil_status
 from gnome.maps.tideflat_map import (TideflatMap,
                                      TideflatBase,
                                      SimpleTideflat,
+                                     RasterTideflat,
                                      )
+from gnome.utilities.projections import GeoProjection
 import gnome.scripting as gs
 
 import pytest
@@ -166,6 +168,97 @@ def test_SimpleTideFlat():
 
 
 
+class FakeWaterDepth(object):
+    """
+    water depth that increases with longitude, and rises 2m an hour
+    """
+    start = datetime(2018, 1, 1, 12)
+
+    class time(object):
+        data = [datetime(2018, 1, 1, 12), datetime(2018, 1, 1, 13)]
+
+    def at(self, points, time):
+        hours = (time - self.start).total_seconds() / 3600.0
+        return points[:, 0] - 5.0 + 2.0 * hours
+
+
+def get_raster_tideflat():
+    projection = GeoProjection(((0, 0), (10, 10)), (10, 10))
+    return RasterTideflat(FakeWaterDepth(), projection, (10, 10))
+
+
+def test_RasterTideflat_at_data_time():
+    tf = get_raster_tideflat()
+    points = ((2.5, 5, 0),   # -2.5 m: dry
+              (7.2, 5, 0),   # 2.2 m: wet
+              (20.0, 5, 0))  # off the raster: wet
+
+    result = tf.is_dry(points, datetime(2018, 1, 1, 12))
+    assert np.all(result == [True, False, False])
+
+
+def test_RasterTideflat_interpolated():
+    tf = get_raster_tideflat()
+    points = ((3.7, 5, 0),   # -1.3 and 0.7 m: dry
+              (4.2, 5, 0))   # -0.8 and 1.2 m: wet
+
+    result = tf.is_dry(points, datetime(2018, 1, 1, 12, 30))
+    assert np.all(result == [True, False])
+
+    result = tf.is_wet(points, datetime(2018, 1, 1, 12, 30))
+    assert np.all(result == [False, True])
+
+
+def test_RasterTideflat_out_of_time():
+    tf = get_raster_tideflat()
+    points = ((4.5, 5, 0),)
+
+    # clamped to the last time: 1.5m of water
+    assert not tf.is_dry(points, datetime(2018, 1, 2))[0]
+    # clamped to the first time: -0.5m of water
+    assert tf.is_dry(points, datetime(2017, 1, 1))[0]
+
+
+def test_RasterTideflat_resolution():
+    # the depth is linear, so a coarse raster gives the same answer
+    tf = RasterTideflat(FakeWaterDepth(),
+                        GeoProjection(((0, 0), (10, 10)), (10, 10)),
+                        (10, 10),
+                        resolution=5)
+    assert tf.sample_shape == (2, 2)
+
+    points = ((3.7, 5, 0), (4.2, 5, 0))
+    result = tf.is_dry(points, datetime(2018, 1, 1, 12, 30))
+    assert np.all(result == [True, False])
+
+
+def test_RasterTideflat_bounds():
+    tf = RasterTideflat(FakeWaterDepth(),
+                        GeoProjection(((0, 0), (10, 10)), (10, 10)),
+                        (10, 10),
+                        bounds=((2, 2), (5, 8)))
+    assert tf.sample_shape == (4, 7)
+
+    points = ((3.7, 5, 0),   # dry
+              (1.5, 5, 0),   # dry, but outside the bounds
+              (4.2, 5, 0))   # wet
+    result = tf.is_dry(points, datetime(2018, 1, 1, 12, 30))
+    assert np.all(result == [True, False, False])
+
+
+def test_RasterTideflat_rasters_kept():
+    tf = RasterTideflat(FakeWaterDepth(),
+                        GeoProjection(((0, 0), (10, 10)), (10, 10)),
+                        (10, 10),
+                        times=[datetime(2018, 1, 1, h) for h in (12, 13, 14)])
+
+    for hour in (12, 13, 14, 12):
+        tf.is_dry(((4.5, 5, 0),), datetime(2018, 1, 1, hour, 30))
+        assert len(tf._depth_rasters) <= tf.max_rasters
+
+    assert list(tf._depth_rasters) == [0, 1]
+
+
 def test_tideflat_map_with_both():
     tfm = TideflatMap(get_gnomemap(), get_simple_tideflat())
 
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+"""
+tests for the land check against the boundary of an unstructured grid
+"""
+
+import numpy as np
+
+from gnome.maps.ugrid_land_check import (face_neighbors,
+                                         find_boundary_crossings,
+                                         LAND_EDGE,
+                                         OPEN_EDGE)
+
+# a 2x1 rectangle, split into four triangles:
+#
+#  3-----4-----5
+#  | \ 1 | \ 3 |
+#  | 0 \ | 2 \ |
+#  0-----1-----2
+nodes = np.array(((0, 0), (1, 0), (2, 0),
+                  (0, 1), (1, 1), (2, 1)), dtype=np.float64)
+faces = np.array(((0, 1, 3),
+                  (1, 4, 3),
+                  (1, 2, 4),
+                  (2, 5, 4)), dtype=np.int64)
+
+
+def test_face_neighbors():
+    nbrs = face_neighbors(faces)
+
+    assert np.array_equal(nbrs, ((LAND_EDGE, 1, LAND_EDGE),
+                                 (2, LAND_EDGE, 0),
+                                 (LAND_EDGE, 3, 1),
+                                 (LAND_EDGE, LAND_EDGE, 2)))
+
+
+def test_face_neighbors_open():
+    # the right hand side is open water
+    nbrs = face_neighbors(faces, open_edges=((2, 5),))
+
+    assert nbrs[3, 0] == OPEN_EDGE
+    assert nbrs[3, 1] == LAND_EDGE
+
+
+def test_crossings():
+    nbrs = face_neighbors(faces)
+    starts = np.array(((0.2, 0.2),   # crosses all the faces, stays in
+                       (0.2, 0.2),   # crosses all the faces, hits the side
+                       (0.5, 0.5),   # straight up onto land
+                       (1.5, 0.5),   # doesn't go anywhere
+                       ))
+    ends = np.array(((1.9, 0.8),
+                     (2.2, 0.8),
+                     (0.5, 1.5),
+                     (1.5, 0.5),
+                     ))
+    start_faces = np.array((0, 0, 0, 2))
+
+    hit, t = find_boundary_crossings(nodes, faces, nbrs,
+                                     start_faces, starts, ends)
+
+    assert np.array_equal(hit, (False, True, True, False))
+    assert np.allclose(t[1], 0.9)
+    assert np.allclose(t[2], 0.5)
+
+
+def test_crossings_open_boundary():
+    nbrs = face_neighbors(faces, open_edges=((2, 5),))
+
+    hit, t = find_boundary_crossings(nodes, faces, nbrs,
+                                     np.array((0,)),
+                                     np.array(((0.2, 0.2),)),
+                                     np.array(((2.2, 0.8),)))
+    assert not hit[0]
+
+
+def test_not_in_grid():
+    nbrs = face_neighbors(faces)
+
+    hit, t = find_boundary_crossings(nodes, faces, nbrs,
+                                     np.array((-1,)),
+                                     np.array(((-1.0, 0.2),)),
+                                     np.array(((0.5, 0.2),)))
+    assert not hit[0]
@@ -0,0 +1,144 @@
+'''
+tests for integrating the moves of several PyMovers together
+'''
+from datetime import datetime
+
+import numpy as np
+
+import pytest
+
+from gnome.basic_types import oil_status
+from gnome.movers import PyMover, CombinedIntegrator
+from gnome.utilities.projections import FlatEarthProjection
+
+from ..conftest import sample_sc_release
+
+time_step = 15 * 60  # seconds
+model_time = datetime(2012, 8, 20, 13)
+
+
+class FieldMover(PyMover):
+    '''
+    a mover with an analytic velocity field: a function of the positions
+    '''
+    combinable = True
+
+    def __init__(self, field, **kwargs):
+        super(FieldMover, self).__init__(**kwargs)
+
+        self.field = field
+        self.num_calls = 0
+
+    def velocities(self, sc, points, time, memo_key=None):
+        self.num_calls += 1
+
+        return self.field(points)
+
+
+def uniform(u, v):
+    return lambda points: np.tile((u, v, 0.), (len(points), 1))
+
+
+def test_exceptions():
+    with pytest.raises(ValueError):
+        CombinedIntegrator(num_method='RK3')
+
+    with pytest.raises(ValueError):
+        CombinedIntegrator(max_distance=0)
+
+    with pytest.raises(ValueError):
+        CombinedIntegrator(max_substeps=0)
+
+
+@pytest.mark.parametrize(('method', 'num_calls'), (('Euler', 1),
+                                                   ('RK2', 2),
+                                                   ('RK4', 4)))
+def test_uniform(method, num_calls):
+    '''
+    uniform fields: the moves add up, whatever the method
+    '''
+    sc = sample_sc_release(10, (0, 45, 0))
+    movers = [FieldMover(uniform(1., 0.)), FieldMover(uniform(0., 0.5))]
+
+    deltas = (CombinedIntegrator(method)
+              .get_move(movers, sc, time_step, model_time))
+
+    expected = FlatEarthProjection.meters_to_lonlat(np.tile((1., 0.5, 0.),
+                                                            (10, 1)) *
+                                                    time_step,
+                                                    sc['positions'])
+
+    assert np.allclose(deltas, expected)
+    assert all(m.num_calls == num_calls for m in movers)
+
+
+def test_shared_stages():
+    '''
+    the intermediate positions include the moves of all the movers
+    '''
+    sc = sample_sc_release(10, (0, 45, 0))
+    lat = sc['positions'][0, 1]
+
+    # an eastward flow that increases to the north, and a northward one
+    a = 0.1
+    shear = FieldMover(lambda p: np.column_stack((a * p[:, 1],
+                                                  np.zeros(len(p)),
+                                                  np.zeros(len(p)))))
+    north = FieldMover(uniform(0., 1.))
+
+    deltas = (CombinedIntegrator('RK2')
+              .get_move([shear, north], sc, time_step, model_time))
+
+    # the second stage is north of the start
+    stage_lat = lat + FlatEarthProjection.meters_to_lonlat(
+        np.array([[0., time_step, 0.]]), sc['positions'][:1])[0, 1]
+
+    meters = np.array([[time_step * a * (lat + stage_lat) / 2,
+                        time_step, 0.]])
+    expected = FlatEarthProjection.meters_to_lonlat(meters,
+                                                    sc['positions'][:1])
+
+    assert np.allclose(deltas, expected)
+
+
+def test_substeps():
+    sc = sample_sc_release(10, (0, 45, 0))
+    movers = [FieldMover(uniform(1., 0.))]
+
+    integrator = CombinedIntegrator('RK2', max_distance=100.)
+
+    # 1 m/s for 900 s
+    assert integrator.num_substeps(np.array([[1., 0., 0.]]), time_step) == 9
+
+    deltas = integrator.get_move(movers, sc, time_step, model_time)
+
+    assert movers[0].num_calls == 9 * 2
+    assert np.allclose(deltas,
+                       CombinedIntegrator('RK2')
+                       .get_move(movers, sc, time_step, model_time))
+
+    integrator.max_substeps = 4
+    assert integrator.num_substeps(np.array([[1., 0., 0.]]), time_step) == 4
+
+
+def test_not_in_water():
+    sc = sample_sc_release(10, (0, 45, 0))
+    sc['status_codes'][::2] = oil_status.on_land
+
+    deltas = (CombinedIntegrator()
+              .get_move([FieldMover(uniform(1., 1.))], sc, time_step,
+                        model_time))
+
+    assert np.all(deltas[::2] == 0)
+    assert np.all(deltas[1::2, :2] != 0)
+
+
+def test_combinable():
+    mover = FieldMover(uniform(1., 1.))
+
+    assert CombinedIntegrator.combinable(mover)
+    assert not CombinedIntegrator.combinable(PyMover())
+
+    mover.on = False
+    mover.prepare_for_model_step(sample_sc_release(1), time_step, model_time)
+    assert not CombinedIntegrator.combinable(mover)
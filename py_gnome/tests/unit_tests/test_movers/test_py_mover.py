@@ -7,11 +7,14 @@ from datetime import datetime, timedelta
 
 import numpy as np
 
+import pytest
 from pytest import raises
 from ..conftest import sample_sc_release
 
 from gnome.utilities.inf_datetime import InfDateTime
-from gnome.movers import PyMover
+from gnome.basic_types import oil_status
+from gnome.spill_container import ActiveElements
+from gnome.movers import Mover, PyMover
 
 
 def test_exceptions():
@@ -122,3 +125,125 @@ def test_get_move():
     delta = mv.get_move(sc, time_step, model_time)
 
     assert np.all(np.isnan(delta))
+
+
+class UniformField(object):
+    '''
+    a velocity field that records the memo keys it is called with
+    '''
+    def __init__(self, memo=True):
+        if memo:
+            self._result_memo = {}
+        self.hashes = []
+
+    def at(self, points, time, _hash=None):
+        self.hashes.append(_hash)
+
+        return np.ones_like(points)
+
+
+def test_positions_version():
+    sc = sample_sc_release(10, (0, 0, 0))
+    version = sc.positions_version
+    key = sc.positions_key()
+
+    sc['positions'] = sc['positions'] + 1.0
+
+    assert sc.positions_version > version
+    assert sc.positions_key() != key
+
+    # a different container never gives the same key
+    sc2 = sample_sc_release(10, (0, 0, 0))
+    assert sc2.positions_key() != sc.positions_key()
+
+
+@pytest.mark.parametrize(('method', 'num_calls'), (('Euler', 1),
+                                                   ('RK2', 2),
+                                                   ('RK4', 4)))
+def test_memo_keys(method, num_calls):
+    time_step = 15 * 60  # seconds
+    model_time = datetime(2012, 8, 20, 13)
+    sc = sample_sc_release(10, (0, 0, 0))
+    field = UniformField()
+
+    mv = PyMover()
+    mv.delta_method(method)(sc, time_step, model_time, sc['positions'][:],
+                            field)
+
+    assert len(field.hashes) == num_calls
+    assert field.hashes[0] == (sc.positions_key(), model_time)
+    # the intermediate points each get their own key
+    assert len(set(field.hashes)) == num_calls
+
+
+def test_memo_keys_fallback():
+    time_step = 15 * 60  # seconds
+    model_time = datetime(2012, 8, 20, 13)
+    sc = sample_sc_release(10, (0, 0, 0))
+    mv = PyMover()
+
+    # not the container's positions
+    field = UniformField()
+    mv.get_delta_RK2(sc, time_step, model_time, sc['positions'].copy(), field)
+    assert field.hashes == [None, None]
+
+    # a field with no memo
+    field = UniformField(memo=False)
+    mv.get_delta_RK2(sc, time_step, model_time, sc['positions'][:], field)
+    assert field.hashes == [None, None]
+
+
+class OnesMover(Mover):
+    '''
+    moves each element it is given by one, and records how many it got
+    '''
+    compact_elements = True
+
+    def get_move(self, sc, time_step, model_time_datetime):
+        self.num_moved = len(sc['positions'])
+
+        return np.ones_like(sc['positions'])
+
+
+def test_active_elements():
+    time_step = 15 * 60  # seconds
+    model_time = datetime(2012, 8, 20, 13)
+    sc = sample_sc_release(10, (0, 0, 0))
+    sc['positions'][:, 0] = np.arange(10)
+    sc['status_codes'][::3] = oil_status.on_land
+
+    active = ActiveElements(sc)
+    active.update()
+
+    indices = [1, 2, 4, 5, 7, 8]
+    assert not active.all_active
+    assert list(active.indices) == indices
+    assert len(active) == 6
+
+    positions = active['positions']
+    assert np.array_equal(positions, sc['positions'][indices])
+    assert positions.flags['C_CONTIGUOUS']
+    assert active['positions'] is positions
+
+    # a key of its own, that the movers' memos can use
+    assert active.positions_key() != sc.positions_key()
+    assert PyMover._memo_key(active, positions) == active.positions_key()
+
+    # only the active elements are moved
+    mover = OnesMover()
+    next_positions = sc['positions'].copy()
+    mover.add_move(sc, time_step, model_time, next_positions, active)
+
+    assert mover.num_moved == 6
+    moved = np.ones((10, 3))
+    moved[::3] = 0
+    assert np.array_equal(next_positions - sc['positions'], moved)
+
+    # the scratch arrays are reused, with new keys
+    key = active.positions_key()
+    sc['status_codes'][:] = oil_status.in_water
+    active.update()
+
+    assert active.all_active
+    assert active.positions_key() != key
+    assert np.array_equal(active['positions'], sc['positions'])
@@ -10,6 +10,7 @@ import numpy as np
 from gnome.movers import RandomMover
 
 from gnome.utilities.time_utils import sec_to_date, date_to_sec
+from gnome.utilities.rand import seed
 from gnome.utilities.projections import FlatEarthProjection
 from ..conftest import sample_sc_release
 
@@ -161,6 +162,134 @@ def test_variance1(start_loc, time_step):
     assert np.allclose(var, (expected, expected, 0.), rtol=0.1)
 
 
+def test_delta_buffer():
+    """
+    the delta array is kept between calls, and added in place
+    """
+    start_time = datetime.datetime(2012, 11, 10, 0)
+    time_step = 360
+    sc = sample_sc_release(10, (0., 0., 0.), start_time)
+
+    rand = RandomMover(diffusion_coef=100000)
+    rand.prepare_for_model_step(sc, time_step, start_time)
+
+    delta = rand.get_move(sc, time_step, start_time)
+    assert np.all(delta[:, :2] != 0)
+
+    first = delta.copy()
+    buf = rand._delta_buffers[rand.spill_type]
+
+    next_positions = sc['positions'].copy()
+    rand.add_move(sc, time_step, start_time, next_positions)
+
+    # the same memory, new values
+    assert np.shares_memory(delta, buf)
+    assert np.all(delta[:, :2] != first[:, :2])
+    assert np.allclose(next_positions, sc['positions'] + delta)
+
+    # grows with the number of elements
+    sc = sample_sc_release(25, (0., 0., 0.), start_time)
+    rand.prepare_for_model_step(sc, time_step, start_time)
+
+    assert len(rand.get_move(sc, time_step, start_time)) == 25
+    assert len(rand._delta_buffers[rand.spill_type]) == 25
+
+
+def test_num_threads():
+    """
+    each element draws from a random stream of its own -- the moves don't
+    depend on the number of threads
+    """
+    start_time = datetime.datetime(2012, 11, 10, 0)
+    time_step = 360
+
+    def moves(num_threads):
+        seed(1)
+        sc = sample_sc_release(1000, (0., 0., 0.), start_time)
+
+        rand = RandomMover(diffusion_coef=100000, num_threads=num_threads)
+        rand.prepare_for_model_run()
+        rand.prepare_for_model_step(sc, time_step, start_time)
+
+        return rand.get_move(sc, time_step, start_time).copy()
+
+    delta = moves(4)
+
+    assert np.all(delta[:, :2] != 0)
+    assert np.all(delta[:, 2] == 0)
+
+    assert np.array_equal(delta, moves(1))
+    assert np.array_equal(delta, moves(3))
+
+
+def test_element_streams():
+    """
+    the move of an element only depends on its id -- not on the other
+    elements, or their order
+    """
+    start_time = datetime.datetime(2012, 11, 10, 0)
+    time_step = 360
+
+    seed(1)
+    sc = sample_sc_release(100, (0., 0., 0.), start_time)
+
+    rand = RandomMover(diffusion_coef=100000)
+    rand.prepare_for_model_run()
+    rand.prepare_for_model_step(sc, time_step, start_time)
+
+    delta = rand.get_move(sc, time_step, start_time).copy()
+
+    # half the elements, backwards -- from the same point in the streams
+    subset = slice(None, None, -2)
+    rand.prepare_for_model_run()
+    kwargs = rand.get_move_kwargs(sc)
+    kwargs['le_ids'] = np.ascontiguousarray(kwargs['le_ids'][subset])
+
+    positions = np.ascontiguousarray(rand.positions[subset])
+    part = np.zeros_like(positions)
+
+    rand.mover.get_move(rand.model_time, time_step, positions, part,
+                        np.ascontiguousarray(rand.status_codes[subset]),
+                        rand.spill_type, **kwargs)
+
+    assert np.array_equal(part.view(dtype=np.float64).reshape(-1, 3),
+                          delta[subset])
+
+
+
+def test_element_streams_steps():
+    """
+    each get_move draws new moves, and a new run draws them again
+    """
+    start_time = datetime.datetime(2012, 11, 10, 0)
+    time_step = 360
+
+    seed(1)
+    sc = sample_sc_release(10, (0., 0., 0.), start_time)
+
+    rand = RandomMover(diffusion_coef=100000)
+    rand.prepare_for_model_run()
+    rand.prepare_for_model_step(sc, time_step, start_time)
+
+    first = rand.get_move(sc, time_step, start_time).copy()
+    second = rand.get_move(sc, time_step, start_time).copy()
+
+    assert np.all(first[:, :2] != second[:, :2])
+
+    rand.prepare_for_model_run()
+    rand.prepare_for_model_step(sc, time_step, start_time)
+
+    assert np.array_equal(rand.get_move(sc, time_step, start_time), first)
+
+    # a mover of the model draws from the stream of its index
+    rand.random_stream = 1
+    rand.prepare_for_model_run()
+    rand.prepare_for_model_step(sc, time_step, start_time)
+
+    assert np.all(rand.get_move(sc, time_step, start_time)[:, :2] !=
+                  first[:, :2])
+
+
 if __name__ == '__main__':
     tw = TestRandomMover()
     tw.test_prepare_for_model_step()
@@ -145,6 +145,50 @@ class Test_PolygonSet:
         assert not poly_set
 
 
+    def test_points_in_any(self):
+        poly_set = PolygonSet()
+        poly_set.append(((0, 0), (0, 1), (1, 1), (1, 0)))
+        poly_set.append(((5, 5), (5, 6), (6, 6), (6, 5)))
+        points = ((0.5, 0.5, 0.), (5.5, 5.5, 0.), (3., 3., 0.), (-1, 0.5, 0.))
+
+        assert np.array_equal(poly_set.points_in_any(points),
+                              (True, True, False, False))
+        assert np.array_equal(poly_set.points_in_polygons(points),
+                              (0, 1, -1, -1))
+
+    def test_points_in_any_empty(self):
+        poly_set = PolygonSet()
+
+        assert not poly_set.points_in_any((0.5, 0.5, 0.)).any()
+
+    def test_polygons_in_bbox(self):
+        poly_set = PolygonSet()
+        for i in range(10):
+            for j in range(10):
+                poly_set.append(((i, j), (i, j + .5),
+                                 (i + .5, j + .5), (i + .5, j)))
+
+        assert np.array_equal(poly_set.polygons_in_bbox(((2.7, 3.7),
+                                                         (3.2, 4.2))),
+                              (34,))
+        assert len(poly_set.polygons_in_bbox(((-1, -1), (20, 20)))) == 100
+        assert len(poly_set.polygons_in_bbox(((20, 20), (30, 30)))) == 0
+
+    def test_is_clockwise(self):
+        poly_set = PolygonSet()
+        poly_set.append(((0, 0), (0, 1), (1, 1), (1, 0)))
+        poly_set.append(((0, 0), (1, 0), (1, 1), (0, 1)))
+
+        assert np.array_equal(poly_set.is_clockwise(), (True, False))
+
+    def test_index_reset_on_append(self):
+        poly_set = PolygonSet()
+        poly_set.append(((0, 0), (0, 1), (1, 1), (1, 0)))
+        assert not poly_set.points_in_any((5.5, 5.5, 0.))[0]
+
+        poly_set.append(((5, 5), (5, 6), (6, 6), (6, 5)))
+        assert poly_set.points_in_any((5.5, 5.5, 0.))[0]
+
     # def test_pop(self):
     #    pass
 
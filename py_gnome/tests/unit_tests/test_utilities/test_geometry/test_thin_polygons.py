@@ -110,6 +110,13 @@ def test_thin_set():
     assert thinned[0] == poly1.thin( scale=(0.1, 0.1) )
     assert thinned[1] == poly2.thin( scale=(0.1, 0.1) )
 
+def test_thin_set_closed():
+    # the closing point of poly2 should be preserved
+    thinned = pset.thin( scale=(0.05, 0.05) )
+
+    assert thinned[1] == poly2.thin( scale=(0.05, 0.05) )
+    assert np.array_equal( thinned[1][0], thinned[1][-1] )
+
 def test_larger():
     filename = os.path.join( os.path.split(__file__)[0],'00439polys_013685pts.bna' )
 
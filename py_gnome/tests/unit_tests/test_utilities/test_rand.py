@@ -7,7 +7,8 @@ Test gnome.utilities.rand.py
 import numpy as np
 import random
 
-from gnome.utilities.rand import random_with_persistance, seed
+from gnome.utilities.rand import (random_with_persistance, seed,
+                                  philox, uniforms, stream_id)
 from gnome.cy_gnome.cy_helpers import rand
 
 import pytest
@@ -91,3 +92,71 @@ def test_set_seed():
     assert xi == xf
     assert np.all(ai == af)
     assert ci == cf
+
+
+@pytest.mark.parametrize(("counter", "key", "result"),
+                         [((0, 0, 0, 0), (0, 0),
+                           (0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8)),
+                          ((0xffffffff,) * 4, (0xffffffff,) * 2,
+                           (0x408f276d, 0x41c83b0e, 0xa20bc7c6, 0x6d5451fd)),
+                          ((0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344),
+                           (0xa4093822, 0x299f31d0),
+                           (0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1))])
+def test_philox(counter, key, result):
+    """
+    the known answers for Philox4x32-10, from Random123
+    """
+    assert tuple(philox(counter, key)) == result
+
+
+def test_uniforms():
+    """
+    the numbers for an element only depend on its id, the step, the stream
+    and the seed
+    """
+    ids = np.arange(1000, dtype=np.uint32)
+    stream = stream_id('test', False)
+
+    u = uniforms(ids, 3600, stream, num=6, seed=1)
+
+    assert u.shape == (1000, 6)
+    assert np.all((u >= 0) & (u < 1))
+    assert abs(u.mean() - 0.5) < 0.01
+
+    # any subset, in any order
+    assert np.array_equal(uniforms(ids[::-3], 3600, stream, num=6, seed=1),
+                          u[::-3])
+
+    # the first numbers don't depend on how many are drawn
+    assert np.array_equal(uniforms(ids, 3600, stream, num=2, seed=1),
+                          u[:, :2])
+
+    assert not np.array_equal(uniforms(ids, 7200, stream, num=6, seed=1), u)
+    assert not np.array_equal(uniforms(ids, 3600, stream_id('test', True),
+                                       num=6, seed=1), u)
+    assert not np.array_equal(uniforms(ids, 3600, stream, num=6, seed=2), u)
+
+    seed(1)
+    assert np.array_equal(uniforms(ids, 3600, stream, num=6), u)
+
+
+def test_random_with_persistance_ids():
+    """
+    with element ids, the values come from the counter-based generator
+    """
+    ids = np.arange(10, dtype=np.uint32)
+    low, high = [0.01] * 10, [0.04] * 10
+
+    x = random_with_persistance(low, high, ids=ids, step=60, stream=1)
+
+    assert np.all((x >= 0.01) & (x <= 0.04))
+    assert np.array_equal(x, random_with_persistance(low, high, ids=ids,
+                                                     step=60, stream=1))
+
+    # the elements not updated don't use up any numbers
+    persist = np.array([900, -1] * 5)
+    y = random_with_persistance(low, high, np.zeros(10), persist, 900,
+                                ids=ids, step=60, stream=1)
+
+    assert np.array_equal(y[::2], x[::2])
+    assert np.all(y[1::2] == 0)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+
+"""
+script that converts gridded forcing files into the local forcing cache
+
+usage: prepare_forcing.py file.nc [file2.nc ...] [-v u,v,...]
+
+the variables default to all those with a time and two or more dimensions.
+The cache directory is $GNOME_FORCING_CACHE, or gnome_forcing_cache in the
+temp directory.
+"""
+
+import sys
+
+from gnome.environment.forcing_cache import prepare_forcing
+
+args = sys.argv[1:]
+
+varnames = None
+if '-v' in args:
+    i = args.index('-v')
+    try:
+        varnames = args[i + 1].split(',')
+    except IndexError:
+        print "-v needs a comma separated list of variable names"
+        sys.exit(1)
+
+    del args[i:i + 2]
+
+if not args:
+    print "You must provide the netCDF file(s) to prepare"
+    sys.exit(1)
+
+for filename in args:
+    print "Preparing:", filename
+    print "   ", prepare_forcing(filename, varnames)